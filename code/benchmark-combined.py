@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from llmreview.benchmark import run_benchmark
+from llmreview.config import RunConfig
+from llmreview.engine import Runtime
+
+# ----------------------------------------------------------
+# 1. Configuration
+# ----------------------------------------------------------
+# Same run as:  python -m llmreview benchmark-combined --papers 5
+API_KEY = ""
+PDF_DIR = "/Users/ywon3/ASU Dropbox/Youngjae Won/RESEARCH/Ongoing/GQEquityReview/paper-pdfs/for-review"
+
+# number of papers from the r35 list to benchmark
+N_PAPERS = 5
+
+# one row per paper and mode (tokens, latency)
+CALLS_CSV = "./benchmark_combined_calls.csv"
+# one row per paper, section and field (agreement between the two modes)
+AGREEMENT_CSV = "./benchmark_combined_agreement.csv"
+
+# ----------------------------------------------------------
+# main entry
+# ----------------------------------------------------------
+if __name__ == "__main__":
+    runtime = Runtime(RunConfig(api_key=API_KEY, pdf_dir=PDF_DIR))
+    run_benchmark(runtime, N_PAPERS, CALLS_CSV, AGREEMENT_CSV)
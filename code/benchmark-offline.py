@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from llmreview.benchmark import run_offline_benchmark
+from llmreview.config import RunConfig
+from llmreview.fake_gemini import FakeGeminiClient
+
+# ----------------------------------------------------------
+# 1. Configuration
+# ----------------------------------------------------------
+# Same run as:
+#   python -m llmreview bench-offline --synthetic 35 --workers-sweep 1 4 8 16 --rpm 150
+# No API key is needed: every call goes to the local fake client.
+SECTIONS = ["AB", "C", "D", "E"]
+
+# generated papers; set to None and fill PDF_DIR to time the real PDFs
+N_SYNTHETIC = 35
+PDF_DIR = "/Users/ywon3/ASU Dropbox/Youngjae Won/RESEARCH/Ongoing/GQEquityReview/paper-pdfs/for-review"
+
+# papers kept in flight, one run per value
+WORKER_COUNTS = [1, 4, 8, 16]
+
+# fake API behaviour: lognormal latency, 5xx share, requests-per-minute quota
+LATENCY_MEDIAN = 1.0
+LATENCY_SIGMA = 0.5
+ERROR_RATE = 0.02
+QUOTA_RPM = 150
+
+RESULTS_CSV = "./benchmark_offline.csv"
+
+# ----------------------------------------------------------
+# main entry
+# ----------------------------------------------------------
+if __name__ == "__main__":
+    def client_factory():
+        return FakeGeminiClient(latency_median=LATENCY_MEDIAN, latency_sigma=LATENCY_SIGMA,
+                                error_rate=ERROR_RATE, quota_rpm=QUOTA_RPM, seed=0)
+
+    config = RunConfig(api_key="offline", pdf_dir=PDF_DIR, requests_per_minute=QUOTA_RPM)
+    run_offline_benchmark(config, SECTIONS, WORKER_COUNTS, client_factory,
+                          n_synthetic=N_SYNTHETIC, results_csv=RESULTS_CSV)
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from llmreview.benchmark import benchmark_paper_text, run_benchmark
+from llmreview.config import RunConfig
+from llmreview.engine import Runtime
+
+# ----------------------------------------------------------
+# 1. Configuration
+# ----------------------------------------------------------
+# Same run as:  python -m llmreview benchmark-text --papers 35
+API_KEY = ""
+PDF_DIR = "/Users/ywon3/ASU Dropbox/Youngjae Won/RESEARCH/Ongoing/GQEquityReview/paper-pdfs/for-review"
+
+# number of papers from the r35 list to benchmark
+N_PAPERS = 35
+
+# one row per paper, mode and section (tokens, latency)
+CALLS_CSV = "./benchmark_text_calls.csv"
+# one row per paper, section and field (agreement between PDF and text input)
+AGREEMENT_CSV = "./benchmark_text_agreement.csv"
+
+# extracted page texts, keyed by PDF hash
+PDF_TEXT_CACHE_DIR = "./pdf_text_cache"
+
+# ----------------------------------------------------------
+# main entry
+# ----------------------------------------------------------
+if __name__ == "__main__":
+    runtime = Runtime(RunConfig(api_key=API_KEY, pdf_dir=PDF_DIR, pdf_text_cache_dir=PDF_TEXT_CACHE_DIR))
+    run_benchmark(runtime, N_PAPERS, CALLS_CSV, AGREEMENT_CSV, paper_fn=benchmark_paper_text)
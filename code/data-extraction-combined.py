@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from llmreview.combined import combined_request, run_combined
+from llmreview.config import RunConfig
+from llmreview.specs import SPECS
+
+# ----------------------------------------------------------
+# 1. Configuration
+# ----------------------------------------------------------
+# Same run as:  python -m llmreview combined
+API_KEY = ""
+PDF_DIR = "/Users/ywon3/ASU Dropbox/Youngjae Won/RESEARCH/Ongoing/GQEquityReview/paper-pdfs/for-review"
+
+# papers to run, picked from the corpus manifest of PDF_DIR: None = the r35
+# list; e.g. "new:r35" (not coded in r35 yet), "changed:r35", "subset:pilot"
+PDF_QUERY = None
+
+# duplicate PDFs are extracted once and their rows copied: "exact" (same
+# file content), "near" (also near-identical text, e.g. a preprint), "off"
+DEDUP = "exact"
+
+# one output per section, in the same layout as the per-section scripts
+OUTPUT_CSVS = {
+    "AB": "./fulltext_extraction_sectionAB_combined.csv",
+    "C": "./fulltext_extraction_sectionC_combined.csv",
+    "D": "./fulltext_extraction_sectionD_combined.csv",
+    "E": "./fulltext_extraction_sectionE_combined.csv",
+}
+
+# local cache of model responses; see the section scripts
+USE_RESPONSE_CACHE = True
+
+# number of papers kept in flight at once (1 = one paper at a time)
+MAX_WORKERS = 4
+
+# delete the registered remote files once this batch has finished
+DELETE_UPLOADS_AT_END = False
+
+# ----------------------------------------------------------
+# 2. Combined prompt and namespaced schema
+# ----------------------------------------------------------
+PROMPT_TEXT, schema = combined_request(SPECS)
+
+# ----------------------------------------------------------
+# main entry
+# ----------------------------------------------------------
+if __name__ == "__main__":
+    config = RunConfig(
+        api_key=API_KEY,
+        pdf_dir=PDF_DIR,
+        pdf_query=PDF_QUERY,
+        dedup=DEDUP,
+        max_workers=MAX_WORKERS,
+        use_response_cache=USE_RESPONSE_CACHE,
+        delete_uploads_at_end=DELETE_UPLOADS_AT_END,
+    )
+    dfs = run_combined(config, output_csvs=OUTPUT_CSVS)
+    for name, df in dfs.items():
+        print(f"\nSection {name}")
+        print(df)
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+Shared engine for the full-text data extraction scripts
+(data-extraction-section*.py). Section prompts and schemas live in
+llmreview.specs; run them with the scripts or with `python -m llmreview`.
+"""
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import ast
+
+import pandas as pd
+
+
+def as_list(value):
+    """
+    Normalize a multi-select cell to a list. Accepts real lists and the
+    Python repr strings ("['A', 'B']") written by DataFrame.to_csv.
+    """
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith("["):
+            try:
+                parsed = ast.literal_eval(text)
+                if isinstance(parsed, (list, tuple)):
+                    return list(parsed)
+            except (ValueError, SyntaxError):
+                pass
+        return [text] if text else []
+    return [value]
+
+
+def _norm(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    return " ".join(str(value).split()).lower()
+
+
+def field_agreement(a, b, multi_select):
+    """
+    Agreement between two codings of one field, in [0, 1].
+    Multi-select fields use the Jaccard index of the two category sets
+    (two empty sets agree fully); other fields use normalized exact match.
+    """
+    if multi_select:
+        sa, sb = set(as_list(a)), set(as_list(b))
+        if not sa and not sb:
+            return 1.0
+        return len(sa & sb) / len(sa | sb)
+    return 1.0 if _norm(a) == _norm(b) else 0.0
+
+
+def comparable_fields(schema):
+    """
+    Return {field: is_multi_select} for the coded fields of a section
+    schema. Free-text justification fields (*_Detail) and open text such
+    as Park_Quality_Definition are left out, since they are not expected
+    to match word for word.
+    """
+    out = {}
+    for name, prop in (schema.properties or {}).items():
+        if name.endswith("_Detail") or name.endswith("_Definition"):
+            continue
+        out[name] = str(prop.type).lower().endswith("array")
+    return out
+
+
+def compare_rows(row_a, row_b, schema):
+    """
+    Return {field: agreement} for every comparable field of a section.
+    """
+    return {
+        name: field_agreement(row_a.get(name), row_b.get(name), multi)
+        for name, multi in comparable_fields(schema).items()
+    }
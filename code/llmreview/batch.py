@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import tempfile
+import time
+
+from google.genai import types
+
+from llmreview.checkpoint import CheckpointJournal
+from llmreview.corpus import drop_replaced, files_to_replace, work_set
+from llmreview.dedup import dedup_work_set, drop_stale_aliases, with_aliases
+from llmreview.engine import Runtime, load_context_index, settle_answer
+from llmreview.fake_batch import FakeBatchClient
+from llmreview.fake_responses import schema_dict
+from llmreview.hashing import file_sha256
+from llmreview.metrics import CallRecord
+from llmreview.pageselect import write_page_subset
+from llmreview.specs import get_spec
+
+# batch job states after which polling stops
+TERMINAL_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+def _state(job):
+    state = getattr(job, "state", None)
+    return getattr(state, "name", None) or str(state)
+
+
+# ----------------------------------------------------------
+# request serialization
+# ----------------------------------------------------------
+def build_request(text_parts, remote_file, schema, temperature=0):
+    """
+    One GenerateContentRequest in the JSON form used by batch input
+    files: the text parts in order, then the uploaded PDF (left out when
+    remote_file is None, i.e. the paper's text is already in text_parts).
+    """
+    parts = [{"text": text} for text in text_parts]
+    if remote_file is not None:
+        parts.append({
+            "file_data": {
+                "mime_type": remote_file.mime_type or "application/pdf",
+                "file_uri": remote_file.uri,
+            }
+        })
+    return {
+        "contents": [{"role": "user", "parts": parts}],
+        "generation_config": {
+            "temperature": temperature,
+            "response_mime_type": "application/json",
+            "response_schema": schema_dict(schema),
+        },
+    }
+
+
+def write_batch_jsonl(path, keyed_requests):
+    """
+    Write (key, request) pairs as a batch input file, one
+    {"key": ..., "request": ...} object per line. Return the line count.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for key, request in keyed_requests:
+            f.write(json.dumps({"key": key, "request": request}, ensure_ascii=False) + "\n")
+    return len(keyed_requests)
+
+
+# ----------------------------------------------------------
+# job submission and polling
+# ----------------------------------------------------------
+def submit_batch(client, jsonl_path, model, display_name):
+    """
+    Upload the batch input file and create the batch job. Return the job.
+    """
+    uploaded = client.files.upload(
+        file=jsonl_path,
+        config=types.UploadFileConfig(display_name=display_name, mime_type="jsonl"),
+    )
+    job = client.batches.create(
+        model=model,
+        src=uploaded.name,
+        config=types.CreateBatchJobConfig(display_name=display_name),
+    )
+    print(f"Submitted batch job {job.name} ({display_name})")
+    return job
+
+
+def wait_for_batch(client, job_name, poll_seconds=60, timeout=None):
+    """
+    Poll a batch job until it reaches a terminal state and return it.
+    Raises TimeoutError if timeout (seconds) passes first.
+    """
+    start = time.time()
+    while True:
+        job = client.batches.get(name=job_name)
+        state = _state(job)
+        if state in TERMINAL_STATES:
+            print(f"Batch job {job_name} finished: {state}")
+            return job
+        if timeout is not None and time.time() - start > timeout:
+            raise TimeoutError(f"Batch job {job_name} still {state} after {timeout} sec")
+        print(f"Batch job {job_name} is {state}; checking again in {poll_seconds} sec")
+        time.sleep(poll_seconds)
+
+
+# ----------------------------------------------------------
+# result mapping
+# ----------------------------------------------------------
+def response_text(response):
+    """
+    Concatenated answer text of a GenerateContentResponse in JSON form,
+    skipping thought parts. None if there is no candidate text.
+    """
+    candidates = (response or {}).get("candidates") or []
+    if not candidates:
+        return None
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    texts = [p["text"] for p in parts if "text" in p and not p.get("thought")]
+    return "".join(texts) if texts else None
+
+
+def read_batch_results(client, job):
+    """
+    Return {key: {"raw_text", "usage", "error"}} for a finished job,
+    read from its result file.
+    """
+    results = {}
+    dest = getattr(job, "dest", None)
+    file_name = getattr(dest, "file_name", None)
+    if file_name:
+        content = client.files.download(file=file_name)
+        for line in content.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response")
+            results[record.get("key")] = {
+                "raw_text": response_text(response),
+                "usage": (response or {}).get("usageMetadata") or (response or {}).get("usage_metadata"),
+                "error": record.get("error"),
+            }
+    return results
+
+
+def save_job_state(path, state):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def load_job_state(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------
+# one section round as a batch job
+# ----------------------------------------------------------
+def build_round(runtime, spec, pdf_files, context_index=None):
+    """
+    Upload (or reuse) every PDF in pdf_files, its Methods/Results page
+    subset for D and E, or its extracted text in text mode, and return (key, request) pairs for the section, keyed
+    by file name. Dependent sections (E) carry each paper's context
+    summary.
+    """
+    config = runtime.config
+    keyed_requests = []
+    for fname in pdf_files:
+        fpath = os.path.join(config.pdf_dir, fname)
+        if not os.path.exists(fpath):
+            print(f"Skipping, file not found: {fpath}")
+            continue
+        context_text = context_index.get(fname) if context_index is not None else None
+        text_parts = spec.text_parts(context_text)
+        sha = file_sha256(fpath)
+        paper = runtime.paper_input(fpath, sha, spec)
+        if paper.text is not None:
+            request = build_request(text_parts + [paper.text], None, spec.schema, config.temperature)
+            keyed_requests.append((fname, request))
+            continue
+        try:
+            upload_path = fpath
+            if paper.pages is not None:
+                upload_path = write_page_subset(fpath, paper.pages, config.page_subset_dir, sha)
+            remote_file = runtime.uploads.get(runtime.client, upload_path)
+        except Exception as e:
+            print(f"Upload failed for {fpath}: {e}")
+            continue
+        request = build_request(text_parts, remote_file, spec.schema, config.temperature)
+        keyed_requests.append((fname, request))
+    return keyed_requests
+
+
+def run_batch_round(runtime, spec, output_csv, job_jsonl, poll_seconds=60, resume=True):
+    """
+    Run one section over the configured PDFs as a single batch job, then
+    write the answers into the section's CSV layout (same columns and
+    ERROR rows as process_folder). Files already in the CSV are skipped.
+    The submitted job is remembered in <job_jsonl>.job.json, so a rerun
+    resumes polling instead of resubmitting. Return the final DataFrame.
+    """
+    config = runtime.config
+    checkpoint = CheckpointJournal(output_csv, spec.schema, config.columnar_formats)
+    all_files = work_set(config)
+    pdf_files, aliases = dedup_work_set(config, all_files)
+    rows = drop_replaced(drop_stale_aliases(checkpoint.load(), aliases), files_to_replace(config, all_files))
+    processed_files = set(str(r.get("File_Name")) for r in rows)
+
+    state_path = f"{job_jsonl}.job.json"
+    state = load_job_state(state_path) if resume else None
+    if state is not None:
+        print(f"Resuming batch job {state['job_name']}")
+    else:
+        pending = [f for f in pdf_files if f not in processed_files]
+        if not pending:
+            print("Nothing to do: every PDF is already in the CSV")
+            return checkpoint.compact(with_aliases(rows, aliases))
+        context_index = load_context_index(spec, config)
+        keyed_requests = build_round(runtime, spec, pending, context_index)
+        n = write_batch_jsonl(job_jsonl, keyed_requests)
+        print(f"Wrote {n} requests to {job_jsonl}")
+        job = submit_batch(runtime.client, job_jsonl, config.model,
+                           display_name=os.path.basename(job_jsonl))
+        state = {"job_name": job.name, "section": spec.name, "keys": [k for k, _ in keyed_requests]}
+        save_job_state(state_path, state)
+
+    batch_start = time.time()
+    job = wait_for_batch(runtime.client, state["job_name"], poll_seconds=poll_seconds)
+    results = read_batch_results(runtime.client, job)
+
+    n_ok = 0
+    for fname in state["keys"]:
+        if fname in processed_files:
+            continue
+        result = results.get(fname) or {}
+        # repaired and checked like an interactive answer; no re-ask inside a batch
+        parsed, invalid = settle_answer(runtime, spec.schema, result.get("raw_text"),
+                                        CallRecord(spec.name, fname), source=fname)
+        if parsed is not None:
+            row = {"File_Name": fname, **parsed}
+            if invalid:
+                row["INVALID_FIELDS"] = "; ".join(invalid)
+            n_ok += 1
+        else:
+            print(f"Failed {fname}: {result.get('error') or 'no parseable answer'}")
+            row = {"File_Name": fname, "ERROR": "failed_to_extract"}
+        rows.append(row)
+        checkpoint.append(row)
+
+    rows = with_aliases(rows, aliases)
+    order = {f: i for i, f in enumerate(all_files)}
+    rows.sort(key=lambda r: order.get(str(r.get("File_Name")), -1))
+    df_all = checkpoint.compact(rows)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+
+    print("\nBatch summary")
+    print(f"Section                {spec.name}")
+    print(f"Requests in job        {len(state['keys'])}")
+    print(f"Parsed answers         {n_ok}")
+    print(f"Total rows written     {len(df_all)}")
+    print(f"Saved final output to  {output_csv}")
+    print(f"Waited for job         {time.time() - batch_start:.2f} sec")
+    return df_all
+
+
+def run_batch_section(name, config, output_csv=None, job_jsonl=None, poll_seconds=60, fake=False):
+    """
+    Entry point used by run-batch-round.py and the CLI. fake=True runs
+    against the local FakeBatchClient with no job resume, for testing
+    the round end to end; its CSV, job file, page subsets, registries and
+    metrics all go to a scratch directory (the response cache is off), so
+    the fake answers never reach the round's real outputs.
+    """
+    spec = get_spec(name)
+    output_csv = output_csv or spec.output_csv
+    job_jsonl = job_jsonl or f"./batch_section{spec.name}_r35.jsonl"
+    if fake:
+        scratch_dir = tempfile.mkdtemp(prefix="fake_batch_")
+        print(f"Fake batch run: outputs kept in {scratch_dir}")
+        output_csv = os.path.join(scratch_dir, os.path.basename(output_csv))
+        job_jsonl = os.path.join(scratch_dir, os.path.basename(job_jsonl))
+        config = config.with_overrides(
+            use_response_cache=False,
+            upload_registry_json=os.path.join(scratch_dir, "fake_uploads.json"),
+            context_cache_registry_json=os.path.join(scratch_dir, "context_caches.json"),
+            page_subset_dir=os.path.join(scratch_dir, "subsets"),
+            metrics_jsonl=os.path.join(scratch_dir, "calls.jsonl"),
+        )
+        runtime = Runtime(config, client=FakeBatchClient(completion_seconds=2))
+        poll_seconds = 1
+    else:
+        runtime = Runtime(config)
+    try:
+        return run_batch_round(runtime, spec, output_csv, job_jsonl,
+                               poll_seconds=poll_seconds, resume=not fake)
+    finally:
+        runtime.close()
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import time
+
+import pandas as pd
+from google.genai import types
+
+from llmreview.agreement import compare_rows
+from llmreview.combined import combined_request, split_combined
+from llmreview.corpus import work_set
+from llmreview.gemini import generate_json, parse_json_response, pdf_part, usage_counts
+from llmreview.hashing import file_sha256
+from llmreview.metrics import ERROR_OUTCOMES, read_metrics
+from llmreview.scheduler import run_sections
+from llmreview.specs import SPECS
+from llmreview.synthetic_pdfs import make_synthetic_pdfs
+
+
+# ----------------------------------------------------------
+# helper 1. one timed model call
+# ----------------------------------------------------------
+def timed_call(runtime, parts, schema):
+    """
+    Run one generate_content call and return (parsed_dict, usage, seconds).
+    parsed_dict is None if the call or the JSON parse failed.
+    """
+    config = runtime.config
+    start_time = time.time()
+    try:
+        response = generate_json(runtime.client, parts, schema,
+                                 model=config.model, temperature=config.temperature)
+    except Exception as e:
+        print(f"Model call failed: {e}")
+        return None, usage_counts(None), time.time() - start_time
+    elapsed = time.time() - start_time
+    return parse_json_response(response.text), usage_counts(response), elapsed
+
+
+# ----------------------------------------------------------
+# helper 2. both modes on one paper
+# ----------------------------------------------------------
+def benchmark_paper(runtime, pdf_path):
+    """
+    Code one paper with the four per-section calls and with one combined
+    call. Return (call_records, agreement_records).
+    """
+    fname = os.path.basename(pdf_path)
+    sha = file_sha256(pdf_path)
+    file_part = runtime.paper_part(pdf_path, sha, runtime.paper_input(pdf_path, sha))
+    calls = []
+
+    # per-section mode; Section E gets the Section C summary from this run
+    per_section = {}
+    for name, spec in SPECS.items():
+        context_text = None
+        if spec.depends_on:
+            context_text = spec.build_context(per_section.get(spec.depends_on[0]) or {})
+        parts = [types.Part(text=t) for t in spec.text_parts(context_text)] + [file_part]
+        parsed, usage, elapsed = timed_call(runtime, parts, spec.schema)
+        per_section[name] = parsed
+        calls.append({"File_Name": fname, "Mode": "per_section", "Section": name,
+                      "Seconds": elapsed, "OK": parsed is not None, **usage})
+
+    # combined mode
+    prompt, schema = combined_request(SPECS)
+    parsed, usage, elapsed = timed_call(runtime, [types.Part(text=prompt), file_part], schema)
+    combined = split_combined(parsed or {}, SPECS)
+    calls.append({"File_Name": fname, "Mode": "combined", "Section": "all",
+                  "Seconds": elapsed, "OK": parsed is not None, **usage})
+
+    agreement = []
+    for name, spec in SPECS.items():
+        if per_section[name] is None or combined[name] is None:
+            continue
+        for field, value in compare_rows(per_section[name], combined[name], spec.schema).items():
+            agreement.append({"File_Name": fname, "Section": name, "Field": field, "Agreement": value})
+    return calls, agreement
+
+
+def benchmark_paper_text(runtime, pdf_path):
+    """
+    Code one paper section by section twice: with the uploaded PDF and
+    with its locally extracted text. Section E gets the Section C
+    summary of the PDF-mode answer in both modes, so only the input
+    differs. Return (call_records, agreement_records); a paper without
+    a usable text layer is skipped.
+    """
+    fname = os.path.basename(pdf_path)
+    sha = file_sha256(pdf_path)
+
+    start_time = time.time()
+    paper_text = runtime.texts.text(pdf_path, sha)
+    text_seconds = time.time() - start_time
+    if paper_text is None:
+        print(f"Skipping {fname}: no usable text layer")
+        return [], []
+    start_time = time.time()
+    file_part = pdf_part(runtime.uploads.get(runtime.client, pdf_path, sha=sha))
+    upload_seconds = time.time() - start_time
+
+    inputs = {
+        "pdf": (file_part, upload_seconds),
+        "text": (types.Part(text=paper_text), text_seconds),
+    }
+    answers = {mode: {} for mode in inputs}
+    calls = []
+    for name, spec in SPECS.items():
+        context_text = None
+        if spec.depends_on:
+            context_text = spec.build_context(answers["pdf"].get(spec.depends_on[0]) or {})
+        for mode, (paper, prepare_seconds) in inputs.items():
+            parts = [types.Part(text=t) for t in spec.text_parts(context_text)] + [paper]
+            parsed, usage, elapsed = timed_call(runtime, parts, spec.schema)
+            answers[mode][name] = parsed
+            calls.append({"File_Name": fname, "Mode": mode, "Section": name,
+                          "Seconds": elapsed, "OK": parsed is not None, **usage,
+                          # counted once per paper, on its first section
+                          "Prepare_Seconds": prepare_seconds if name == next(iter(SPECS)) else 0.0})
+
+    agreement = []
+    for name, spec in SPECS.items():
+        if answers["pdf"][name] is None or answers["text"][name] is None:
+            continue
+        for field, value in compare_rows(answers["pdf"][name], answers["text"][name], spec.schema).items():
+            agreement.append({"File_Name": fname, "Section": name, "Field": field, "Agreement": value})
+    return calls, agreement
+
+
+# ----------------------------------------------------------
+# helper 3. run and summarize
+# ----------------------------------------------------------
+def summarize_modes(calls_df, agreement_df):
+    """
+    Print mean tokens and latency per paper for each mode, and the mean
+    field agreement between modes per section.
+    """
+    print("\nTokens and latency per paper (mean)")
+    per_paper = calls_df.groupby(["Mode", "File_Name"]).sum(numeric_only=True).groupby("Mode").mean()
+    columns = ["prompt_token_count", "candidates_token_count",
+               "thoughts_token_count", "total_token_count", "Seconds"]
+    if "Prepare_Seconds" in per_paper:
+        columns.append("Prepare_Seconds")
+    print(per_paper[columns].round(1))
+
+    if not agreement_df.empty:
+        print("\nField agreement between modes (mean, 1 = identical)")
+        print(agreement_df.groupby("Section")["Agreement"].mean().round(3))
+        print(f"Overall  {agreement_df['Agreement'].mean():.3f}")
+
+
+def run_benchmark(runtime, n_papers, calls_csv, agreement_csv, paper_fn=benchmark_paper):
+    """
+    Run paper_fn (benchmark_paper: per-section vs combined;
+    benchmark_paper_text: PDF vs text input) on the first n_papers of
+    the configured PDF list, save the raw records and print a summary
+    of tokens, latency and field agreement. Return (calls_df, agreement_df).
+    """
+    config = runtime.config
+    pdf_files = work_set(config)
+
+    all_calls, all_agreement = [], []
+    for fname in pdf_files[:n_papers]:
+        fpath = os.path.join(config.pdf_dir, fname)
+        if not os.path.exists(fpath):
+            print(f"Skipping, file not found: {fpath}")
+            continue
+        print(f"\nBenchmarking {fname}")
+        calls, agreement = paper_fn(runtime, fpath)
+        all_calls.extend(calls)
+        all_agreement.extend(agreement)
+
+    calls_df = pd.DataFrame(all_calls)
+    agreement_df = pd.DataFrame(all_agreement)
+    calls_df.to_csv(calls_csv, index=False)
+    agreement_df.to_csv(agreement_csv, index=False)
+
+    if calls_df.empty:
+        print("No papers benchmarked")
+        return calls_df, agreement_df
+
+    summarize_modes(calls_df, agreement_df)
+    print(f"\nSaved call records to  {calls_csv}")
+    print(f"Saved agreement to     {agreement_csv}")
+    return calls_df, agreement_df
+
+
+# ----------------------------------------------------------
+# offline throughput benchmark against the fake client
+# ----------------------------------------------------------
+def offline_run(config, sections, client, scratch_dir, label):
+    """
+    Run sections end to end through the scheduler with client (usually
+    a FakeGeminiClient), keeping every output, registry and log inside
+    scratch_dir and the response cache off, so each run starts cold.
+    Return one summary row: papers per minute, call latency p50/p95/p99,
+    local overhead per call (time not spent in upload, cache creation or
+    generation), retries, errors (calls without a usable answer), answers
+    with invalid fields and throttled calls.
+    """
+    run_dir = os.path.join(scratch_dir, label)
+    os.makedirs(run_dir, exist_ok=True)
+    metrics_path = os.path.join(run_dir, "calls.jsonl")
+    config = config.with_overrides(
+        use_response_cache=False,
+        upload_registry_json=os.path.join(run_dir, "uploads.json"),
+        context_cache_registry_json=os.path.join(run_dir, "context_caches.json"),
+        page_subset_dir=os.path.join(run_dir, "subsets"),
+        pdf_text_cache_dir=os.path.join(run_dir, "pdf_text"),
+        metrics_jsonl=metrics_path,
+        round_name=label,
+    )
+    output_csvs = {name: os.path.join(run_dir, f"section{name}.csv") for name in sections}
+
+    start_time = time.time()
+    run_sections(sections, config, output_csvs, client=client)
+    wall = time.time() - start_time
+
+    calls = read_metrics([metrics_path])
+    overhead = calls["total_seconds"].copy()
+    for phase in ("upload", "context_cache", "generate"):
+        if f"phase_{phase}" in calls:
+            overhead -= calls[f"phase_{phase}"].fillna(0)
+    n_papers = len(config.pdf_files)
+    return {
+        "run": label,
+        "workers": config.max_workers,
+        "papers": n_papers,
+        "calls": len(calls),
+        "wall_seconds": wall,
+        "papers_per_minute": n_papers / wall * 60,
+        "p50_call_seconds": calls["total_seconds"].quantile(0.5),
+        "p95_call_seconds": calls["total_seconds"].quantile(0.95),
+        "p99_call_seconds": calls["total_seconds"].quantile(0.99),
+        "p50_overhead_ms": overhead.quantile(0.5) * 1000,
+        "p95_overhead_ms": overhead.quantile(0.95) * 1000,
+        **({"p50_first_field_seconds": calls["first_field_seconds"].quantile(0.5),
+            "stream_aborts": int(calls["stream_aborts"].fillna(0).sum())}
+           if "first_field_seconds" in calls else {}),
+        "retries": int(calls["retries"].sum()),
+        "errors": int(calls["outcome"].isin(ERROR_OUTCOMES).sum()),
+        "invalid_fields": int((calls["outcome"] == "invalid_fields").sum()),
+        "throttled": getattr(client, "throttled", None),
+    }
+
+
+def run_offline_benchmark(config, sections, worker_counts, client_factory, n_synthetic=None,
+                          results_csv=None):
+    """
+    Benchmark the pipeline offline: for each worker count, run sections
+    over the configured PDFs (or n_synthetic generated papers) against a
+    fresh client from client_factory(), then print and return a table
+    of throughput, tail latency and local overhead per run.
+    """
+    scratch_dir = tempfile.mkdtemp(prefix="llmreview-bench-")
+    if n_synthetic:
+        pdf_dir = os.path.join(scratch_dir, "pdfs")
+        config = config.with_overrides(pdf_dir=pdf_dir, pdf_files=make_synthetic_pdfs(pdf_dir, n_synthetic))
+    else:
+        config = config.with_overrides(pdf_files=work_set(config))
+
+    rows = []
+    for workers in worker_counts:
+        label = f"workers{workers}"
+        print(f"\n=== Offline run {label}: sections {' '.join(sections)} ===")
+        rows.append(offline_run(config.with_overrides(max_workers=workers), sections,
+                                client_factory(), scratch_dir, label))
+
+    results = pd.DataFrame(rows)
+    print("\nOffline benchmark")
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(results.round(2).to_string(index=False))
+    if results_csv:
+        results.to_csv(results_csv, index=False)
+        print(f"Saved results to {results_csv}")
+    print(f"Run outputs kept in {scratch_dir}")
+    return results
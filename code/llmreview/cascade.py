@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import datetime
+import re
+
+from llmreview.agreement import comparable_fields, field_agreement
+from llmreview.fake_responses import schema_dict
+from llmreview.validation import CompiledSchema, sub_schema
+
+_ISO3 = re.compile(r"^[A-Z]{3}$")
+_NOT_REPORTED = "not reported"
+
+
+def _blank(value):
+    return value is None or (isinstance(value, str) and not value.strip()) or value == []
+
+
+def _chosen(value):
+    if isinstance(value, list):
+        return value
+    return [] if value is None else [value]
+
+
+# ----------------------------------------------------------
+# consistency rules checked on the fast model's answer
+# ----------------------------------------------------------
+def _detail_rules(properties, answer, justify_all=False):
+    """
+    Every section: "Other" needs the alternative described in the
+    field's *_Detail partner. justify_all (Section E, whose prompt asks
+    for a justification of every coding) needs a detail for any coded
+    field.
+    """
+    problems = {}
+    for name in properties:
+        detail = f"{name}_Detail"
+        if detail not in properties or name not in answer or not _blank(answer.get(detail)):
+            continue
+        chosen = _chosen(answer.get(name))
+        if "Other" in chosen:
+            problems[name] = "'Other' selected without a description"
+            problems[detail] = "empty although 'Other' is selected"
+        elif justify_all and chosen:
+            problems[detail] = f"no justification for {name}"
+    return problems
+
+
+def _section_ab_rules(answer):
+    problems = {}
+    year = answer.get("Year")
+    if isinstance(year, int) and not 1900 <= year <= datetime.date.today().year + 1:
+        problems["Year"] = f"implausible publication year {year}"
+    for name in ("Title", "Lead_Author", "Journal"):
+        if name in answer and _blank(answer.get(name)):
+            problems[name] = "empty"
+    author = answer.get("Lead_Author")
+    if isinstance(author, str) and author.strip() and "," not in author:
+        problems["Lead_Author"] = "not formatted as 'Last Name, First Name'"
+    country, iso3 = answer.get("Country"), answer.get("Country_ISO3")
+    if isinstance(country, str) and isinstance(iso3, str):
+        countries = [c.strip() for c in country.split(";") if c.strip()]
+        codes = [c.strip() for c in iso3.split(";") if c.strip()]
+        if (country.strip().lower() == _NOT_REPORTED) != (iso3.strip().lower() == _NOT_REPORTED):
+            problems["Country_ISO3"] = "'Not reported' in only one of Country and Country_ISO3"
+        elif iso3.strip().lower() != _NOT_REPORTED:
+            if len(codes) != len(countries):
+                problems["Country_ISO3"] = f"{len(codes)} codes for {len(countries)} countries"
+            elif not all(_ISO3.match(c) for c in codes):
+                problems["Country_ISO3"] = "not ISO 3166-1 alpha-3 codes"
+    return problems
+
+
+def _section_e_rules(answer):
+    groups = _chosen(answer.get("Target_User_Groups"))
+    if len(groups) > 1 and any(g.startswith("None") for g in groups):
+        return {"Target_User_Groups": "'None (general public)' combined with specific groups"}
+    return {}
+
+
+SECTION_RULES = {
+    "AB": _section_ab_rules,
+    "E": _section_e_rules,
+}
+
+
+def consistency_problems(section, schema, answer):
+    """
+    {field: problem} for the cross-field rules a schema alone cannot
+    express: the *_Detail rules of every section plus the section's own
+    rules (publication year, country / ISO3 alignment and author format
+    for AB; justified codings and an exclusive "None" group for E).
+    """
+    properties = schema_dict(schema).get("properties") or {}
+    problems = _detail_rules(properties, answer, justify_all=section == "E")
+    rule = SECTION_RULES.get(section)
+    if rule is not None:
+        problems.update(rule(answer))
+    return problems
+
+
+def disagreements(schema, answer, check):
+    """
+    {field: problem} for the coded fields on which two answers of the
+    fast model differ.
+    """
+    problems = {}
+    for name, multi in comparable_fields(schema).items():
+        if field_agreement(answer.get(name), check.get(name), multi) < 1.0:
+            problems[name] = "the fast model's answers disagree"
+    return problems
+
+
+# ----------------------------------------------------------
+# escalation to the main model
+# ----------------------------------------------------------
+def escalation_fields(schema, problems):
+    """
+    The fields to re-ask: the failing ones plus their *_Detail partners
+    (and the coded field of a failing *_Detail), in schema order.
+    """
+    properties = schema_dict(schema).get("properties") or {}
+    wanted = set(problems)
+    for name in problems:
+        wanted.add(f"{name}_Detail")
+        if name.endswith("_Detail"):
+            wanted.add(name[:-len("_Detail")])
+    return [name for name in properties if name in wanted]
+
+
+ESCALATION_NOTE = (
+    "Answer only the fields in the response schema, from the paper alone."
+)
+
+
+def escalate(ask, schema, answer, problems, max_field_share=0.5, source=""):
+    """
+    Send a fast-model answer with problems to the main model through
+    ask(schema, note) -> raw text. An unreadable answer, or one with
+    more than max_field_share of the schema's fields failing, is
+    re-asked whole; otherwise only the failing fields (with their
+    details) are, under a sub-schema, and merged into the answer.
+    Returns (answer or None, escalation: "" | "fields" | "paper",
+    escalated field names).
+    """
+    properties = schema_dict(schema).get("properties") or {}
+    if answer is not None and not problems:
+        return answer, "", []
+    names = escalation_fields(schema, problems) if answer is not None else list(properties)
+    if answer is None or len(names) > max_field_share * len(properties):
+        print(f"Escalating {source} to the main model (whole paper, {len(problems)} problems)")
+        fresh, _, _ = CompiledSchema(schema).check_text(ask(schema, None))
+        return fresh, "paper", list(properties)
+
+    print(f"Escalating {len(names)} fields of {source} to the main model: {', '.join(names)}")
+    partial_schema = sub_schema(schema, names)
+    partial = CompiledSchema(partial_schema)
+    part, _, _ = partial.check_text(ask(partial_schema, ESCALATION_NOTE))
+    for name in names:
+        if part and name in part and partial.field_problem(name, part[name]) is None:
+            answer[name] = part[name]
+    return answer, "fields", names
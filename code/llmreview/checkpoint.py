@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import json
+import math
+import os
+import threading
+
+import pandas as pd
+
+from llmreview.columnar import write_columnar
+
+
+def _json_safe(value):
+    # NaN is not valid JSON; store it as null
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+# ----------------------------------------------------------
+# append-only checkpoint journal
+# ----------------------------------------------------------
+class CheckpointJournal:
+    """
+    Crash-safe checkpointing for one output CSV.
+    Each finished paper is appended as one JSON line to
+    <output_csv>.journal.jsonl and fsynced, so a checkpoint costs one
+    short write instead of rewriting the whole CSV. compact() writes the
+    final CSV once (atomically, via a temp file) and removes the journal;
+    given the section schema and columnar formats, it also writes the
+    typed Arrow/Parquet copies next to the CSV (see columnar.py).
+    A torn last line left by a crash is dropped on the next load().
+    """
+
+    def __init__(self, output_csv, schema=None, columnar_formats=()):
+        self.output_csv = output_csv
+        self.schema = schema
+        self.columnar_formats = tuple(columnar_formats or ())
+        self.journal_path = f"{output_csv}.journal.jsonl"
+        self._lock = threading.Lock()
+
+    def _read_journal(self):
+        rows = []
+        if not os.path.exists(self.journal_path):
+            return rows
+        good_bytes = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    break
+                good_bytes += len(line)
+        if good_bytes < os.path.getsize(self.journal_path):
+            print(f"Dropping incomplete record at the end of {self.journal_path}")
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_bytes)
+        return rows
+
+    def load(self):
+        """
+        Return the rows already finished: the compacted CSV (if any)
+        followed by the journal. A journal row replaces a CSV row with
+        the same File_Name, which covers a crash between writing the CSV
+        and removing the journal.
+        """
+        rows = []
+        if os.path.exists(self.output_csv):
+            try:
+                rows = pd.read_csv(self.output_csv).to_dict(orient="records")
+                print(f"Loaded {len(rows)} existing rows from {self.output_csv}")
+            except Exception as e:
+                print(f"Could not load existing CSV: {e}")
+                rows = []
+
+        journal_rows = self._read_journal()
+        if journal_rows:
+            position = {str(r.get("File_Name")): i for i, r in enumerate(rows)}
+            for row in journal_rows:
+                key = str(row.get("File_Name"))
+                if key in position:
+                    rows[position[key]] = row
+                else:
+                    position[key] = len(rows)
+                    rows.append(row)
+            print(f"Recovered {len(journal_rows)} rows from {self.journal_path}")
+        return rows
+
+    def append(self, row):
+        """
+        Durably append one finished row to the journal.
+        """
+        line = json.dumps({k: _json_safe(v) for k, v in row.items()}, ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def compact(self, rows, columns=None):
+        """
+        Write all rows to the output CSV in one go and remove the
+        journal. columns, if given, fixes the leading column order.
+        Return the written DataFrame.
+        """
+        df = pd.DataFrame(rows)
+        if columns is not None:
+            extra = [c for c in df.columns if c not in columns]
+            df = df.reindex(columns=[c for c in list(columns) + extra if c in df.columns])
+        with self._lock:
+            tmp_path = f"{self.output_csv}.tmp"
+            df.to_csv(tmp_path, index=False)
+            with open(tmp_path, "rb+") as f:
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.output_csv)
+            if self.schema is not None:
+                write_columnar(df, self.output_csv, self.schema, self.columnar_formats)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        return df
@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+"""
+Command line entry point, run from the code/ directory:
+
+    python -m llmreview extract AB C D E      (E starts per paper once its C row lands)
+    python -m llmreview extract E --workers 8 --no-cache
+    python -m llmreview combined
+    python -m llmreview batch C --fake
+    python -m llmreview benchmark-combined --papers 5
+    python -m llmreview pdf-text --all-pdfs
+    python -m llmreview extract D E --input-mode text
+    python -m llmreview extract D E --select-pages
+    python -m llmreview extract AB C D E --stream
+    python -m llmreview extract AB --cascade models/gemini-2.5-flash --cascade-check
+    python -m llmreview extract C --consensus 5 --temperature 0.7 --round r36
+    python -m llmreview benchmark-text --papers 35
+    python -m llmreview metrics-summary
+    python -m llmreview corpus refresh
+    python -m llmreview corpus record-round r35 --name r35
+    python -m llmreview extract AB C D E --select new:r35 --round r36
+    python -m llmreview extract AB C D E --select changed:r35 --round r36   (replaces the changed papers' rows)
+    python -m llmreview corpus watch --sections AB C D E --round r36
+    python -m llmreview dedup --all-pdfs --threshold 0.7
+    python -m llmreview extract AB C D E --all-pdfs --dedup near
+    python -m llmreview columnar ../data/fulltext_extraction_section*_r35.csv
+    python -m llmreview coding-summary --field Distributive_Justice --by Country_ISO3
+    python -m llmreview verify-quotes ../data/fulltext_extraction_section*_r35.csv --csv quote_flags.csv
+    python -m llmreview reliability C r35=../data/fulltext_extraction_sectionC_r35.csv r36=sectionC_r36.csv
+    python -m llmreview bench-offline --synthetic 20 --workers-sweep 1 4 8 --rpm 60
+
+--round labels the metrics log and the files recorded in the corpus
+manifest; rows are still written to each section's CSV (or --output),
+next to the rows of earlier rounds.
+"""
+import argparse
+import os
+
+from llmreview.config import RunConfig
+from llmreview.corpus import files_to_replace, list_pdf_files, work_set
+from llmreview.specs import SECTION_NAMES
+
+
+def config_from_args(args):
+    config = RunConfig().with_overrides(
+        api_key=args.api_key,
+        pdf_dir=args.pdf_dir,
+        model=args.model,
+        max_workers=args.workers,
+        input_mode=args.input_mode,
+        round_name=args.round,
+        metrics_jsonl=args.metrics,
+        temperature=args.temperature,
+        consensus_replicates=args.consensus,
+        consensus_min_replicates=args.consensus_min,
+        consensus_agreement=args.consensus_agreement,
+        cascade_model=args.cascade,
+        pdf_query=args.select,
+        dedup=args.dedup,
+    )
+    if args.cascade_check:
+        config = config.with_overrides(cascade_check=True)
+    if args.stream:
+        config = config.with_overrides(stream=True)
+    if args.no_cache:
+        config = config.with_overrides(use_response_cache=False)
+    if args.select_pages:
+        config = config.with_overrides(select_pages=True)
+    if args.context_cache:
+        config = config.with_overrides(use_context_cache=True,
+                                       context_cache_ttl_minutes=args.cache_ttl_minutes)
+    if args.all_pdfs:
+        config = config.with_overrides(pdf_files=list_pdf_files(config.pdf_dir))
+    return config
+
+
+def cmd_extract(args):
+    from llmreview.scheduler import dependency_order, run_sections
+
+    names = dependency_order(args.sections)
+    if args.output and len(names) > 1:
+        raise SystemExit("--output can only be used with a single section")
+    output_csvs = {names[0]: args.output} if args.output else None
+    config = config_from_args(args)
+    files = work_set(config)
+    config = config.with_overrides(pdf_files=files, reextract_files=sorted(files_to_replace(config, files)))
+    run_sections(names, config, output_csvs=output_csvs)
+    record_round(config)
+
+
+def record_round(config):
+    """
+    With --round and a corpus manifest, remember the files the round
+    ran on for later new:/changed: queries.
+    """
+    if not config.round_name or not os.path.exists(config.manifest_json):
+        return
+    from llmreview.manifest import CorpusManifest
+
+    manifest = CorpusManifest(config.manifest_json, config.pdf_dir)
+    manifest.record_round(config.round_name, config.pdf_files)
+    print(f"Recorded {len(config.pdf_files)} PDFs as round {config.round_name} in {config.manifest_json}")
+
+
+def cmd_combined(args):
+    from llmreview.combined import run_combined
+
+    run_combined(config_from_args(args))
+
+
+def cmd_batch(args):
+    from llmreview.batch import run_batch_section
+
+    run_batch_section(args.section, config_from_args(args), output_csv=args.output,
+                      job_jsonl=args.job_jsonl, poll_seconds=args.poll_seconds, fake=args.fake)
+
+
+def cmd_pdf_text(args):
+    from llmreview.concurrency import run_ordered
+    from llmreview.pdftext import PdfTextCache
+
+    config = config_from_args(args)
+    texts = PdfTextCache(config.pdf_text_cache_dir)
+    pdf_files = config.pdf_files or list_pdf_files(config.pdf_dir)
+
+    def extract(fname):
+        fpath = os.path.join(config.pdf_dir, fname)
+        if not os.path.exists(fpath):
+            return None
+        return texts.pages(fpath)
+
+    for fname, pages in run_ordered(extract, pdf_files, config.max_workers):
+        if pages is None:
+            print(f"{fname}: file not found")
+        else:
+            print(f"{fname}: {len(pages)} pages, {sum(len(p) for p in pages)} characters")
+
+
+def cmd_benchmark_combined(args):
+    from llmreview.benchmark import run_benchmark
+    from llmreview.engine import Runtime
+
+    runtime = Runtime(config_from_args(args))
+    run_benchmark(runtime, args.papers, args.calls_csv, args.agreement_csv)
+
+
+def cmd_benchmark_text(args):
+    from llmreview.benchmark import benchmark_paper_text, run_benchmark
+    from llmreview.engine import Runtime
+
+    runtime = Runtime(config_from_args(args))
+    run_benchmark(runtime, args.papers, args.calls_csv, args.agreement_csv,
+                  paper_fn=benchmark_paper_text)
+
+
+def cmd_bench_offline(args):
+    from llmreview.benchmark import run_offline_benchmark
+    from llmreview.fake_gemini import FakeGeminiClient
+    from llmreview.scheduler import dependency_order
+
+    config = config_from_args(args)
+
+    def client_factory():
+        return FakeGeminiClient(latency_median=args.latency, latency_sigma=args.sigma,
+                                upload_seconds=args.upload_seconds, error_rate=args.error_rate,
+                                quota_rpm=args.rpm, quota_error_rate=args.quota_error_rate,
+                                off_schema_rate=args.off_schema_rate, seed=args.seed)
+
+    worker_counts = args.workers_sweep or [config.max_workers]
+    run_offline_benchmark(config, dependency_order(args.sections), worker_counts, client_factory,
+                          n_synthetic=args.synthetic, results_csv=args.csv)
+
+
+def cmd_columnar(args):
+    import pandas as pd
+
+    from llmreview.columnar import COLUMNAR_SUFFIXES, csv_section_name, write_columnar
+    from llmreview.specs import get_spec
+
+    for csv_path in args.csvs:
+        name = args.section or csv_section_name(csv_path)
+        if name is None:
+            print(f"{csv_path}: cannot tell the section from the name; pass --section")
+            continue
+        df = pd.read_csv(csv_path)
+        for path in write_columnar(df, csv_path, get_spec(name).schema, args.formats or list(COLUMNAR_SUFFIXES)):
+            print(f"{csv_path}: {len(df)} rows written to {path}")
+
+
+def cmd_coding_summary(args):
+    import pandas as pd
+
+    from llmreview.coding import cooccurrence, crosstab, load_coding_matrix, prevalence
+
+    section_csvs = {name: args.csv_pattern.format(section=name) for name in args.sections}
+    matrix = load_coding_matrix(section_csvs)
+    print(f"{len(matrix.index)} papers x {matrix.values.shape[1]} categories "
+          f"in {len(matrix.fields)} multi-select fields")
+    unlisted = {f: n for f, n in matrix.unlisted.items() if n}
+    if unlisted:
+        print(f"Values outside the schema vocabulary: {unlisted}")
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        if args.by:
+            print(crosstab(matrix, args.field, args.by, sep=args.sep).to_string())
+        elif args.cooccur:
+            table = cooccurrence(matrix, [args.field])
+            table.index = table.index.get_level_values(1)
+            table.columns = table.columns.get_level_values(1)
+            print(table.to_string())
+        else:
+            print(prevalence(matrix, [args.field] if args.field else None).round(3).to_string())
+
+
+def cmd_reliability(args):
+    import pandas as pd
+
+    from llmreview.reliability import section_reliability
+
+    round_csvs = {}
+    for item in args.rounds:
+        label, _, path = item.rpartition("=")
+        round_csvs[label or os.path.splitext(os.path.basename(path))[0]] = path
+    if len(round_csvs) < 2:
+        raise SystemExit("reliability needs at least two rounds")
+    table = section_reliability(args.section, round_csvs)
+    print(f"Section {args.section}: {table.attrs['papers']} papers, rounds {', '.join(round_csvs)}")
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(table.drop(columns="section").round(3).to_string(index=False))
+    if args.csv:
+        table.to_csv(args.csv, index=False)
+        print(f"Saved reliability table to {args.csv}")
+
+
+def cmd_verify_quotes(args):
+    import time
+
+    import pandas as pd
+
+    from llmreview.quotes import section_csvs_from_paths, summarize_quotes, verify_quotes
+
+    config = config_from_args(args)
+    try:
+        section_csvs = section_csvs_from_paths(args.csvs)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    start = time.time()
+    table = verify_quotes(section_csvs, config.pdf_dir, config.pdf_text_cache_dir,
+                          processes=args.processes, threshold=args.threshold)
+    print(f"Checked {int(table['quotes'].sum())} quotes in {len(table)} detail fields of "
+          f"{table['File_Name'].nunique()} papers in {time.time() - start:.2f} sec")
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(summarize_quotes(table).round(3).to_string(index=False))
+    if args.csv:
+        table.to_csv(args.csv, index=False)
+        print(f"Saved per-field flags to {args.csv}")
+
+
+def cmd_corpus(args):
+    from llmreview.manifest import load_manifest, watch
+
+    config = config_from_args(args)
+    manifest = load_manifest(config)
+
+    def select(query):
+        try:
+            return manifest.select(query)
+        except KeyError as e:
+            raise SystemExit(e.args[0])
+
+    if args.action == "refresh":
+        for sha, names in manifest.duplicates().items():
+            print(f"Same content ({sha[:12]}): {', '.join(names)}")
+    elif args.action == "list":
+        for name in select(args.query or "all"):
+            entry = manifest.files[name]
+            print(f"{name}\t{entry['pages']} pages\t{entry['size']} bytes\t{entry['sha256'][:12]}"
+                  f"\tfirst seen {entry['first_seen'][:10]}")
+    elif args.action == "subset":
+        if not args.name:
+            raise SystemExit("subset needs --name")
+        files = select(args.query) if args.query else args.files
+        manifest.save_subset(args.name, files)
+        print(f"Saved subset {args.name} with {len(files)} PDFs")
+    elif args.action == "record-round":
+        if not args.name:
+            raise SystemExit("record-round needs --name")
+        files = select(args.query or "r35")
+        manifest.record_round(args.name, files)
+        print(f"Recorded {len(files)} PDFs as round {args.name}")
+    elif args.action == "watch":
+        from llmreview.scheduler import dependency_order, run_sections
+
+        names = dependency_order(args.sections)
+
+        def on_arrivals(files):
+            # arrivals are new or changed PDFs: replace any rows they have
+            run_config = config.with_overrides(pdf_files=files, reextract_files=files)
+            run_sections(names, run_config)
+            record_round(run_config)
+
+        watch(manifest, on_arrivals, interval_seconds=args.interval, settle_seconds=args.settle,
+              max_workers=config.max_workers)
+
+
+def cmd_dedup(args):
+    from llmreview.dedup import find_duplicates
+
+    config = config_from_args(args).with_overrides(dedup_near_threshold=args.threshold)
+    files = work_set(config)
+    aliases = find_duplicates(config, files, near=args.dedup != "exact",
+                              threshold=config.dedup_near_threshold)
+    groups = {}
+    for alias, (canonical, kind) in aliases.items():
+        groups.setdefault(canonical, []).append(f"{alias} ({kind})")
+    for canonical, members in groups.items():
+        print(f"{canonical}: {', '.join(members)}")
+    print(f"{len(files)} PDFs, {len(aliases)} duplicates in {len(groups)} groups, "
+          f"{len(files) - len(aliases)} to extract")
+
+
+def cmd_metrics_summary(args):
+    import pandas as pd
+
+    from llmreview.metrics import read_metrics, summarize_cascade, summarize_metrics
+
+    df = read_metrics(args.logs)
+    if df.empty:
+        print("No metrics records found")
+        return
+    summary = summarize_metrics(df)
+    cascade = summarize_cascade(df)
+    with pd.option_context("display.max_columns", None, "display.width", 200):
+        print(summary.round(3).to_string(index=False))
+        if not cascade.empty:
+            print("\nCascade")
+            print(cascade.round(3).to_string(index=False))
+    if args.csv:
+        summary.to_csv(args.csv, index=False)
+        print(f"Saved summary to {args.csv}")
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--pdf-dir", help="folder holding the papers")
+    common.add_argument("--all-pdfs", action="store_true",
+                        help="run every PDF in --pdf-dir instead of the r35 list")
+    common.add_argument("--select", metavar="QUERY",
+                        help="pick the papers from the corpus manifest: all, new:r35, changed:r35, "
+                             "pending:r35, subset:NAME, since:2025-06-01 (rows of changed papers are replaced)")
+    common.add_argument("--workers", type=int, help="papers kept in flight at once")
+    common.add_argument("--model", help="Gemini model name")
+    common.add_argument("--no-cache", action="store_true", help="bypass the response cache")
+    common.add_argument("--api-key", help="Gemini key (default: GEMINI_API_KEY)")
+    common.add_argument("--input-mode", choices=["pdf", "text"],
+                        help="send the uploaded PDF (default) or its locally extracted text")
+    common.add_argument("--select-pages", action="store_true",
+                        help="send D and E only their Methods-Results pages instead of the whole paper")
+    common.add_argument("--context-cache", action="store_true",
+                        help="reference each paper through an explicit context cache")
+    common.add_argument("--cache-ttl-minutes", type=int, help="context cache lifetime")
+    common.add_argument("--stream", action="store_true",
+                        help="stream answers, validate fields as they arrive, re-ask off-schema output")
+    common.add_argument("--temperature", type=float, help="sampling temperature (default 0)")
+    common.add_argument("--cascade", metavar="MODEL",
+                        help="ask this faster model first and escalate failing fields to --model")
+    common.add_argument("--cascade-check", action="store_true",
+                        help="ask the fast model twice and escalate fields its answers disagree on")
+    common.add_argument("--consensus", type=int, metavar="K",
+                        help="code each paper from up to K replicate calls, majority-voting enum fields")
+    common.add_argument("--consensus-min", type=int,
+                        help="replicates always called per paper in consensus mode (default 2)")
+    common.add_argument("--consensus-agreement", type=float,
+                        help="agreement that stops a paper's replicates early (default 1.0)")
+    common.add_argument("--dedup", choices=["off", "exact", "near"],
+                        help="extract duplicate PDFs once: identical files (default) or near-identical text")
+    common.add_argument("--round", help="round label for the metrics log and the corpus manifest (e.g. r36); "
+                                        "output CSVs are not renamed")
+    common.add_argument("--metrics", help="per-call metrics JSONL (default ./metrics/calls.jsonl)")
+
+    parser = argparse.ArgumentParser(prog="python -m llmreview", description="Full-text data extraction")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("extract", parents=[common], help="run one or more sections")
+    p.add_argument("sections", nargs="+", help="sections to run: " + " ".join(SECTION_NAMES))
+    p.add_argument("--output", help="output CSV (single section only)")
+    p.set_defaults(func=cmd_extract)
+
+    p = sub.add_parser("combined", parents=[common], help="all sections in one call per paper")
+    p.set_defaults(func=cmd_combined)
+
+    p = sub.add_parser("batch", parents=[common], help="one section as a batch job")
+    p.add_argument("section")
+    p.add_argument("--output", help="output CSV")
+    p.add_argument("--job-jsonl", help="batch input file (default ./batch_section<X>_r35.jsonl)")
+    p.add_argument("--poll-seconds", type=int, default=60)
+    p.add_argument("--fake", action="store_true", help="use the local fake batch server (outputs go to a scratch directory)")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("benchmark-combined", parents=[common],
+                       help="per-section vs combined tokens, latency and agreement")
+    p.add_argument("--papers", type=int, default=5)
+    p.add_argument("--calls-csv", default="./benchmark_combined_calls.csv")
+    p.add_argument("--agreement-csv", default="./benchmark_combined_agreement.csv")
+    p.set_defaults(func=cmd_benchmark_combined)
+
+    p = sub.add_parser("pdf-text", parents=[common], help="extract and cache the text of every PDF")
+    p.set_defaults(func=cmd_pdf_text)
+
+    p = sub.add_parser("benchmark-text", parents=[common],
+                       help="PDF vs extracted-text input: tokens, latency and agreement")
+    p.add_argument("--papers", type=int, default=35)
+    p.add_argument("--calls-csv", default="./benchmark_text_calls.csv")
+    p.add_argument("--agreement-csv", default="./benchmark_text_agreement.csv")
+    p.set_defaults(func=cmd_benchmark_text)
+
+    p = sub.add_parser("bench-offline", parents=[common],
+                       help="throughput and tail latency against the local fake Gemini client")
+    p.add_argument("--sections", nargs="+", default=list(SECTION_NAMES))
+    p.add_argument("--synthetic", type=int, help="generate this many synthetic papers instead of --pdf-dir")
+    p.add_argument("--workers-sweep", type=int, nargs="+", help="worker counts to compare")
+    p.add_argument("--latency", type=float, default=1.0, help="median generate latency, seconds")
+    p.add_argument("--sigma", type=float, default=0.5, help="lognormal spread of the latency")
+    p.add_argument("--upload-seconds", type=float, default=0.2)
+    p.add_argument("--error-rate", type=float, default=0.0, help="share of calls failing with 500/503")
+    p.add_argument("--rpm", type=int, help="fake quota in requests per minute (429 beyond it)")
+    p.add_argument("--quota-error-rate", type=float, default=0.0, help="share of random 429s")
+    p.add_argument("--off-schema-rate", type=float, default=0.0,
+                   help="share of answers holding a value outside the schema")
+    p.add_argument("--seed", type=int)
+    p.add_argument("--csv", help="also save the results table")
+    p.set_defaults(func=cmd_bench_offline)
+
+    p = sub.add_parser("columnar", help="write typed Arrow/Parquet copies of existing section CSVs")
+    p.add_argument("csvs", nargs="+", help="section CSVs, e.g. ../data/fulltext_extraction_sectionC_r35.csv")
+    p.add_argument("--section", choices=SECTION_NAMES, help="section of the CSVs (default: from the file name)")
+    p.add_argument("--formats", nargs="+", choices=["arrow", "parquet"])
+    p.set_defaults(func=cmd_columnar)
+
+    p = sub.add_parser("coding-summary", help="category prevalence, co-occurrence and cross-tabs")
+    p.add_argument("--csv-pattern", default="../data/fulltext_extraction_section{section}_r35.csv",
+                   help="section CSV path with a {section} placeholder")
+    p.add_argument("--sections", nargs="+", default=list(SECTION_NAMES))
+    p.add_argument("--field", help="limit to one multi-select field")
+    p.add_argument("--by", help="cross-tab --field by this column or multi-select field")
+    p.add_argument("--sep", help="split --by values on this separator (e.g. ';' for country lists)")
+    p.add_argument("--cooccur", action="store_true", help="category co-occurrence within --field")
+    p.set_defaults(func=cmd_coding_summary)
+
+    p = sub.add_parser("corpus", parents=[common], help="PDF corpus manifest: refresh, queries, watch")
+    p.add_argument("action", choices=["refresh", "list", "subset", "record-round", "watch"])
+    p.add_argument("query", nargs="?", help="work-set query for list / subset / record-round")
+    p.add_argument("--name", help="subset or round name")
+    p.add_argument("--files", nargs="+", default=[], help="files of a subset (instead of a query)")
+    p.add_argument("--sections", nargs="+", default=list(SECTION_NAMES), help="sections run on arrivals (watch)")
+    p.add_argument("--interval", type=int, default=60, help="seconds between scans (watch)")
+    p.add_argument("--settle", type=int, default=30, help="seconds a new file must be unmodified (watch)")
+    p.set_defaults(func=cmd_corpus)
+
+    p = sub.add_parser("dedup", parents=[common], help="list duplicate and near-duplicate PDFs of the work set")
+    p.add_argument("--threshold", type=float, help="estimated text similarity of near duplicates (default 0.8)")
+    p.set_defaults(func=cmd_dedup)
+
+    p = sub.add_parser("verify-quotes", parents=[common],
+                       help="check the quotes in *_Detail fields against the papers' text")
+    p.add_argument("csvs", nargs="+", help="section CSVs of any rounds, optionally labelled: r36=sectionC.csv")
+    p.add_argument("--processes", type=int, help="worker processes (default: one per CPU)")
+    p.add_argument("--threshold", type=float, default=0.8,
+                   help="share of a quote's word 4-grams that must occur in the paper")
+    p.add_argument("--csv", help="save the per-field verified/unverified flags")
+    p.set_defaults(func=cmd_verify_quotes)
+
+    p = sub.add_parser("reliability", help="kappa, alpha and Jaccard between rounds of a section")
+    p.add_argument("section", choices=SECTION_NAMES)
+    p.add_argument("rounds", nargs="+", help="section CSVs, optionally labelled: r35=path.csv human=coder1.csv")
+    p.add_argument("--csv", help="also save the table")
+    p.set_defaults(func=cmd_reliability)
+
+    p = sub.add_parser("metrics-summary", help="p50/p95 latency, throughput and token cost per section")
+    p.add_argument("logs", nargs="*", default=["./metrics/calls.jsonl"], help="metrics JSONL files")
+    p.add_argument("--csv", help="also save the summary table")
+    p.set_defaults(func=cmd_metrics_summary)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+from llmreview.agreement import as_list
+from llmreview.columnar import read_section
+from llmreview.dedup import canonical_rows
+from llmreview.fake_responses import schema_dict
+from llmreview.specs import SPECS
+
+
+def multi_select_fields(schema):
+    """
+    {field: categories} for every array-of-enum field of a section
+    schema, categories in schema order.
+    """
+    out = {}
+    for name, prop in (schema_dict(schema).get("properties") or {}).items():
+        items = prop.get("items") or {}
+        if str(prop.get("type") or "").lower() == "array" and items.get("enum"):
+            out[name] = list(items["enum"])
+    return out
+
+
+def one_hot_cells(cells, categories):
+    """
+    Boolean matrix (cells x categories) for a column of multi-select
+    cells (lists or their CSV repr text), plus the number of values not
+    in the vocabulary.
+    """
+    lists = pd.Series([as_list(v) for v in cells], dtype=object)
+    flat = lists.explode()
+    flat = flat[flat.notna()]
+    codes = pd.Categorical(flat.astype(str).str.strip(), categories=categories).codes
+    known = codes >= 0
+    matrix = np.zeros((len(lists), len(categories)), dtype=bool)
+    matrix[flat.index.to_numpy()[known], codes[known]] = True
+    return matrix, int((~known).sum())
+
+
+# ----------------------------------------------------------
+# papers x categories matrix
+# ----------------------------------------------------------
+class CodingMatrix:
+    """
+    One-hot coding of every multi-select field of the loaded sections:
+    values is a boolean matrix with one row per paper (per round, when
+    several rounds are stacked) and one column per (field, category),
+    vocabularies taken from the section schemas. attributes holds the
+    single-value columns (Country_ISO3, Article_Type, ...) for grouping,
+    and unlisted counts values outside each field's vocabulary.
+    """
+
+    def __init__(self, index, values, columns, sections, attributes, unlisted):
+        self.index = index
+        self.values = values
+        self.columns = columns
+        self.sections = sections
+        self.attributes = attributes
+        self.unlisted = unlisted
+
+    @property
+    def fields(self):
+        return list(dict.fromkeys(self.columns.get_level_values(0)))
+
+    def field(self, name):
+        """
+        The (papers x categories) block of one field, as a bool array,
+        and its category labels.
+        """
+        mask = self.columns.get_level_values(0) == name
+        if not mask.any():
+            raise KeyError(f"{name} is not a multi-select field of the loaded sections")
+        return self.values[:, mask], list(self.columns[mask].get_level_values(1))
+
+    def packed(self):
+        """
+        The matrix as a bitset (np.packbits along the categories), one
+        byte per 8 categories per paper.
+        """
+        return np.packbits(self.values, axis=1)
+
+    def to_frame(self):
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns)
+
+
+def build_coding_matrix(frames, round_name=None):
+    """
+    Build a CodingMatrix from {section: DataFrame} (section rows as
+    written by a run or read from CSV/Arrow). Papers are matched on
+    File_Name across sections; a paper missing from a section has no
+    categories set there. Rows of duplicate PDFs (DUPLICATE_OF) are left
+    out. round_name adds a round level to the index.
+    """
+    frames = {name: canonical_rows(df) for name, df in frames.items()}
+    files = pd.Index(pd.unique(pd.concat(
+        [df["File_Name"].astype(str) for df in frames.values()], ignore_index=True)))
+    blocks, labels, sections, unlisted = [], [], {}, {}
+    attributes = pd.DataFrame(index=files)
+    for name, df in frames.items():
+        df = df.drop_duplicates("File_Name")
+        df.index = df["File_Name"].astype(str)
+        df = df.reindex(files)
+        fields = multi_select_fields(SPECS[name].schema)
+        for field, categories in fields.items():
+            cells = df[field] if field in df else pd.Series([None] * len(files))
+            block, n_unlisted = one_hot_cells(cells.tolist(), categories)
+            blocks.append(block)
+            labels += [(field, c) for c in categories]
+            sections[field] = name
+            unlisted[field] = n_unlisted
+        for column in df.columns:
+            if column in fields or column in ("File_Name", "ERROR", "INVALID_FIELDS", "DUPLICATE_OF", "DUPLICATE_KIND"):
+                continue
+            if not column.endswith("_Detail"):
+                attributes[column] = df[column].to_numpy()
+
+    index = files
+    if round_name is not None:
+        index = pd.MultiIndex.from_product([[round_name], files], names=["round", "File_Name"])
+        attributes.index = index
+    columns = pd.MultiIndex.from_tuples(labels, names=["field", "category"])
+    values = np.hstack(blocks) if blocks else np.zeros((len(files), 0), dtype=bool)
+    return CodingMatrix(index, values, columns, sections, attributes, unlisted)
+
+
+def load_coding_matrix(section_csvs, round_name=None):
+    """
+    Load {section: CSV path} (the Arrow copy is used when current) and
+    build their CodingMatrix.
+    """
+    return build_coding_matrix({name: read_section(path) for name, path in section_csvs.items()},
+                               round_name=round_name)
+
+
+def stack_rounds(matrices):
+    """
+    Stack the CodingMatrix of several rounds (each built with its
+    round_name) into one, rows indexed by (round, File_Name).
+    """
+    first = matrices[0]
+    return CodingMatrix(
+        index=first.index.append([m.index for m in matrices[1:]]),
+        values=np.vstack([m.values for m in matrices]),
+        columns=first.columns,
+        sections=first.sections,
+        attributes=pd.concat([m.attributes for m in matrices]),
+        unlisted={f: sum(m.unlisted.get(f, 0) for m in matrices) for f in first.unlisted},
+    )
+
+
+# ----------------------------------------------------------
+# vectorized summaries
+# ----------------------------------------------------------
+def prevalence(matrix, fields=None):
+    """
+    Papers coding each category (count and share of papers), per field
+    and category. fields limits the output to some fields.
+    """
+    counts = matrix.values.sum(axis=0)
+    out = pd.DataFrame({
+        "section": [matrix.sections[f] for f in matrix.columns.get_level_values(0)],
+        "papers": counts,
+        "share": counts / max(len(matrix.index), 1),
+    }, index=matrix.columns)
+    if fields is not None:
+        out = out[out.index.get_level_values(0).isin(fields)]
+    return out
+
+
+def cooccurrence(matrix, fields=None):
+    """
+    Category x category counts of papers coding both (the diagonal is
+    the prevalence), computed as one matrix product X.T @ X.
+    """
+    values, columns = matrix.values, matrix.columns
+    if fields is not None:
+        mask = columns.get_level_values(0).isin(fields)
+        values, columns = values[:, mask], columns[mask]
+    x = values.astype(np.int32)
+    return pd.DataFrame(x.T @ x, index=columns, columns=columns)
+
+
+def crosstab(matrix, field, by, sep=None):
+    """
+    Papers coding each category of field, per group of by: the name of
+    an attribute column (e.g. "Country_ISO3") or another multi-select
+    field. With sep (e.g. ";"), attribute values such as "USA; GBR" are
+    split and a paper counts in each of its groups, as it does for a
+    multi-select by. Computed as one product G.T @ X of the group and
+    category indicator matrices.
+    """
+    x, categories = matrix.field(field)
+    if by in matrix.fields:
+        groups, group_names = matrix.field(by)
+    else:
+        labels = matrix.attributes[by].fillna("(missing)").astype(str)
+        if sep:
+            labels = labels.str.split(sep)
+        else:
+            labels = labels.map(lambda v: [v])
+        flat = pd.Series(labels.to_numpy(), dtype=object).explode().str.strip()
+        group_names, codes = np.unique(flat.to_numpy(dtype=str), return_inverse=True)
+        groups = np.zeros((len(labels), len(group_names)), dtype=bool)
+        groups[flat.index.to_numpy(), codes] = True
+    table = groups.astype(np.int32).T @ x.astype(np.int32)
+    return pd.DataFrame(table, index=pd.Index(group_names, name=by),
+                        columns=pd.Index(categories, name=field))
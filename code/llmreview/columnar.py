@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import math
+import os
+import re
+
+import pandas as pd
+
+from llmreview.agreement import as_list
+from llmreview.fake_responses import schema_dict
+
+# file suffix per columnar format, written next to the section CSV
+COLUMNAR_SUFFIXES = {"arrow": ".arrow", "parquet": ".parquet"}
+
+
+def columnar_path(output_csv, fmt):
+    """
+    Path of the columnar copy of a section CSV, e.g. sectionC.csv ->
+    sectionC.arrow.
+    """
+    return os.path.splitext(output_csv)[0] + COLUMNAR_SUFFIXES[fmt]
+
+
+def _is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    # a blank cell reads back from the CSV as missing, so store it as null
+    return isinstance(value, str) and not value.strip()
+
+
+def _column_kind(node):
+    """
+    Column type for one schema property: "list" (multi-select),
+    "category" (single enum), "int", "float", "bool" or "string".
+    Properties with alternatives (an integer or "Not reported") are
+    stored as text.
+    """
+    kind = str(node.get("type") or "").lower()
+    if kind == "array":
+        return "list"
+    if node.get("enum"):
+        return "category"
+    return {"integer": "int", "number": "float", "boolean": "bool"}.get(kind, "string")
+
+
+def _to_int(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else None
+
+
+def _to_text(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# ----------------------------------------------------------
+# section rows -> Arrow table
+# ----------------------------------------------------------
+def to_arrow_table(df, schema):
+    """
+    Convert a section DataFrame (rows as produced by a run, or read back
+    from its CSV) into an Arrow table typed from the section's response
+    schema: multi-select fields as list<string> (real lists and their
+    CSV repr text alike), single-choice enums as dictionary columns,
+    integers, numbers and booleans natively, everything else (File_Name,
+    *_Detail text, ERROR and INVALID_FIELDS) as strings.
+    """
+    import pyarrow as pa
+
+    properties = schema_dict(schema).get("properties") or {}
+    arrays, fields = [], []
+    for column in df.columns:
+        kind = _column_kind(properties[column]) if column in properties else "string"
+        values = [None if not isinstance(v, (list, tuple)) and _is_missing(v) else v
+                  for v in df[column].tolist()]
+        if kind == "list":
+            array = pa.array([None if v is None else [str(x) for x in as_list(v)] for v in values],
+                             type=pa.list_(pa.string()))
+        elif kind == "category":
+            array = pa.array([None if v is None else str(v) for v in values],
+                             type=pa.string()).dictionary_encode()
+        elif kind == "int":
+            array = pa.array([None if v is None else _to_int(v) for v in values], type=pa.int64())
+        elif kind == "float":
+            array = pa.array([None if v is None else float(v) for v in values], type=pa.float64())
+        elif kind == "bool":
+            array = pa.array([None if v is None else str(v).lower() in ("true", "1") for v in values],
+                             type=pa.bool_())
+        else:
+            array = pa.array([None if v is None else _to_text(v) for v in values], type=pa.string())
+        arrays.append(array)
+        fields.append(pa.field(column, array.type))
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def write_columnar(df, output_csv, schema, formats):
+    """
+    Write the columnar copies of a section table next to its CSV, one
+    per format ("arrow" = Arrow IPC file, memory-mappable; "parquet" =
+    zstd-compressed Parquet), atomically via temp files. Returns the
+    written paths; skipped with a note if pyarrow is not installed.
+    """
+    if not formats:
+        return []
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("pyarrow is not installed; skipping the Arrow/Parquet copies")
+        return []
+
+    table = to_arrow_table(df, schema)
+    paths = []
+    for fmt in formats:
+        path = columnar_path(output_csv, fmt)
+        tmp_path = f"{path}.tmp"
+        if fmt == "arrow":
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        else:
+            pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        paths.append(path)
+    return paths
+
+
+# ----------------------------------------------------------
+# loading
+# ----------------------------------------------------------
+def read_columnar(path):
+    """
+    Load a columnar section file as an Arrow table. An Arrow IPC file is
+    memory-mapped and read without copying (the table's buffers point
+    into the mapped file); Parquet is read through a memory map and
+    decoded.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(COLUMNAR_SUFFIXES["arrow"]):
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return pq.read_table(path, memory_map=True)
+
+
+def fresh_columnar_path(output_csv):
+    """
+    The Arrow (else Parquet) copy of a section CSV if it exists and is
+    at least as new as the CSV, else None.
+    """
+    csv_mtime = os.path.getmtime(output_csv) if os.path.exists(output_csv) else 0
+    for fmt in COLUMNAR_SUFFIXES:
+        path = columnar_path(output_csv, fmt)
+        if os.path.exists(path) and os.path.getmtime(path) >= csv_mtime:
+            return path
+    return None
+
+
+def read_section(output_csv):
+    """
+    Load a section's rows as a DataFrame, from its columnar copy when one
+    is current (multi-select cells come back as lists, enums as
+    categoricals, nulls as NaN) and from the CSV otherwise.
+    """
+    path = fresh_columnar_path(output_csv)
+    if path is None:
+        return pd.read_csv(output_csv)
+    try:
+        table = read_columnar(path)
+    except ImportError:
+        return pd.read_csv(output_csv)
+    df = table.to_pandas()
+    for field in table.schema:
+        if str(field.type).startswith("list"):
+            df[field.name] = [v if v is None else list(v) for v in df[field.name]]
+    for column in df.columns:
+        if df[column].dtype == object:
+            df[column] = df[column].where(df[column].notna(), float("nan"))
+    return df
+
+
+def csv_section_name(path):
+    """
+    Section name from a section CSV name such as
+    fulltext_extraction_sectionC_r35.csv, or None.
+    """
+    match = re.search(r"section([A-Z]+)", os.path.basename(path))
+    return match.group(1) if match else None
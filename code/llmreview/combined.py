@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+
+from google.genai import types
+
+from llmreview.checkpoint import CheckpointJournal
+from llmreview.concurrency import run_with_requeue
+from llmreview.corpus import drop_replaced, files_to_replace, work_set
+from llmreview.dedup import dedup_work_set, drop_stale_aliases, with_aliases
+from llmreview.engine import Runtime, settle_answer
+from llmreview.hashing import file_sha256
+from llmreview.response_cache import request_key
+from llmreview.specs import SPECS
+from llmreview.streaming import OffSchemaError
+
+COMBINED_PREAMBLE = """
+You are assisting a systematic literature review.
+In this single response you will code four sections of the same attached article:
+Section_AB (study metadata and methods), Section_C (quality dimensions),
+Section_D (outcomes) and Section_E (equity).
+Each section below comes with its own instructions. Fill each section's object
+following only that section's instructions, exactly as if it were a separate request.
+Section_E refers to a summary of how the study was coded in Section C. In this
+combined request there is no separate summary: use your own Section_C coding from
+this same response as that summary, and still confirm every justice claim against
+the Methods and Results of the article.
+"""
+
+
+def section_key(name):
+    return f"Section_{name}"
+
+
+# ----------------------------------------------------------
+# merge the per-section schemas into one namespaced schema
+# ----------------------------------------------------------
+def merge_schemas(section_schemas):
+    """
+    Build one object schema whose properties are the section schemas,
+    namespaced as Section_AB, Section_C, ... The insertion order of
+    section_schemas is kept in property_ordering, so Section_C is
+    generated before Section_E can refer to it.
+    """
+    keys = [section_key(name) for name in section_schemas]
+    return types.Schema(
+        type="object",
+        properties={
+            section_key(name): schema for name, schema in section_schemas.items()
+        },
+        required=keys,
+        property_ordering=keys,
+    )
+
+
+def build_combined_prompt(section_prompts):
+    """
+    Join the per-section prompts under one preamble, each under a
+    header naming its schema key.
+    """
+    parts = [COMBINED_PREAMBLE.strip()]
+    for name, prompt in section_prompts.items():
+        parts.append(f"===== Instructions for {section_key(name)} =====\n{prompt.strip()}")
+    return "\n\n".join(parts)
+
+
+def split_combined(parsed, section_names):
+    """
+    Split a parsed combined response back into one dict per section.
+    A section missing from the response (or not an object) maps to None.
+    """
+    out = {}
+    for name in section_names:
+        value = parsed.get(section_key(name)) if isinstance(parsed, dict) else None
+        out[name] = value if isinstance(value, dict) else None
+    return out
+
+
+def schema_columns(schema):
+    """
+    Return the output columns for a section CSV: File_Name followed by
+    the schema properties in declaration order.
+    """
+    return ["File_Name"] + list((schema.properties or {}).keys())
+
+
+# ----------------------------------------------------------
+# combined run: one call per paper, four section CSVs
+# ----------------------------------------------------------
+COMBINED_OUTPUT_CSVS = {
+    "AB": "./fulltext_extraction_sectionAB_combined.csv",
+    "C": "./fulltext_extraction_sectionC_combined.csv",
+    "D": "./fulltext_extraction_sectionD_combined.csv",
+    "E": "./fulltext_extraction_sectionE_combined.csv",
+}
+
+
+def combined_request(specs):
+    """
+    Return (prompt_text, schema) for one combined call covering specs
+    (a {name: SectionSpec} dict in run order).
+    """
+    prompt = build_combined_prompt({name: spec.prompt for name, spec in specs.items()})
+    schema = merge_schemas({name: spec.schema for name, spec in specs.items()})
+    return prompt, schema
+
+
+def process_single_pdf_combined(runtime, specs, pdf_path):
+    """
+    Serve the answer from the response cache if possible; otherwise get
+    the PDF's remote copy from the upload registry and ask for all
+    sections in one model call. Return ({section: result_dict},
+    elapsed_seconds). A section the model left out maps to None.
+    """
+    config = runtime.config
+    file_basename = os.path.basename(pdf_path)
+    record = runtime.metrics.start("combined", file_basename)
+    if not os.path.exists(pdf_path):
+        print(f"Skipping, file not found: {pdf_path}")
+        runtime.metrics.finish(record, "file_missing")
+        return None, None
+
+    start_time = time.time()
+    prompt, schema = combined_request(specs)
+
+    with record.phase("hash"):
+        pdf_sha = file_sha256(pdf_path)
+    # the combined call covers every section, so it always gets the full paper
+    with record.phase("prepare"):
+        paper = runtime.paper_input(pdf_path, pdf_sha)
+    cache_key = request_key(pdf_sha, [prompt] + paper.key_parts, schema, config.model, config.temperature)
+    raw_text = runtime.responses.get(cache_key)
+    from_cache = raw_text is not None
+    if from_cache:
+        print(f"Cache hit for {file_basename}")
+    else:
+        try:
+            response = runtime.generate([prompt], pdf_path, pdf_sha, paper, schema, record)
+            raw_text = response.text
+        except OffSchemaError as e:
+            print(f"Streamed answer left the schema for {pdf_path}: {e}")
+            runtime.metrics.finish(record, "parse_error", e)
+            elapsed = time.time() - start_time
+            return None, elapsed
+        except Exception as e:
+            print(f"Model call failed for {pdf_path}: {e}")
+            runtime.metrics.finish(record, "model_error", e)
+            elapsed = time.time() - start_time
+            return None, elapsed
+
+    def reask(schema, note):
+        return runtime.generate([prompt, note], pdf_path, pdf_sha, paper, schema, record).text
+
+    parsed, invalid = settle_answer(runtime, schema, raw_text, record, reask, file_basename)
+    if parsed is None:
+        print(f"JSON parse failed for {pdf_path}")
+        runtime.metrics.finish(record, "parse_error")
+        elapsed = time.time() - start_time
+        return None, elapsed
+
+    if invalid:
+        runtime.metrics.finish(record, "invalid_fields", "; ".join(invalid))
+    else:
+        if not from_cache:
+            runtime.responses.put(cache_key, json.dumps(parsed, ensure_ascii=False), source=file_basename)
+        runtime.metrics.finish(record, "cache_hit" if from_cache else "ok")
+
+    results = {}
+    for name, section_dict in split_combined(parsed, specs).items():
+        if section_dict is None:
+            print(f"Section {name} missing from response for {pdf_path}")
+            results[name] = None
+        else:
+            results[name] = {"File_Name": file_basename, **section_dict}
+            section_invalid = [p.split(".", 1)[-1] for p in invalid if p.split(".", 1)[0] == section_key(name)]
+            if section_invalid:
+                results[name]["INVALID_FIELDS"] = "; ".join(section_invalid)
+
+    elapsed = time.time() - start_time
+    return results, elapsed
+
+
+def process_folder_combined(runtime, specs, output_csvs):
+    """
+    Run the combined request over the configured PDF list, skip files
+    already present in every section CSV, append a checkpoint per
+    section after each file, and write the section CSVs at the end.
+    Return {section: DataFrame}.
+    """
+    config = runtime.config
+    per_file_times = {}
+
+    all_files = work_set(config)
+    pdf_files, aliases = dedup_work_set(config, all_files)
+
+    # Load existing CSVs and checkpoint journals if present
+    checkpoints = {name: CheckpointJournal(output_csvs[name], specs[name].schema, config.columnar_formats)
+                   for name in specs}
+    replace = files_to_replace(config, all_files)
+    rows = {name: drop_replaced(drop_stale_aliases(checkpoints[name].load(), aliases), replace) for name in specs}
+    processed = {
+        name: set(str(r.get("File_Name")) for r in rows[name]) for name in specs
+    }
+    total_files = len(pdf_files)
+    print(f"\nCombined run: {total_files} PDF files specified for processing")
+
+    # Skip PDFs that are already in every section CSV
+    pending = []
+    for idx, fname in enumerate(pdf_files, start=1):
+        if all(fname in processed[name] for name in specs):
+            print(f"[{idx}/{total_files}] Skipping {fname} because it already exists in the CSVs")
+            continue
+        pending.append((idx, fname))
+
+    def run_one(job):
+        idx, fname = job
+        fpath = os.path.join(config.pdf_dir, fname)
+        print(f"\n[{idx}/{total_files}] Processing {fname} ...")
+        return process_single_pdf_combined(runtime, specs, fpath)
+
+    print(f"Running {len(pending)} PDF files with up to {config.max_workers} in flight")
+    batch_start = time.time()
+
+    for (idx, fname), (results, elapsed) in run_with_requeue(
+            run_one, pending, config.max_workers,
+            failed=lambda result: result[0] is None,
+            requeue_rounds=config.requeue_rounds):
+        for name in specs:
+            if fname in processed[name]:
+                continue
+            result_dict = results.get(name) if results else None
+            if result_dict is None:
+                result_dict = {
+                    "File_Name": fname,
+                    "ERROR": "failed_to_extract"
+                }
+            rows[name].append(result_dict)
+            # Append checkpoint after each file
+            checkpoints[name].append(result_dict)
+        if results is not None:
+            print(f"Finished {fname} in {elapsed:.2f} seconds")
+        elif elapsed is not None:
+            print(f"Failed {fname} in {elapsed:.2f} seconds")
+        else:
+            print(f"Failed {fname} with no timing captured")
+        per_file_times[fname] = elapsed
+
+        print(f"Checkpoint saved  current row count {len(rows[next(iter(specs))])}")
+
+    # Final save: compact each journal into its CSV once, in list order
+    # (requeued papers may have finished after later ones)
+    order = {f: i for i, f in enumerate(all_files)}
+    dfs = {
+        name: checkpoints[name].compact(
+            sorted(with_aliases(rows[name], aliases), key=lambda r: order.get(str(r.get("File_Name")), -1)),
+            schema_columns(specs[name].schema),
+        )
+        for name in specs
+    }
+
+    print("\nProcessing summary")
+    print(f"Total files in folder  {total_files}")
+    for name, df in dfs.items():
+        print(f"Section {name:<3} rows      {len(df)}  saved to {output_csvs[name]}")
+    print(f"Total wall clock time  {time.time() - batch_start:.2f} sec")
+    for line in runtime.summary_lines():
+        print(line)
+
+    print("\nPer file elapsed time in seconds")
+    for fname, tval in per_file_times.items():
+        if tval is None:
+            print(f"{fname}: no timing recorded")
+        else:
+            print(f"{fname}: {tval:.2f} sec")
+
+    return dfs
+
+
+def run_combined(config, output_csvs=None, client=None):
+    """
+    Run the combined mode over all four sections and return
+    {section: DataFrame}.
+    """
+    runtime = Runtime(config, client=client)
+    try:
+        return process_folder_combined(runtime, dict(SPECS), output_csvs or COMBINED_OUTPUT_CSVS)
+    finally:
+        runtime.close()
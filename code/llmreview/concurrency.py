@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ----------------------------------------------------------
+# bounded concurrency with ordered results
+# ----------------------------------------------------------
+def run_ordered(worker, items, max_workers=1):
+    """
+    Call worker(item) for every item with at most max_workers calls in
+    flight at once, and yield (item, result) pairs in the same order as
+    items. A paper that finishes early is held back until every paper
+    before it has been yielded, so checkpoints and output rows keep the
+    input order no matter which request returns first.
+    With max_workers <= 1 the items are processed one after another.
+    """
+    items = list(items)
+
+    if max_workers is None or max_workers <= 1:
+        for item in items:
+            yield item, worker(item)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [pool.submit(worker, item) for item in items]
+        for item, future in zip(items, futures):
+            yield item, future.result()
+    finally:
+        # drop queued papers if the caller stops early (e.g. Ctrl+C)
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_with_requeue(worker, items, max_workers=1, failed=None, requeue_rounds=1):
+    """
+    Like run_ordered, but items whose result is judged failed(result)
+    are held back and run again in up to requeue_rounds extra passes
+    after the main pass, so a transient failure does not cost the paper
+    its place in the round. Successes are yielded in input order as
+    they arrive; requeued items follow in input order, and items that
+    still fail are yielded last with their final result.
+    """
+    failed = failed or (lambda result: result is None)
+    retry = []
+    for item, result in run_ordered(worker, items, max_workers):
+        if failed(result):
+            retry.append((item, result))
+        else:
+            yield item, result
+
+    for round_no in range(1, requeue_rounds + 1):
+        if not retry:
+            break
+        print(f"\nRe-queuing {len(retry)} failed item(s), pass {round_no} of {requeue_rounds}")
+        still_failed = []
+        for item, result in run_ordered(worker, [item for item, _ in retry], max_workers):
+            if failed(result):
+                still_failed.append((item, result))
+            else:
+                yield item, result
+        retry = still_failed
+
+    for item, result in retry:
+        yield item, result
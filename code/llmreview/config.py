@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import os
+from dataclasses import dataclass, field, replace
+
+# ----------------------------------------------------------
+# defaults shared by every entry point
+# ----------------------------------------------------------
+PDF_DIR = "/Users/ywon3/ASU Dropbox/Youngjae Won/RESEARCH/Ongoing/GQEquityReview/paper-pdfs/for-review"
+
+MODEL_NAME = "models/gemini-2.5-pro"
+TEMPERATURE = 0
+
+
+@dataclass
+class RunConfig:
+    """
+    Settings for one extraction run. The defaults match what the
+    section scripts used; override fields in a script or via the CLI.
+
+    api_key                 Gemini key; empty = GEMINI_API_KEY / GOOGLE_API_KEY
+    pdf_files               papers to run; None = pdf_query, else the r35 list
+    pdf_query               work-set query against the corpus manifest, e.g.
+                            "new:r35", "changed:r35", "subset:pilot", "all"
+                            (see manifest.CorpusManifest.select)
+    reextract_files         papers whose rows already in the output are
+                            replaced by a fresh extraction; None = the
+                            changed PDFs of a changed:/pending: pdf_query
+                            (see corpus.files_to_replace)
+    manifest_json           corpus manifest of pdf_dir (size, mtime, hash,
+                            pages per PDF; subsets; files of each round)
+    dedup                   "exact" extracts byte-identical PDFs once,
+                            "near" also papers with near-identical text
+                            (MinHash over word shingles); the duplicates'
+                            rows copy their canonical paper's; "off" = none
+    dedup_near_threshold    estimated shingle Jaccard similarity for "near"
+    dedup_signatures_json   MinHash signatures, keyed by PDF hash
+    max_workers             papers kept in flight at once (1 = sequential)
+    requests_per_minute,
+    tokens_per_minute       quota the model calls are paced to
+    max_retries             retries per call on 429/5xx
+    requeue_rounds          extra passes over papers that still failed
+    upload_registry_json    shared registry of uploaded PDFs
+    delete_uploads_at_end   delete the registered remote files after the run
+    response_cache_dir,
+    response_cache_max_mb,
+    use_response_cache      local response cache (off = always call the model)
+    context_csvs            {section: CSV} overriding a spec's context_csv
+    columnar_formats        typed copies written next to each section CSV:
+                            "arrow" (memory-mapped, read by dependent
+                            sections) and/or "parquet"; () = CSV only
+    input_mode              "pdf" sends the uploaded file, "text" sends the
+                            locally extracted text (scans fall back to pdf)
+    pdf_text_cache_dir      extracted page texts, keyed by PDF hash
+    select_pages            send D and E only their Methods-Results pages
+                            (full paper if the headings are not found);
+                            off = every section gets the full paper, as
+                            in the original scripts
+    page_subset_dir         reduced PDFs built for page selection
+    use_context_cache       put each paper in an explicit context cache
+                            (client.caches) shared by all section calls and
+                            rounds, instead of resending it with each call
+    context_cache_ttl_minutes, context_cache_registry_json,
+    delete_context_caches_at_end   cache lifetime, registry and cleanup
+    stream                  use the streaming API, validating fields as they
+                            arrive and aborting off-schema output early
+    stream_retries          re-asks after an aborted stream
+    reask_rounds            targeted re-asks for fields still off-schema
+                            after repair (0 = blank them straight away)
+    cascade_model           faster model asked first (e.g.
+                            "models/gemini-2.5-flash"); fields that fail the
+                            schema or consistency checks, or the whole
+                            paper, are escalated to model; "" = off
+    cascade_check           also ask the fast model a second time and
+                            escalate the fields its two answers disagree on
+    cascade_max_field_share escalate the whole paper when more than this
+                            share of its fields fail
+    consensus_replicates    k > 1 codes each paper from up to k replicate
+                            calls with enum and multi-select fields
+                            majority-voted (set temperature above 0 so
+                            replicates can differ); 0 = one call
+    consensus_min_replicates  replicates always called (concurrently)
+    consensus_agreement     modal share every vote needs to stop early
+                            (1.0 = the replicates agree unanimously)
+    metrics_jsonl           per-call metrics log (None = off)
+    round_name              label written into each metrics record, e.g. "r35"
+    """
+    api_key: str = ""
+    pdf_dir: str = PDF_DIR
+    pdf_files: list = None
+    pdf_query: str = None
+    reextract_files: list = None
+    manifest_json: str = "./pdf_manifest.json"
+    dedup: str = "exact"
+    dedup_near_threshold: float = 0.8
+    dedup_signatures_json: str = "./pdf_signatures.json"
+    model: str = MODEL_NAME
+    temperature: float = TEMPERATURE
+    max_workers: int = 4
+    requests_per_minute: int = 150
+    tokens_per_minute: int = 2000000
+    max_retries: int = 5
+    requeue_rounds: int = 1
+    upload_registry_json: str = "./uploaded_files.json"
+    delete_uploads_at_end: bool = False
+    response_cache_dir: str = "./response_cache"
+    response_cache_max_mb: int = 500
+    use_response_cache: bool = True
+    context_csvs: dict = field(default_factory=dict)
+    columnar_formats: tuple = ("arrow", "parquet")
+    input_mode: str = "pdf"
+    pdf_text_cache_dir: str = "./pdf_text_cache"
+    select_pages: bool = False
+    page_subset_dir: str = "./pdf_subsets"
+    use_context_cache: bool = False
+    context_cache_ttl_minutes: int = 60
+    context_cache_registry_json: str = "./context_caches.json"
+    delete_context_caches_at_end: bool = False
+    stream: bool = False
+    stream_retries: int = 2
+    reask_rounds: int = 1
+    cascade_model: str = ""
+    cascade_check: bool = False
+    cascade_max_field_share: float = 0.5
+    consensus_replicates: int = 0
+    consensus_min_replicates: int = 2
+    consensus_agreement: float = 1.0
+    metrics_jsonl: str = "./metrics/calls.jsonl"
+    round_name: str = ""
+
+    def resolved_api_key(self):
+        return self.api_key or os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
+
+    def with_overrides(self, **overrides):
+        """
+        Copy of this config with the given fields replaced; None values
+        are ignored, so unset CLI flags keep the defaults.
+        """
+        return replace(self, **{k: v for k, v in overrides.items() if v is not None})
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import math
+from collections import Counter
+
+from llmreview.concurrency import run_ordered
+from llmreview.fake_responses import schema_dict
+
+
+def voted_fields(schema):
+    """
+    {field: categories or None} for the fields a consensus votes on:
+    single-choice enums (None) and multi-select arrays of enum values
+    (their categories, in schema order).
+    """
+    out = {}
+    for name, prop in (schema_dict(schema).get("properties") or {}).items():
+        items = prop.get("items") or {}
+        if str(prop.get("type") or "").lower() == "array" and items.get("enum"):
+            out[name] = list(items["enum"])
+        elif prop.get("enum"):
+            out[name] = None
+    return out
+
+
+# ----------------------------------------------------------
+# majority vote over replicate answers
+# ----------------------------------------------------------
+class ReplicateVote:
+    """
+    Votes of the replicate answers of one paper. Each single-choice
+    field is one vote over its values; each category of a multi-select
+    field is a yes/no vote of its own. Blanked (None) answers do not
+    vote. agreement() is the modal share of a vote, decided(remaining)
+    whether its winner can no longer change with that many more answers.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.answers = []
+        self.counts = {}
+
+    def add(self, answer):
+        self.answers.append(answer)
+        for field, categories in self.fields.items():
+            value = answer.get(field)
+            if value is None:
+                continue
+            if categories is None:
+                self.counts.setdefault((field, None), Counter())[value] += 1
+            else:
+                chosen = set(value)
+                for category in categories:
+                    self.counts.setdefault((field, category), Counter())[category in chosen] += 1
+
+    def _ranked(self, key):
+        ranked = self.counts[key].most_common(2)
+        return ranked[0][1], (ranked[1][1] if len(ranked) > 1 else 0), sum(self.counts[key].values())
+
+    def agreement(self, key):
+        top, _, n = self._ranked(key)
+        return top / n
+
+    def decided(self, key, remaining):
+        top, second, _ = self._ranked(key)
+        return top - second > remaining
+
+    def leader_count(self, key):
+        return self._ranked(key)[0]
+
+    def unsettled(self, threshold):
+        """
+        Fields with a vote whose modal share is below threshold.
+        """
+        return list(dict.fromkeys(key[0] for key in self.counts if self.agreement(key) < threshold))
+
+    def min_agreement(self):
+        return min((self.agreement(key) for key in self.counts), default=1.0)
+
+    def settled(self, threshold, remaining):
+        return all(self.agreement(key) >= threshold or self.decided(key, remaining) for key in self.counts)
+
+    def consensus(self):
+        """
+        The voted answer: each single-choice field takes its most common
+        value (the earliest on a tie), each multi-select field the
+        categories most replicates chose (ties left out). The other
+        fields (text, details, years) come from the replicate agreeing
+        most with the vote.
+        """
+        voted = {}
+        for field, categories in self.fields.items():
+            if categories is None:
+                if (field, None) in self.counts:
+                    voted[field] = self.counts[(field, None)].most_common(1)[0][0]
+            elif any((field, c) in self.counts for c in categories):
+                voted[field] = [c for c in categories
+                                if self.counts[(field, c)][True] > self.counts[(field, c)][False]]
+
+        def score(answer):
+            hits = 0
+            for field, value in voted.items():
+                mine = answer.get(field)
+                if self.fields[field] is None:
+                    hits += mine == value
+                else:
+                    hits += mine is not None and set(mine) == set(value)
+            return hits
+
+        best = max(self.answers, key=score)
+        answer = dict(best)
+        answer.update(voted)
+        return answer
+
+
+# ----------------------------------------------------------
+# adaptive replicate runner
+# ----------------------------------------------------------
+def run_replicates(call, fields, max_replicates, min_replicates=2, threshold=1.0, source=""):
+    """
+    Run up to max_replicates calls of one paper (call(replicate_no) ->
+    answer dict or None) and vote. The first min_replicates go out
+    concurrently; while some vote is neither at threshold agreement nor
+    already decided, the next wave is as many replicates as the weakest
+    vote's leader still needs for a majority of max_replicates, also
+    concurrently. A paper on which the first replicates agree therefore
+    costs min_replicates calls, and the budget goes to ambiguous ones.
+    Returns (consensus answer or None, replicates called, vote).
+    """
+    vote = ReplicateVote(fields)
+    majority = math.floor(max_replicates / 2) + 1
+    issued = 0
+    wave = min(max(min_replicates, 1), max_replicates)
+    while wave > 0:
+        replicates = list(range(issued + 1, issued + wave + 1))
+        issued += wave
+        for _, answer in run_ordered(call, replicates, max_workers=wave):
+            if answer is not None:
+                vote.add(answer)
+        remaining = max_replicates - issued
+        if not remaining:
+            break
+        if len(vote.answers) < min_replicates:
+            # failed replicates do not count towards the minimum
+            wave = min(remaining, min_replicates - len(vote.answers))
+            continue
+        if vote.settled(threshold, remaining):
+            break
+        weakest = min((vote.leader_count(key) for key in vote.counts), default=0)
+        wave = min(remaining, max(1, majority - weakest))
+        print(f"Consensus for {source}: agreement {vote.min_agreement():.2f} after {issued} replicates,"
+              f" asking {wave} more")
+    if not vote.answers:
+        return None, issued, vote
+    return vote.consensus(), issued, vote
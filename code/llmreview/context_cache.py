@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from google.genai import types
+
+from llmreview.uploads import _now, _to_iso
+
+# do not reference a cache that expires within this window
+CACHE_EXPIRY_MARGIN = timedelta(minutes=2)
+
+
+def context_key(model, pdf_sha, key_parts):
+    """
+    Identity of a paper payload for one model: the PDF hash plus what
+    was selected from it (page subset or extracted text). Caches are
+    model-specific, so the model is part of the key.
+    """
+    payload = json.dumps({"model": model, "pdf": pdf_sha, "paper": list(key_parts)},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------
+# registry of explicit context caches
+# ----------------------------------------------------------
+class ContextCacheRegistry:
+    """
+    Explicit context caches (client.caches) holding one paper each,
+    registered as JSON on disk by context_key, so the AB/C/D/E calls and
+    later rounds reference the cached paper instead of resending it.
+    Each cache lives for ttl_minutes; expired entries are purged at
+    start-up, and delete_all() removes the remote caches at the end of
+    a batch, next to the upload cleanup. A paper the API refuses to
+    cache (e.g. below the model's minimum cached token count) is
+    remembered for the run and sent inline instead.
+    """
+
+    def __init__(self, path, ttl_minutes=60):
+        self.path = path
+        self.ttl = timedelta(minutes=ttl_minutes)
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._uncacheable = set()
+        self._entries = self._read()
+        self.created = 0
+        self.reused = 0
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read context cache registry {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        # merge with what other scripts may have written meanwhile
+        merged = self._read()
+        merged.update(self._entries)
+        for key in [k for k, v in merged.items() if v is None]:
+            merged.pop(key)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(merged, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._entries = merged
+
+    def _is_live(self, entry):
+        if not entry:
+            return False
+        expires = datetime.fromisoformat(entry["expire_time"])
+        return expires - CACHE_EXPIRY_MARGIN > _now()
+
+    def _lock_for(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get(self, client, model, key, make_part, source=""):
+        """
+        Return the name of a live cache holding the paper, creating it
+        from make_part() (the file or text part) if none is registered.
+        Returns None if the paper cannot be cached; send it inline then.
+        """
+        with self._lock_for(key):
+            with self._lock:
+                entry = self._entries.get(key)
+                if key in self._uncacheable:
+                    return None
+            if self._is_live(entry):
+                with self._lock:
+                    self.reused += 1
+                return entry["name"]
+
+            try:
+                cache = client.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        contents=[types.Content(role="user", parts=[make_part()])],
+                        ttl=f"{int(self.ttl.total_seconds())}s",
+                        display_name=source[:100],
+                    ),
+                )
+            except Exception as e:
+                print(f"Sending {source} inline, context cache not created: {str(e)[:200]}")
+                with self._lock:
+                    self._uncacheable.add(key)
+                return None
+            print(f"Created context cache for {source} ({cache.name})")
+
+            expires = getattr(cache, "expire_time", None) or (_now() + self.ttl)
+            entry = {
+                "name": cache.name,
+                "model": model,
+                "expire_time": _to_iso(expires),
+                "source": source,
+            }
+            with self._lock:
+                self._entries[key] = entry
+                self.created += 1
+                self._save()
+            return entry["name"]
+
+    def forget(self, key):
+        """
+        Drop one entry (e.g. the API reports the cache is gone) so the
+        next get() creates it again.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries[key] = None
+                self._save()
+
+    def purge_expired(self):
+        """
+        Drop registry entries whose cache has expired or is about to.
+        """
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if not self._is_live(entry)]
+            for key in stale:
+                self._entries[key] = None
+            if stale:
+                self._save()
+        return len(stale)
+
+    def delete_all(self, client):
+        """
+        Delete every registered cache on the API side and clear the
+        registry. Call this once at the end of a batch.
+        """
+        with self._lock:
+            entries = {key: e for key, e in self._entries.items() if e}
+        deleted = 0
+        for key, entry in entries.items():
+            try:
+                client.caches.delete(name=entry["name"])
+                deleted += 1
+            except Exception:
+                pass
+            with self._lock:
+                self._entries[key] = None
+        with self._lock:
+            self._save()
+        print(f"Deleted {deleted} context caches")
+        return deleted
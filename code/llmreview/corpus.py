@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import os
+
+# The 35 papers coded in the r35 reliability round, in run order.
+R35_PDF_FILES = [
+    'uebel2025.pdf',
+    'coisnon2024.pdf',
+    'bajwoluk2023.pdf',
+    'huzlik2020.pdf',
+    'hadavi2018.pdf',
+    'gatti2022.pdf',
+    'dandolo2022.pdf',
+    'ziemelniece2023.pdf',
+    'cheng2020.pdf',
+    'ward2023.pdf',
+    'roe2016.pdf',
+    'cengiz2012.pdf',
+    'southon2017.pdf',
+    'mceachan2018.pdf',
+    'battisti2020a.pdf',
+    'banda2014.pdf',
+    'chen2019b.pdf',
+    'fornal-pieniak2023.pdf',
+    'ghanem2024.pdf',
+    'putra2021b.pdf',
+    'stanley2022.pdf',
+    'baka2022.pdf',
+    'sander2017.pdf',
+    'feng2017a.pdf',
+    'yang2024b.pdf',
+    'vandillen2012.pdf',
+    'wu2025b.pdf',
+    'mccann2021.pdf',
+    'fors2015.pdf',
+    'mullenbach2022.pdf',
+    'song2020.pdf',
+    'irvine2013.pdf',
+    'arnberger2012.pdf',
+    'dobbinson2020.pdf',
+    'wood2018.pdf'
+]
+
+
+def list_pdf_files(pdf_dir):
+    """
+    Every PDF in pdf_dir (not recursive), sorted by name.
+    """
+    return sorted(f for f in os.listdir(pdf_dir) if f.lower().endswith(".pdf"))
+
+
+def work_set(config):
+    """
+    The papers a run works on: config.pdf_files if given, else the
+    result of config.pdf_query against the corpus manifest of pdf_dir
+    (refreshed first), else the r35 list.
+    """
+    if config.pdf_files:
+        return list(config.pdf_files)
+    if config.pdf_query:
+        from llmreview.manifest import load_manifest
+
+        try:
+            files = load_manifest(config).select(config.pdf_query)
+        except KeyError as e:
+            raise SystemExit(f"--select {config.pdf_query}: {e.args[0]}")
+        print(f"Query {config.pdf_query!r} selected {len(files)} PDFs")
+        return files
+    return list(R35_PDF_FILES)
+
+
+def files_to_replace(config, files):
+    """
+    The papers of files whose existing output rows are dropped so they
+    are extracted again: config.reextract_files if given, else for a
+    changed:ROUND or pending:ROUND query the PDFs whose content changed
+    since ROUND was recorded in the corpus manifest. Without this, a
+    paper already in a section's CSV is always skipped.
+    """
+    if config.reextract_files is not None:
+        replace = set(config.reextract_files)
+    else:
+        kind, _, round_name = (config.pdf_query or "").partition(":")
+        if kind not in ("changed", "pending"):
+            return set()
+        from llmreview.manifest import CorpusManifest
+
+        try:
+            replace = set(CorpusManifest(config.manifest_json, config.pdf_dir).select(f"changed:{round_name}"))
+        except KeyError as e:
+            raise SystemExit(f"--select {config.pdf_query}: {e.args[0]}")
+    return replace & set(files)
+
+
+def drop_replaced(rows, replace):
+    """
+    Loaded rows without those of the papers in replace.
+    """
+    if not replace:
+        return rows
+    kept = [r for r in rows if str(r.get("File_Name")) not in replace]
+    if len(kept) < len(rows):
+        print(f"Re-extracting {len(replace)} PDFs whose content changed; dropped {len(rows) - len(kept)} old rows")
+    return kept
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from llmreview.concurrency import run_ordered
+from llmreview.hashing import file_sha256
+from llmreview.pdftext import PdfTextCache
+from llmreview.quotes import normalize_words, shingles
+
+# MinHash layout: NUM_PERM hash functions split into LSH bands of
+# BAND_ROWS rows; two papers become candidates if any band matches
+NUM_PERM = 128
+BAND_ROWS = 4
+SHINGLE_WORDS = 5
+# one random seed per hash function, mixed into the shingle hashes
+_SEEDS = np.random.default_rng(20240501).integers(0, 1 << 63, NUM_PERM, dtype=np.uint64)
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+
+
+# ----------------------------------------------------------
+# MinHash signatures of the papers' text
+# ----------------------------------------------------------
+def minhash(pages):
+    """
+    MinHash signature (NUM_PERM uint64 values) of the set of 5-word
+    shingles of a paper's normalized text, or None if it has no text
+    layer. Shingles are hashed with blake2b so signatures are stable
+    across processes and can be cached.
+    """
+    words = normalize_words("\n".join(pages))
+    grams = {" ".join(g) for g in shingles(words, SHINGLE_WORDS)}
+    if not grams:
+        return None
+    x = np.fromiter((int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "little")
+                     for g in grams), dtype=np.uint64, count=len(grams))
+    # splitmix64 finalizer of (shingle hash ^ seed): one independent
+    # hash per seed; uint64 products wrap, which the mixing relies on
+    z = x[None, :] ^ _SEEDS[:, None]
+    z = (z ^ (z >> np.uint64(30))) * _M1
+    z = (z ^ (z >> np.uint64(27))) * _M2
+    return (z ^ (z >> np.uint64(31))).min(axis=1)
+
+
+def similarity(sig_a, sig_b):
+    """
+    Estimated Jaccard similarity of two papers' shingle sets.
+    """
+    return float(np.mean(sig_a == sig_b))
+
+
+class SignatureCache:
+    """
+    MinHash signatures keyed by PDF SHA-256, stored as JSON, so each
+    paper's text is shingled once across runs.
+    """
+
+    def __init__(self, path, text_cache_dir):
+        self.path = path
+        self.texts = PdfTextCache(text_cache_dir)
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Could not read signature cache {path}: {e}")
+
+    def get(self, pdf_path, sha):
+        entry = self._entries.get(sha, False)
+        if entry is False:
+            try:
+                sig = minhash(self.texts.pages(pdf_path, sha))
+            except Exception as e:
+                print(f"Text extraction failed for {os.path.basename(pdf_path)}: {e}")
+                sig = None
+            entry = None if sig is None else [int(v) for v in sig]
+            with self._lock:
+                self._entries[sha] = entry
+        return None if entry is None else np.array(entry, dtype=np.uint64)
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+
+
+# ----------------------------------------------------------
+# duplicate groups of a work set
+# ----------------------------------------------------------
+def content_hashes(config, files, max_workers=4):
+    """
+    {file name: SHA-256} for the files of the work set that exist, from
+    the corpus manifest when there is one (refreshed, so only changed
+    files are hashed), else by hashing them.
+    """
+    if os.path.exists(config.manifest_json):
+        from llmreview.manifest import load_manifest
+
+        manifest = load_manifest(config)
+        return {f: manifest.files[f]["sha256"] for f in files
+                if f in manifest.files and manifest.files[f].get("present")}
+
+    def hash_one(fname):
+        path = os.path.join(config.pdf_dir, fname)
+        return file_sha256(path) if os.path.exists(path) else None
+
+    return {f: sha for f, sha in run_ordered(hash_one, files, max_workers) if sha is not None}
+
+
+def find_duplicates(config, files, near=False, threshold=0.8):
+    """
+    Group the files of a work set that hold the same paper: identical
+    bytes (same SHA-256) and, with near=True, near-identical text (e.g.
+    a preprint and the published version), found by MinHash LSH over
+    5-word shingles and kept when the estimated Jaccard similarity is at
+    least threshold. The first file of a group in list order is its
+    canonical copy. Returns {alias: (canonical, kind)} with kind "exact"
+    or "near 0.87".
+    """
+    hashes = content_hashes(config, files, config.max_workers)
+    names = [f for f in files if f in hashes]
+    parent = {f: f for f in names}
+
+    def find(f):
+        while parent[f] != f:
+            parent[f] = parent[parent[f]]
+            f = parent[f]
+        return f
+
+    def union(a, b):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            # the root is the earlier file in list order
+            first, second = sorted((ra, rb), key=position.get)
+            parent[second] = first
+
+    position = {f: i for i, f in enumerate(names)}
+    by_sha = {}
+    for f in names:
+        if hashes[f] in by_sha:
+            union(by_sha[hashes[f]], f)
+        else:
+            by_sha[hashes[f]] = f
+
+    signatures = {}
+    if near:
+        cache = SignatureCache(config.dedup_signatures_json, config.pdf_text_cache_dir)
+        unique = list(by_sha.values())
+
+        def sign(fname):
+            return cache.get(os.path.join(config.pdf_dir, fname), hashes[fname])
+
+        for fname, sig in run_ordered(sign, unique, config.max_workers):
+            if sig is not None:
+                signatures[fname] = sig
+        cache.save()
+        buckets = {}
+        for fname, sig in signatures.items():
+            for band in range(0, NUM_PERM, BAND_ROWS):
+                buckets.setdefault((band, sig[band:band + BAND_ROWS].tobytes()), []).append(fname)
+        checked = set()
+        for group in buckets.values():
+            for i, a in enumerate(group):
+                for b in group[i + 1:]:
+                    if (a, b) in checked:
+                        continue
+                    checked.add((a, b))
+                    if similarity(signatures[a], signatures[b]) >= threshold:
+                        union(a, b)
+
+    aliases = {}
+    for f in names:
+        root = find(f)
+        if root == f:
+            continue
+        if hashes[f] == hashes[root]:
+            aliases[f] = (root, "exact")
+        else:
+            sig_f, sig_root = signatures.get(by_sha[hashes[f]]), signatures.get(by_sha[hashes[root]])
+            score = similarity(sig_f, sig_root) if sig_f is not None and sig_root is not None else float("nan")
+            aliases[f] = (root, f"near {score:.2f}")
+    return aliases
+
+
+def dedup_work_set(config, files):
+    """
+    Apply config.dedup ("off", "exact" or "near") to a work set: return
+    the files to extract (canonical copies, list order kept) and
+    {alias: (canonical, kind)} for the rest.
+    """
+    mode = config.dedup or "off"
+    if mode == "off":
+        return list(files), {}
+    aliases = find_duplicates(config, files, near=mode == "near", threshold=config.dedup_near_threshold)
+    for alias, (canonical, kind) in aliases.items():
+        print(f"Duplicate ({kind}): {alias} -> {canonical}")
+    if aliases:
+        print(f"{len(aliases)} duplicate PDFs will reuse their canonical copy's extraction")
+    return [f for f in files if f not in aliases], aliases
+
+
+def _duplicate_of(row):
+    value = row.get("DUPLICATE_OF")
+    return value if isinstance(value, str) and value else None
+
+
+def drop_stale_aliases(rows, aliases):
+    """
+    Loaded rows without the alias rows that no longer hold (dedup turned
+    off, or the file's content changed), so those files are extracted
+    in their own right.
+    """
+    return [r for r in rows if _duplicate_of(r) is None
+            or aliases.get(str(r.get("File_Name")), (None,))[0] == _duplicate_of(r)]
+
+
+def with_aliases(rows, aliases):
+    """
+    Output rows with one row per alias: a copy of its canonical copy's
+    row under the alias's File_Name, marked with DUPLICATE_OF and
+    DUPLICATE_KIND. Alias rows already present (from an earlier run)
+    are rebuilt, so they follow the canonical row.
+    """
+    if not aliases:
+        return rows
+    rows = [r for r in rows if str(r.get("File_Name")) not in aliases]
+    by_name = {str(r.get("File_Name")): r for r in rows}
+    for alias, (canonical, kind) in aliases.items():
+        if canonical in by_name:
+            rows.append({**by_name[canonical], "File_Name": alias,
+                         "DUPLICATE_OF": canonical, "DUPLICATE_KIND": kind})
+    return rows
+
+
+def canonical_rows(df):
+    """
+    A section DataFrame without the alias rows (so duplicates are not
+    counted twice in prevalence or agreement statistics).
+    """
+    if "DUPLICATE_OF" not in df:
+        return df
+    return df[[_duplicate_of(row) is None for row in df[["DUPLICATE_OF"]].to_dict("records")]]
@@ -0,0 +1,685 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from google import genai
+from google.genai import types
+
+from llmreview.cascade import consistency_problems, disagreements, escalate
+from llmreview.checkpoint import CheckpointJournal
+from llmreview.columnar import fresh_columnar_path, read_section
+from llmreview.concurrency import run_with_requeue
+from llmreview.corpus import drop_replaced, files_to_replace, work_set
+from llmreview.dedup import dedup_work_set, drop_stale_aliases, with_aliases
+from llmreview.consensus import run_replicates, voted_fields
+from llmreview.context_cache import ContextCacheRegistry, context_key
+from llmreview.gemini import UsageTally, format_usage, generate_json, pdf_part
+from llmreview.hashing import file_sha256
+from llmreview.metrics import CallRecord, MetricsLog
+from llmreview.pageselect import page_ranges, select_pages, write_page_subset
+from llmreview.pdftext import PdfTextCache
+from llmreview.ratelimit import RateLimitedClient, error_code
+from llmreview.response_cache import ResponseCache, request_key
+from llmreview.specs import get_spec
+from llmreview.streaming import OffSchemaError, generate_json_stream
+from llmreview.uploads import UploadRegistry
+from llmreview.validation import REASK_UNREADABLE, CompiledSchema, compile_schema, reask_note, sub_schema
+
+
+# what is sent for one paper: text payload (text mode), selected pages
+# (None = full paper) and the extra parts of the response-cache key
+PaperInput = namedtuple("PaperInput", ["text", "pages", "key_parts"])
+
+
+# ----------------------------------------------------------
+# shared services for a run
+# ----------------------------------------------------------
+class Runtime:
+    """
+    The client and the shared stores used by every call of a run: the
+    rate-limited Gemini client, the upload registry, the response cache,
+    the extracted-text cache, the context-cache registry (if enabled)
+    and the run's token tally. Pass client= to run against a fake
+    instead of the API.
+    """
+
+    def __init__(self, config, client=None):
+        self.config = config
+        if client is None:
+            client = genai.Client(api_key=config.resolved_api_key())
+        self.client = RateLimitedClient(
+            client,
+            requests_per_minute=config.requests_per_minute,
+            tokens_per_minute=config.tokens_per_minute,
+            max_retries=config.max_retries,
+        )
+        self.uploads = UploadRegistry(config.upload_registry_json)
+        self.uploads.purge_expired()
+        self.responses = ResponseCache(
+            config.response_cache_dir,
+            max_bytes=config.response_cache_max_mb * 1024 * 1024,
+            enabled=config.use_response_cache,
+        )
+        self.texts = PdfTextCache(config.pdf_text_cache_dir)
+        self.context_caches = None
+        if config.use_context_cache:
+            self.context_caches = ContextCacheRegistry(
+                config.context_cache_registry_json, ttl_minutes=config.context_cache_ttl_minutes)
+            self.context_caches.purge_expired()
+        self.usage = UsageTally()
+        self.metrics = MetricsLog(config.metrics_jsonl, round=config.round_name,
+                                  model=config.model, input_mode=config.input_mode)
+
+    def selected_pages(self, spec, pdf_path, sha=None):
+        """
+        Pages the spec may be coded from (e.g. Methods to Results for D
+        and E), or None to send the full paper: when page selection is
+        off, the spec has no page scope, or detection finds no range.
+        """
+        if not self.config.select_pages or spec is None or not spec.page_scope:
+            return None
+        try:
+            pages = self.texts.pages(pdf_path, sha)
+            selected = select_pages(pages, spec.page_scope)
+        except Exception as e:
+            print(f"Page detection failed for {pdf_path}, sending the full paper: {e}")
+            return None
+        name = os.path.basename(pdf_path)
+        if selected is None:
+            print(f"No {spec.page_scope} pages found in {name}, sending the full paper")
+        else:
+            print(f"Section {spec.name}: sending pages {page_ranges(selected)} of {len(pages)} for {name}")
+        return selected
+
+    def paper_text(self, pdf_path, sha=None, pages=None):
+        """
+        In text mode, the paper's extracted text payload (only the given
+        pages, if any); None in pdf mode or when the PDF has no usable
+        text layer (then the file is sent).
+        """
+        if self.config.input_mode != "text":
+            return None
+        try:
+            return self.texts.text(pdf_path, sha, pages)
+        except Exception as e:
+            print(f"Text extraction failed for {pdf_path}, sending the PDF: {e}")
+            return None
+
+    def paper_input(self, pdf_path, sha, spec=None):
+        """
+        Decide what to send for a paper and return a PaperInput. Its
+        key_parts go into the response-cache key, so the full paper, a
+        page subset and the text payload never share an answer.
+        """
+        pages = self.selected_pages(spec, pdf_path, sha)
+        text = self.paper_text(pdf_path, sha, pages)
+        key_parts = []
+        if text is not None:
+            key_parts.append(text)
+        elif pages is not None:
+            key_parts.append(f"[pages {page_ranges(pages)}]")
+        if self.context_caches is not None:
+            # the cached paper comes before the prompt, not after it
+            key_parts.append("[context cache]")
+        return PaperInput(text, pages, key_parts)
+
+    def paper_part(self, pdf_path, sha, paper):
+        """
+        The part carrying the paper: its text payload if any, otherwise
+        the uploaded PDF (or page subset), uploading it if needed.
+        """
+        if paper.text is not None:
+            return types.Part(text=paper.text)
+        if paper.pages is not None:
+            subset_path = write_page_subset(pdf_path, paper.pages, self.config.page_subset_dir, sha)
+            return pdf_part(self.uploads.get(self.client, subset_path))
+        return pdf_part(self.uploads.get(self.client, pdf_path, sha=sha))
+
+    def forget_upload(self, pdf_path, sha, paper):
+        """
+        Drop the registered upload paper_part() used for this paper (the
+        page subset's or the full PDF's), so the next call uploads it
+        again. Returns False for text input, which has no upload.
+        """
+        if paper.text is not None:
+            return False
+        if paper.pages is not None:
+            sha = file_sha256(write_page_subset(pdf_path, paper.pages, self.config.page_subset_dir, sha))
+        self.uploads.forget(sha)
+        return True
+
+    def generate(self, text_parts, pdf_path, sha, paper, schema, record=None, model=None):
+        """
+        Call the model (config.model unless given) with text_parts and
+        the paper. With context caching on, the paper is referenced
+        through its cached-content object (created on first use) and
+        only the text parts are sent; otherwise, or if the paper cannot
+        be cached, it is sent inline after the text parts. Logs and tallies the token split, fills in
+        record (phase timings, tokens, retries) and returns the raw
+        response.
+        """
+        config = self.config
+        model = model or config.model
+        name = os.path.basename(pdf_path)
+        record = record or CallRecord("", name)
+        parts = [types.Part(text=t) for t in text_parts]
+
+        def make_part():
+            with record.phase("upload"):
+                return self.paper_part(pdf_path, sha, paper)
+
+        cache_name = None
+        if self.context_caches is not None:
+            key = context_key(model, sha, paper.key_parts)
+            with record.phase("context_cache"):
+                cache_name = self.context_caches.get(
+                    self.client, model, key, make_part=make_part, source=name)
+        response = None
+        if cache_name is not None:
+            try:
+                with record.phase("generate"):
+                    response = self.call_model(parts, schema, name, record, cached_content=cache_name,
+                                               model=model)
+            except Exception as e:
+                if error_code(e) not in (403, 404):
+                    raise
+                print(f"Context cache {cache_name} is gone, sending {name} inline")
+                self.context_caches.forget(key)
+        if response is None:
+            paper_part = make_part()
+            try:
+                try:
+                    with record.phase("generate"):
+                        response = self.call_model(parts + [paper_part], schema, name, record, model=model)
+                except Exception as e:
+                    # the registered remote file was deleted or expired early
+                    if error_code(e) not in (403, 404) or not self.forget_upload(pdf_path, sha, paper):
+                        raise
+                    print(f"Uploaded copy of {name} is gone, uploading it again")
+                    paper_part = make_part()
+                    with record.phase("generate"):
+                        response = self.call_model(parts + [paper_part], schema, name, record, model=model)
+            finally:
+                record.set(retries=self.client.last_retries)
+        else:
+            record.set(retries=self.client.last_retries)
+
+        counts = self.usage.add(response)
+        record.set(tokens=counts, context_cache=cache_name is not None)
+        print(f"Tokens for {name}: {format_usage(counts)}")
+        return response
+
+    def call_model(self, parts, schema, name, record, cached_content=None, model=None):
+        """
+        One generate call. With config.stream the answer is streamed and
+        checked field by field; output that leaves the schema is aborted
+        at once and re-asked up to config.stream_retries times, and the
+        time to the first valid field goes into record.
+        """
+        config = self.config
+        model = model or config.model
+        if not config.stream:
+            return generate_json(self.client, parts, schema, model=model,
+                                 temperature=config.temperature, cached_content=cached_content)
+        aborts = 0
+        while True:
+            try:
+                response = generate_json_stream(self.client, parts, schema, model=model,
+                                                temperature=config.temperature,
+                                                cached_content=cached_content)
+            except OffSchemaError as e:
+                aborts += 1
+                record.set(stream_aborts=aborts)
+                print(f"Aborted stream for {name} ({aborts}/{config.stream_retries + 1}): {e}")
+                if aborts > config.stream_retries:
+                    raise
+                continue
+            record.set(stream_aborts=aborts, first_field_seconds=response.first_field_seconds)
+            if response.first_field_seconds is not None:
+                print(f"First field for {name} after {response.first_field_seconds:.1f} sec"
+                      f" of {response.total_seconds:.1f} sec")
+            return response
+
+    def summary_lines(self):
+        """
+        Cache and token lines for the end-of-run summary.
+        """
+        lines = [f"Response cache hits    {self.responses.hits}"]
+        if self.context_caches is not None:
+            lines.append(f"Context caches         {self.context_caches.created} created,"
+                         f" {self.context_caches.reused} reused")
+        return lines + self.usage.summary_lines()
+
+    def close(self):
+        """
+        End of batch: delete remote uploads and context caches if the
+        config asks for it.
+        """
+        if self.config.delete_uploads_at_end:
+            self.uploads.delete_all(self.client)
+        if self.context_caches is not None and self.config.delete_context_caches_at_end:
+            self.context_caches.delete_all(self.client)
+
+
+# ----------------------------------------------------------
+# dependency context
+# ----------------------------------------------------------
+def load_context_index(spec, config):
+    """
+    For a section that depends on another one (E on C), read the
+    dependency CSV once and return {File_Name: context text}.
+    Returns None for independent sections.
+    """
+    if not spec.depends_on:
+        return None
+    dep = spec.depends_on[0]
+    path = config.context_csvs.get(dep) or spec.context_csv
+    df_dep = read_section(path)
+    print(f"Loaded {len(df_dep)} Section {dep} rows from {fresh_columnar_path(path) or path}")
+    return spec.build_context_index(df_dep)
+
+
+# ----------------------------------------------------------
+# helper 1. run model on a single pdf and return dict
+# ----------------------------------------------------------
+def process_single_pdf(runtime, spec, pdf_path, context_text=None, replicate=None):
+    """
+    Serve the answer from the response cache if the same request was
+    made before; otherwise call the model with the section's prompt,
+    context and schema plus the paper: its remote copy from the upload
+    registry, its extracted text in text mode, or a reference to its
+    context cache (see Runtime.generate). Parse the JSON response and
+    return (result_dict, elapsed_seconds). replicate numbers a consensus
+    replicate; from the second one on it goes into the cache key, so
+    each replicate is a call of its own (and is cached on its own).
+    With config.cascade_model the paper goes to that faster model first
+    and only what fails its checks goes on to config.model (see
+    cascade_answer); the row then records what was escalated.
+    """
+    config = runtime.config
+    file_basename = os.path.basename(pdf_path)
+    record = runtime.metrics.start(spec.name, file_basename)
+    if replicate is not None:
+        record.set(replicate=replicate)
+    if not os.path.exists(pdf_path):
+        print(f"Skipping, file not found: {pdf_path}")
+        runtime.metrics.finish(record, "file_missing")
+        return None, None
+
+    start_time = time.time()
+    text_parts = spec.text_parts(context_text)
+
+    # serve byte-identical requests from the local cache; the paper input
+    # (full PDF, page subset or extracted text) is part of the key
+    with record.phase("hash"):
+        pdf_sha = file_sha256(pdf_path)
+    with record.phase("prepare"):
+        paper = runtime.paper_input(pdf_path, pdf_sha, spec)
+    record.set(pages=page_ranges(paper.pages) if paper.pages else None)
+    key_parts = paper.key_parts + ([f"[replicate {replicate}]"] if replicate and replicate > 1 else [])
+    cascade = bool(config.cascade_model)
+    model = config.cascade_model or config.model
+    if cascade:
+        record.set(model=model)
+        key_parts = key_parts + [f"[cascade to {config.model}]"]
+    cache_key = request_key(pdf_sha, text_parts + key_parts, spec.schema, model, config.temperature)
+
+    def extra_call(schema, parts, call_model, role):
+        # cascade checks and escalations are logged as calls of their own
+        extra = runtime.metrics.start(spec.name, file_basename)
+        extra.set(model=call_model, cascade=role)
+        try:
+            text = runtime.generate(parts, pdf_path, pdf_sha, paper, schema, extra, model=call_model).text
+        except Exception as e:
+            runtime.metrics.finish(extra, "model_error", e)
+            raise
+        runtime.metrics.finish(extra, "ok")
+        return text
+
+    def escalation_call(schema, note):
+        return extra_call(schema, text_parts + ([note] if note else []), config.model, "escalation")
+
+    raw_text = runtime.responses.get(cache_key)
+    from_cache = raw_text is not None
+    escalation = None
+    if from_cache:
+        print(f"Cache hit for {file_basename}")
+    elif cascade:
+        check_pool = ThreadPoolExecutor(max_workers=1) if config.cascade_check else None
+        check_future = None
+        if check_pool is not None:
+            # the second fast answer runs alongside the first
+            check_future = check_pool.submit(extra_call, spec.schema, text_parts, model, "check")
+            check_pool.shutdown(wait=False)
+        try:
+            raw_text = runtime.generate(text_parts, pdf_path, pdf_sha, paper, spec.schema, record,
+                                        model=model).text
+        except Exception as e:
+            print(f"Fast model call failed for {pdf_path}, escalating: {e}")
+            raw_text = None
+        check_text = None
+        if check_future is not None:
+            try:
+                check_text = check_future.result()
+            except Exception as e:
+                print(f"Fast model check call failed for {pdf_path}: {e}")
+        try:
+            raw_text, escalation = cascade_answer(spec, raw_text, check_text, escalation_call,
+                                                  record, config.cascade_max_field_share, file_basename)
+        except Exception as e:
+            print(f"Escalation failed for {pdf_path}: {e}")
+            runtime.metrics.finish(record, "model_error", e)
+            elapsed = time.time() - start_time
+            return None, elapsed
+    else:
+        try:
+            response = runtime.generate(text_parts, pdf_path, pdf_sha, paper, spec.schema, record)
+            raw_text = response.text
+        except OffSchemaError as e:
+            print(f"Streamed answer left the schema for {pdf_path}: {e}")
+            runtime.metrics.finish(record, "parse_error", e)
+            elapsed = time.time() - start_time
+            return None, elapsed
+        except Exception as e:
+            print(f"Model call failed for {pdf_path}: {e}")
+            runtime.metrics.finish(record, "model_error", e)
+            elapsed = time.time() - start_time
+            return None, elapsed
+
+    def reask(schema, note):
+        if cascade:
+            return escalation_call(schema, note)
+        return runtime.generate(text_parts + [note], pdf_path, pdf_sha, paper, schema, record).text
+
+    parsed, invalid = settle_answer(runtime, spec.schema, raw_text, record, reask, file_basename)
+    if parsed is None:
+        print(f"JSON parse failed for {pdf_path}")
+        runtime.metrics.finish(record, "parse_error")
+        elapsed = time.time() - start_time
+        return None, elapsed
+
+    if invalid:
+        runtime.metrics.finish(record, "invalid_fields", "; ".join(invalid))
+    else:
+        if not from_cache:
+            runtime.responses.put(cache_key, json.dumps(parsed, ensure_ascii=False), source=file_basename)
+        runtime.metrics.finish(record, "cache_hit" if from_cache else "ok")
+    if invalid:
+        parsed["INVALID_FIELDS"] = "; ".join(invalid)
+    if escalation is not None:
+        parsed["ESCALATED"] = escalation
+
+    parsed = {
+        "File_Name": file_basename,
+        **parsed
+    }
+
+    elapsed = time.time() - start_time
+    return parsed, elapsed
+
+
+def cascade_answer(spec, raw_text, check_text, ask, record, max_field_share=0.5, source=""):
+    """
+    Check a fast-model answer and escalate what fails to the main model
+    through ask(schema, note). An answer fails on fields that are
+    off-schema after repair, break a consistency rule of the section
+    (cascade.consistency_problems) or, when a second fast answer
+    (check_text) was asked for, differ between the two. Returns the
+    answer as JSON text (None if there is none) and what was escalated:
+    "" (nothing), "paper" or the escalated field names.
+    """
+    compiled = compile_schema(spec.schema)
+    with record.phase("parse"):
+        answer, problems, _ = compiled.check_text(raw_text)
+        if answer is not None:
+            problems.update(consistency_problems(spec.name, spec.schema, answer))
+            check = compiled.check_text(check_text)[0] if check_text else None
+            if check is not None:
+                for name, problem in disagreements(spec.schema, answer, check).items():
+                    problems.setdefault(name, problem)
+    with record.phase("escalate"):
+        answer, level, names = escalate(ask, spec.schema, answer, problems, max_field_share, source)
+    record.set(cascade=level or "fast", escalated_fields=len(names) if level == "fields" else None)
+    escalation = "; ".join(names) if level == "fields" else level
+    if answer is None:
+        return None, escalation
+    return json.dumps(answer, ensure_ascii=False), escalation
+
+
+def process_paper(runtime, spec, pdf_path, context_text=None):
+    """
+    Code one paper: a single process_single_pdf call, or with
+    config.consensus_replicates > 1 an adaptive run of replicate calls
+    whose enum and multi-select fields are majority-voted (see
+    consensus.run_replicates). The consensus row also records the
+    replicates called (CONSENSUS_REPLICATES), the lowest modal share of
+    any vote (CONSENSUS_AGREEMENT) and the fields below the agreement
+    threshold (CONSENSUS_UNSETTLED). Returns (result_dict, elapsed).
+    """
+    config = runtime.config
+    if (config.consensus_replicates or 1) <= 1:
+        return process_single_pdf(runtime, spec, pdf_path, context_text)
+
+    start_time = time.time()
+    file_basename = os.path.basename(pdf_path)
+
+    def call(replicate):
+        return process_single_pdf(runtime, spec, pdf_path, context_text, replicate=replicate)[0]
+
+    answer, issued, vote = run_replicates(
+        call, voted_fields(spec.schema), config.consensus_replicates,
+        min_replicates=config.consensus_min_replicates, threshold=config.consensus_agreement,
+        source=file_basename)
+    elapsed = time.time() - start_time
+    if answer is None:
+        return None, elapsed
+    invalid = [path for path in str(answer.pop("INVALID_FIELDS", "") or "").split("; ")
+               if path and answer.get(path.split(".")[0]) is None]
+    if invalid:
+        answer["INVALID_FIELDS"] = "; ".join(invalid)
+    unsettled = vote.unsettled(config.consensus_agreement)
+    answer.update({
+        "CONSENSUS_REPLICATES": issued,
+        "CONSENSUS_AGREEMENT": round(vote.min_agreement(), 3),
+        "CONSENSUS_UNSETTLED": "; ".join(unsettled),
+    })
+    print(f"Consensus for {file_basename} from {len(vote.answers)} of {issued} replicates,"
+          f" lowest agreement {vote.min_agreement():.2f}"
+          + (f", unsettled: {', '.join(unsettled)}" if unsettled else ""))
+    return answer, elapsed
+
+
+def settle_answer(runtime, schema, raw_text, record, reask=None, source=""):
+    """
+    Parse, repair and check an answer against the compiled schema. Fields
+    still failing go back to the model in a targeted re-ask
+    (reask(schema, note) -> raw text): only those fields, under a
+    sub-schema, with their problems spelled out; an unreadable answer is
+    re-asked whole. Up to config.reask_rounds rounds; fields that still
+    fail are set to None. Returns (answer or None, invalid field paths).
+    """
+    compiled = compile_schema(schema)
+    with record.phase("parse"):
+        answer, problems, repairs = compiled.check_text(raw_text)
+    reasks = 0
+    rounds = runtime.config.reask_rounds if reask is not None else 0
+    while (answer is None or problems) and reasks < rounds:
+        reasks += 1
+        try:
+            if answer is None:
+                print(f"Re-asking {source} for a readable answer")
+                new_text = reask(schema, REASK_UNREADABLE)
+                with record.phase("parse"):
+                    answer, problems, fixed = compiled.check_text(new_text)
+            else:
+                names = list(problems)
+                print(f"Re-asking {source} for {len(names)} off-schema fields: {', '.join(names)}")
+                partial_schema = sub_schema(schema, names)
+                new_text = reask(partial_schema, reask_note(problems, {n: answer.get(n) for n in names}))
+                with record.phase("parse"):
+                    part, _, fixed = CompiledSchema(partial_schema).check_text(new_text)
+                    for name in names:
+                        if part and name in part and compiled.field_problem(name, part[name]) is None:
+                            answer[name] = part[name]
+                    problems = compiled.problems(answer)
+            repairs += fixed
+        except Exception as e:
+            print(f"Re-ask failed for {source}: {e}")
+            break
+    record.set(repairs=repairs, reasks=reasks)
+    if answer is None:
+        return None, []
+    invalid = compiled.blank_invalid(answer)
+    if invalid:
+        print(f"Off-schema fields left blank for {source}: {', '.join(invalid)}")
+    return answer, invalid
+
+
+# ----------------------------------------------------------
+# helper 2. loop over a folder of pdfs
+# ----------------------------------------------------------
+def process_folder(runtime, spec, output_csv, context_index=None):
+    """
+    Run one section over the configured PDF list: skip files already in
+    the output CSV (or its checkpoint journal), run up to max_workers
+    files at once, re-queue failures, time each file, append a
+    checkpoint after each file in list order, and write the CSV once at
+    the end. Return the final DataFrame.
+    """
+    config = runtime.config
+    per_file_times = {}
+
+    all_files = work_set(config)
+    pdf_files, aliases = dedup_work_set(config, all_files)
+
+    # Load existing CSV and checkpoint journal if present
+    checkpoint = CheckpointJournal(output_csv, spec.schema, config.columnar_formats)
+    rows = drop_replaced(drop_stale_aliases(checkpoint.load(), aliases), files_to_replace(config, all_files))
+    processed_files = set(str(r.get("File_Name")) for r in rows)
+
+    total_files = len(pdf_files)
+    print(f"\nSection {spec.name}: {total_files} PDF files specified for processing")
+
+    # Skip PDFs that are already in the CSV
+    pending = []
+    for idx, fname in enumerate(pdf_files, start=1):
+        if fname in processed_files:
+            print(f"[{idx}/{total_files}] Skipping {fname} because it already exists in the CSV")
+            continue
+        pending.append((idx, fname))
+
+    def run_one(job):
+        idx, fname = job
+        fpath = os.path.join(config.pdf_dir, fname)
+        print(f"\n[{idx}/{total_files}] Processing {fname} ...")
+        context_text = context_index.get(fname) if context_index is not None else None
+        return process_paper(runtime, spec, fpath, context_text)
+
+    print(f"Running {len(pending)} PDF files with up to {config.max_workers} in flight")
+    batch_start = time.time()
+
+    # Iterate through the PDFs; results come back in list order
+    for (idx, fname), (result_dict, elapsed) in run_with_requeue(
+            run_one, pending, config.max_workers,
+            failed=lambda result: result[0] is None,
+            requeue_rounds=config.requeue_rounds):
+        if result_dict is not None:
+            rows.append(result_dict)
+            print(f"Finished {fname} in {elapsed:.2f} seconds")
+        else:
+            rows.append({
+                "File_Name": fname,
+                "ERROR": "failed_to_extract"
+            })
+            # even if extraction failed we still record the timing if we have it
+            if elapsed is not None:
+                print(f"Failed {fname} in {elapsed:.2f} seconds")
+            else:
+                print(f"Failed {fname} with no timing captured")
+        per_file_times[fname] = elapsed
+
+        # Append checkpoint after each file
+        checkpoint.append(rows[-1])
+        print(f"Checkpoint saved  current row count {len(rows)}")
+
+    # Final save: compact the journal into the CSV once, in list order
+    # (requeued papers may have finished after later ones)
+    # duplicates take a copy of their canonical paper's row
+    rows = with_aliases(rows, aliases)
+    order = {f: i for i, f in enumerate(all_files)}
+    rows.sort(key=lambda r: order.get(str(r.get("File_Name")), -1))
+    df_all = checkpoint.compact(rows)
+
+    print("\nProcessing summary")
+    print(f"Section                {spec.name} ({spec.title})")
+    print(f"Total files in folder  {total_files}")
+    print(f"Total rows written     {len(df_all)}")
+    print(f"Saved final output to  {output_csv}")
+    print(f"Total wall clock time  {time.time() - batch_start:.2f} sec")
+    for line in runtime.summary_lines():
+        print(line)
+    for line in cascade_summary_lines(config, df_all) + consensus_summary_lines(config, df_all):
+        print(line)
+
+    print("\nPer file elapsed time in seconds")
+    for fname, tval in per_file_times.items():
+        if tval is None:
+            print(f"{fname}: no timing recorded")
+        else:
+            print(f"{fname}: {tval:.2f} sec")
+
+    return df_all
+
+
+def cascade_summary_lines(config, df):
+    """
+    Escalations of a cascade run for the processing summary: papers
+    answered by the fast model alone, with some fields escalated, and
+    escalated whole.
+    """
+    if not config.cascade_model or "ESCALATED" not in df:
+        return []
+    escalated = df["ESCALATED"].dropna().astype(str)
+    whole = int((escalated == "paper").sum())
+    fast = int((escalated == "").sum())
+    return [
+        f"Cascade                {fast} fast only, {len(escalated) - fast - whole} with fields escalated,"
+        f" {whole} escalated whole ({config.cascade_model} -> {config.model})",
+    ]
+
+
+def consensus_summary_lines(config, df):
+    """
+    Replicate spending of a consensus run for the processing summary:
+    calls made, papers settled at the minimum and papers left unsettled.
+    """
+    if (config.consensus_replicates or 1) <= 1 or "CONSENSUS_REPLICATES" not in df:
+        return []
+    calls = df["CONSENSUS_REPLICATES"].dropna()
+    unsettled = df["CONSENSUS_UNSETTLED"].fillna("").astype(str).str.len() > 0
+    return [
+        f"Consensus replicates   {int(calls.sum())} calls for {len(calls)} papers"
+        f" (budget {config.consensus_replicates * len(calls)})",
+        f"Settled at minimum     {int((calls <= config.consensus_min_replicates).sum())} papers",
+        f"Unsettled papers       {int(unsettled.sum())}",
+    ]
+
+
+# ----------------------------------------------------------
+# entry point used by the scripts and the CLI
+# ----------------------------------------------------------
+def run_section(name, config, output_csv=None, client=None):
+    """
+    Run one section end to end with its own Runtime and return the
+    final DataFrame. output_csv defaults to the spec's output path.
+    """
+    spec = get_spec(name)
+    runtime = Runtime(config, client=client)
+    try:
+        context_index = load_context_index(spec, config)
+        return process_folder(runtime, spec, output_csv or spec.output_csv, context_index)
+    finally:
+        runtime.close()
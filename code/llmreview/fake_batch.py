@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import itertools
+import json
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from llmreview.fake_responses import sample_from_schema
+
+
+# ----------------------------------------------------------
+# in-memory stand-in for the Files and Batches APIs
+# ----------------------------------------------------------
+class _FakeFiles:
+    def __init__(self, server):
+        self._server = server
+
+    def upload(self, file, config=None):
+        if hasattr(file, "read"):
+            data = file.read()
+        else:
+            with open(file, "rb") as f:
+                data = f.read()
+        return self._server.add_file(data, getattr(config, "mime_type", None) or "application/pdf")
+
+    def get(self, name):
+        return self._server.stored[name]["meta"]
+
+    def download(self, file, config=None):
+        name = getattr(file, "name", file)
+        return self._server.stored[name]["data"]
+
+    def delete(self, name):
+        self._server.stored.pop(name, None)
+
+
+class _FakeBatches:
+    def __init__(self, server):
+        self._server = server
+
+    def create(self, model, src, config=None):
+        return self._server.create_job(model, src, getattr(config, "display_name", None))
+
+    def get(self, name):
+        return self._server.poll_job(name)
+
+
+class FakeBatchClient:
+    """
+    Local stand-in for the parts of genai.Client used by batch mode
+    (files.upload/get/download/delete, batches.create/get). A job stays
+    pending for completion_seconds, then succeeds with a result file
+    holding one schema-valid random answer per request. error_rate is
+    the share of requests answered with an error record instead.
+    """
+
+    def __init__(self, completion_seconds=2.0, error_rate=0.0, seed=None):
+        self.completion_seconds = completion_seconds
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.stored = {}
+        self.jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.files = _FakeFiles(self)
+        self.batches = _FakeBatches(self)
+
+    def add_file(self, data, mime_type):
+        with self._lock:
+            name = f"files/fake-{next(self._ids)}"
+        meta = SimpleNamespace(
+            name=name,
+            uri=f"https://fake.local/{name}",
+            mime_type=mime_type,
+            state="ACTIVE",
+            expiration_time=None,
+        )
+        self.stored[name] = {"data": data, "meta": meta}
+        return meta
+
+    def create_job(self, model, src, display_name):
+        with self._lock:
+            name = f"batches/fake-{next(self._ids)}"
+        self.jobs[name] = {
+            "model": model,
+            "src": src,
+            "display_name": display_name,
+            "created": time.time(),
+            "dest": None,
+        }
+        return self.poll_job(name)
+
+    def _answer(self, request):
+        config = request.get("generation_config") or {}
+        if self.rng.random() < self.error_rate:
+            return {"error": {"code": 500, "message": "fake batch error"}}
+        answer = sample_from_schema(config.get("response_schema") or {}, self.rng)
+        text = json.dumps(answer, ensure_ascii=False)
+        return {"response": {
+            "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}],
+            "usageMetadata": {
+                "promptTokenCount": 8000,
+                "candidatesTokenCount": len(text) // 4,
+                "totalTokenCount": 8000 + len(text) // 4,
+            },
+        }}
+
+    def poll_job(self, name):
+        job = self.jobs[name]
+        state = "JOB_STATE_PENDING"
+        if time.time() - job["created"] >= self.completion_seconds:
+            state = "JOB_STATE_SUCCEEDED"
+            if job["dest"] is None:
+                lines = []
+                for line in self.stored[job["src"]]["data"].decode("utf-8").splitlines():
+                    if line.strip():
+                        record = json.loads(line)
+                        lines.append(json.dumps({"key": record["key"], **self._answer(record["request"])}))
+                job["dest"] = self.add_file(("\n".join(lines) + "\n").encode("utf-8"), "jsonl").name
+        return SimpleNamespace(
+            name=name,
+            display_name=job["display_name"],
+            state=SimpleNamespace(name=state),
+            dest=SimpleNamespace(file_name=job["dest"]),
+        )
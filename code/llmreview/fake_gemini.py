@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+import collections
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+from google.genai import errors
+
+from llmreview.fake_responses import sample_from_schema
+
+# rough token costs used for the fake usage_metadata
+TOKENS_PER_PDF_PAGE = 800
+CHARS_PER_TOKEN = 4
+
+
+def _api_error(code, status, message, retry_delay=None):
+    body = {"error": {"code": code, "message": message, "status": status}}
+    if retry_delay is not None:
+        body["error"]["details"] = [{
+            "@type": "type.googleapis.com/google.rpc.RetryInfo",
+            "retryDelay": f"{retry_delay:.0f}s",
+        }]
+    cls = errors.ClientError if code < 500 else errors.ServerError
+    return cls(code, body)
+
+
+# ----------------------------------------------------------
+# in-memory stand-in for files, caches and models
+# ----------------------------------------------------------
+class _FakeFiles:
+    def __init__(self, server):
+        self._server = server
+
+    def upload(self, file, config=None):
+        return self._server.upload(file)
+
+    def get(self, name):
+        return self._server.stored[name]["meta"]
+
+    def delete(self, name):
+        self._server.stored.pop(name, None)
+
+
+class _FakeCaches:
+    def __init__(self, server):
+        self._server = server
+
+    def create(self, model, config=None):
+        return self._server.create_cache(model, config)
+
+    def delete(self, name):
+        self._server.caches_by_name.pop(name, None)
+
+
+class _FakeModels:
+    def __init__(self, server):
+        self._server = server
+
+    def generate_content(self, model, contents, config=None):
+        return self._server.generate(model, contents, config)
+
+    def generate_content_stream(self, model, contents, config=None):
+        return self._server.generate_stream(model, contents, config)
+
+
+class FakeGeminiClient:
+    """
+    Local stand-in for the genai.Client surface the engine uses
+    (files.upload/get/delete, caches.create/delete and
+    models.generate_content), for offline throughput tests.
+
+    latency_median, latency_sigma  generate_content latency in seconds,
+                                   lognormal (sigma 0 = fixed)
+    upload_seconds                 time per files.upload
+    error_rate                     share of calls failing with a 500/503
+    quota_rpm                      requests per minute before 429s (None =
+                                   no quota); 429s carry a retryDelay
+    quota_error_rate               extra share of random 429s
+    min_cache_tokens               caches.create refuses smaller content
+    off_schema_rate                share of answers with one enum value
+                                   replaced by an unlisted one
+    stream_chunk_chars             text per chunk of generate_content_stream
+
+    Answers are schema-valid random JSON; usage_metadata estimates
+    tokens from the request (TOKENS_PER_PDF_PAGE per page, text length
+    / CHARS_PER_TOKEN), with the cached share reported when
+    cached_content is used. generate_content_stream yields the same
+    answer in chunks spread over the call's latency, with the usage on
+    the last chunk. calls, errors and throttled count what happened.
+    """
+
+    def __init__(self, latency_median=1.0, latency_sigma=0.5, upload_seconds=0.2,
+                 error_rate=0.0, quota_rpm=None, quota_error_rate=0.0,
+                 min_cache_tokens=4096, off_schema_rate=0.0, stream_chunk_chars=200, seed=None):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.upload_seconds = upload_seconds
+        self.error_rate = error_rate
+        self.quota_rpm = quota_rpm
+        self.quota_error_rate = quota_error_rate
+        self.min_cache_tokens = min_cache_tokens
+        self.off_schema_rate = off_schema_rate
+        self.stream_chunk_chars = stream_chunk_chars
+        self.rng = random.Random(seed)
+        self.stored = {}
+        self.caches_by_name = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._recent = collections.deque()
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+        self.files = _FakeFiles(self)
+        self.caches = _FakeCaches(self)
+        self.models = _FakeModels(self)
+
+    def _next_name(self, prefix):
+        with self._lock:
+            return f"{prefix}/fake-{next(self._ids)}"
+
+    def _random(self):
+        with self._lock:
+            return self.rng.random()
+
+    # files ------------------------------------------------------
+    def upload(self, file):
+        if hasattr(file, "read"):
+            data = file.read()
+        else:
+            with open(file, "rb") as f:
+                data = f.read()
+        time.sleep(self.upload_seconds)
+        name = self._next_name("files")
+        # count page objects; "/Type /Pages" is the page tree, not a page
+        pages = data.count(b"/Type /Page") - data.count(b"/Type /Pages")
+        meta = SimpleNamespace(
+            name=name,
+            uri=f"https://fake.local/{name}",
+            mime_type="application/pdf",
+            state="ACTIVE",
+            expiration_time=None,
+        )
+        self.stored[name] = {"meta": meta, "pages": max(pages, 1)}
+        return meta
+
+    def _part_tokens(self, part):
+        text = getattr(part, "text", None)
+        if text:
+            return math.ceil(len(text) / CHARS_PER_TOKEN)
+        file_data = getattr(part, "file_data", None)
+        if file_data is not None:
+            name = str(file_data.file_uri).split("fake.local/")[-1]
+            entry = self.stored.get(name)
+            if entry is None:
+                raise _api_error(403, "PERMISSION_DENIED", f"File {name} does not exist or was deleted")
+            return entry["pages"] * TOKENS_PER_PDF_PAGE
+        return 0
+
+    def _content_tokens(self, contents):
+        return sum(self._part_tokens(p) for c in contents or [] for p in (c.parts or []))
+
+    # caches -----------------------------------------------------
+    def create_cache(self, model, config):
+        tokens = self._content_tokens(config.contents)
+        if tokens < self.min_cache_tokens:
+            raise _api_error(400, "INVALID_ARGUMENT",
+                             f"Cached content is too small. total_token_count={tokens}, "
+                             f"min_total_token_count={self.min_cache_tokens}")
+        name = self._next_name("cachedContents")
+        self.caches_by_name[name] = {"model": model, "tokens": tokens}
+        return SimpleNamespace(name=name, model=model, expire_time=None)
+
+    # models -----------------------------------------------------
+    def _check_quota(self):
+        now = time.monotonic()
+        with self._lock:
+            self.calls += 1
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if self.quota_rpm is not None and len(self._recent) >= self.quota_rpm:
+                self.throttled += 1
+                delay = 60 - (now - self._recent[0])
+                raise _api_error(429, "RESOURCE_EXHAUSTED", "Quota exceeded for requests per minute",
+                                 retry_delay=max(1.0, delay))
+            self._recent.append(now)
+        if self._random() < self.quota_error_rate:
+            with self._lock:
+                self.throttled += 1
+            raise _api_error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted", retry_delay=2)
+
+    def _latency(self):
+        if not self.latency_sigma:
+            return self.latency_median
+        with self._lock:
+            return self.latency_median * math.exp(self.rng.gauss(0, self.latency_sigma))
+
+    def _start_call(self, contents, config):
+        self._check_quota()
+        prompt_tokens = self._content_tokens(contents)
+        cached_tokens = 0
+        cached_name = getattr(config, "cached_content", None)
+        if cached_name:
+            cache = self.caches_by_name.get(cached_name)
+            if cache is None:
+                raise _api_error(404, "NOT_FOUND", f"CachedContent {cached_name} not found")
+            cached_tokens = cache["tokens"]
+        return prompt_tokens, cached_tokens
+
+    def _fail_sometimes(self):
+        if self._random() < self.error_rate:
+            with self._lock:
+                self.errors += 1
+            code, status = (503, "UNAVAILABLE") if self._random() < 0.5 else (500, "INTERNAL")
+            raise _api_error(code, status, "The model is overloaded. Please try again later.")
+
+    def _answer(self, config, prompt_tokens, cached_tokens):
+        with self._lock:
+            answer = sample_from_schema(config.response_schema, self.rng)
+            thinking = self.rng.randint(200, 2000)
+            off_schema = self.rng.random() < self.off_schema_rate
+        if off_schema:
+            # an enum value the schema does not allow, as a drifting model might write
+            for name, value in answer.items():
+                if isinstance(value, list) and value:
+                    answer[name] = value[:-1] + ["Unlisted category"]
+                    break
+        text = json.dumps(answer, ensure_ascii=False)
+        output_tokens = math.ceil(len(text) / CHARS_PER_TOKEN)
+        usage = SimpleNamespace(
+            prompt_token_count=prompt_tokens + cached_tokens,
+            cached_content_token_count=cached_tokens or None,
+            candidates_token_count=output_tokens,
+            thoughts_token_count=thinking,
+            total_token_count=prompt_tokens + cached_tokens + output_tokens + thinking,
+        )
+        return text, usage
+
+    def generate(self, model, contents, config):
+        prompt_tokens, cached_tokens = self._start_call(contents, config)
+        time.sleep(self._latency())
+        self._fail_sometimes()
+        text, usage = self._answer(config, prompt_tokens, cached_tokens)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def generate_stream(self, model, contents, config):
+        # quota and cache are checked when the stream is opened
+        prompt_tokens, cached_tokens = self._start_call(contents, config)
+        return self._stream(config, prompt_tokens, cached_tokens)
+
+    def _stream(self, config, prompt_tokens, cached_tokens):
+        latency = self._latency()
+        # thinking happens before the first chunk; the rest is spread over the chunks
+        time.sleep(latency * 0.5)
+        self._fail_sometimes()
+        text, usage = self._answer(config, prompt_tokens, cached_tokens)
+        step = max(1, self.stream_chunk_chars)
+        chunks = [text[i:i + step] for i in range(0, len(text), step)]
+        for i, piece in enumerate(chunks):
+            if i:
+                time.sleep(latency * 0.5 / len(chunks))
+            last = i == len(chunks) - 1
+            yield SimpleNamespace(text=piece, usage_metadata=usage if last else None)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import random
+
+
+def schema_dict(schema):
+    """
+    Return a response schema as a plain dict (JSON form), accepting a
+    types.Schema or a dict.
+    """
+    if hasattr(schema, "model_dump"):
+        return schema.model_dump(mode="json", exclude_none=True)
+    return schema
+
+
+def _type(node):
+    return str(node.get("type") or "").lower()
+
+
+def sample_from_schema(schema, rng=None, field_name=""):
+    """
+    Build a random value that satisfies a response schema: objects get
+    every property, enums pick a legal value, arrays pick a few distinct
+    enum values, integers look like years or counts, and strings are
+    short placeholders (a quote-like sentence for *_Detail fields).
+    Used by the offline fakes in place of real model output.
+    """
+    rng = rng or random.Random()
+    node = schema_dict(schema)
+
+    if node.get("any_of"):
+        return sample_from_schema(rng.choice(node["any_of"]), rng, field_name)
+
+    kind = _type(node)
+    if kind == "object":
+        return {
+            name: sample_from_schema(prop, rng, name)
+            for name, prop in (node.get("properties") or {}).items()
+        }
+    if kind == "array":
+        items = node.get("items") or {}
+        if items.get("enum"):
+            k = rng.randint(0, min(3, len(items["enum"])))
+            return rng.sample(list(items["enum"]), k)
+        return [sample_from_schema(items, rng, field_name) for _ in range(rng.randint(0, 2))]
+    if node.get("enum"):
+        return rng.choice(list(node["enum"]))
+    if kind == "integer":
+        return rng.randint(2000, 2025) if field_name == "Year" else rng.randint(1, 50)
+    if kind == "number":
+        return round(rng.uniform(0, 1), 3)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if field_name.endswith("_Detail"):
+        return f"Synthetic justification for {field_name}: \"placeholder quote\"."
+    return f"Synthetic {field_name or 'text'}"
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from google.genai import types
+
+from llmreview.config import MODEL_NAME
+from llmreview.validation import loads_json_object
+
+
+def pdf_part(remote_file):
+    """
+    Build the file part for an uploaded PDF (anything with a .uri).
+    """
+    return types.Part(
+        file_data=types.FileData(
+            mime_type="application/pdf",
+            file_uri=remote_file.uri
+        )
+    )
+
+
+def generate_json(client, parts, schema, model=MODEL_NAME, temperature=0, cached_content=None):
+    """
+    Call generate_content with a JSON response schema and return the
+    raw response object. cached_content names an explicit context cache
+    whose contents come before parts.
+    """
+    return client.models.generate_content(
+        model=model,
+        contents=[types.Content(parts=parts)],
+        config=types.GenerateContentConfig(
+            temperature=temperature,
+            responseSchema=schema,
+            response_mime_type="application/json",
+            cached_content=cached_content,
+        ),
+    )
+
+
+def parse_json_response(raw_text):
+    """
+    Parse a model response into a dict, repairing code fences, a leading
+    "json" label, text around the object and trailing commas (see
+    validation.loads_json_object). Returns None if nothing parseable is
+    found. This checks syntax only; use validation.compile_schema for
+    the schema.
+    """
+    return loads_json_object(raw_text)
+
+
+def usage_counts(response):
+    """
+    Return the token counts from response.usage_metadata as a dict
+    (missing counts are 0).
+    """
+    usage = getattr(response, "usage_metadata", None)
+    names = [
+        "prompt_token_count",
+        "candidates_token_count",
+        "cached_content_token_count",
+        "thoughts_token_count",
+        "total_token_count",
+    ]
+    counts = {n: (getattr(usage, n, None) or 0) for n in names}
+    counts["uncached_prompt_token_count"] = counts["prompt_token_count"] - counts["cached_content_token_count"]
+    return counts
+
+
+# ----------------------------------------------------------
+# token accounting for a run
+# ----------------------------------------------------------
+class UsageTally:
+    """
+    Thread-safe running totals of usage_counts() over a run, with the
+    prompt split into tokens served from a context cache and tokens
+    sent uncached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.totals = {}
+
+    def add(self, response):
+        """
+        Add one response's counts and return them.
+        """
+        counts = usage_counts(response)
+        with self._lock:
+            self.calls += 1
+            for name, value in counts.items():
+                self.totals[name] = self.totals.get(name, 0) + value
+        return counts
+
+    def summary_lines(self):
+        t = self.totals
+        return [
+            f"Model calls            {self.calls}",
+            f"Prompt tokens          {t.get('prompt_token_count', 0)}"
+            f"  (cached {t.get('cached_content_token_count', 0)},"
+            f" uncached {t.get('uncached_prompt_token_count', 0)})",
+            f"Output tokens          {t.get('candidates_token_count', 0)}"
+            f"  (+ {t.get('thoughts_token_count', 0)} thinking)",
+        ]
+
+
+def format_usage(counts):
+    """
+    One-line token report for a single call.
+    """
+    return (f"prompt {counts['prompt_token_count']} (cached {counts['cached_content_token_count']}, "
+            f"uncached {counts['uncached_prompt_token_count']}), output {counts['candidates_token_count']}")
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+import hashlib
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    Return the hex SHA-256 digest of a file's bytes, read in chunks so
+    large PDFs are never loaded into memory at once.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
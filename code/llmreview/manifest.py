@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from llmreview.concurrency import run_ordered
+from llmreview.corpus import R35_PDF_FILES
+from llmreview.hashing import file_sha256
+
+# what one refresh found: file names per kind of change
+RefreshReport = namedtuple("RefreshReport", ["new", "changed", "missing", "unchanged"])
+
+# subsets every manifest knows without being told
+BUILTIN_SUBSETS = {"r35": R35_PDF_FILES}
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def count_pages(pdf_path):
+    """
+    Page count of a PDF, or None if pypdf cannot read it.
+    """
+    from pypdf import PdfReader
+
+    try:
+        return len(PdfReader(pdf_path).pages)
+    except Exception as e:
+        print(f"Could not count the pages of {os.path.basename(pdf_path)}: {e}")
+        return None
+
+
+# ----------------------------------------------------------
+# persistent manifest of the PDF folder
+# ----------------------------------------------------------
+class CorpusManifest:
+    """
+    Inventory of the PDFs in pdf_dir, stored as JSON: per file its size,
+    mtime, SHA-256, page count, when it was first seen and when its
+    content last changed. refresh() only hashes files whose size or
+    mtime differ from the stored entry, so keeping the manifest current
+    costs one directory scan. It also holds named subsets and, per
+    round, the files and hashes the round was run on, which select()
+    queries ("new:r35", "changed:r35", "subset:pilot", ...) are
+    answered from.
+    """
+
+    def __init__(self, path, pdf_dir):
+        self.path = path
+        self.pdf_dir = pdf_dir
+        self._lock = threading.Lock()
+        data = self._read()
+        self.files = data.get("files", {})
+        self.subsets = data.get("subsets", {})
+        self.rounds = data.get("rounds", {})
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read corpus manifest {self.path}: {e}")
+            return {}
+
+    def save(self):
+        with self._lock:
+            data = {"pdf_dir": self.pdf_dir, "files": self.files,
+                    "subsets": self.subsets, "rounds": self.rounds}
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def refresh(self, max_workers=4):
+        """
+        Scan pdf_dir, hash and count the pages of new files and of files
+        whose size or mtime changed (max_workers at a time), mark files
+        that disappeared as missing, save, and return a RefreshReport.
+        A file whose mtime changed but whose hash did not is unchanged.
+        """
+        stats = {}
+        with os.scandir(self.pdf_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                    st = entry.stat()
+                    stats[entry.name] = (st.st_size, st.st_mtime_ns)
+
+        to_hash = []
+        unchanged = []
+        for name, (size, mtime_ns) in stats.items():
+            entry = self.files.get(name)
+            if entry and entry.get("present") and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+                unchanged.append(name)
+            else:
+                to_hash.append(name)
+
+        def describe(name):
+            path = os.path.join(self.pdf_dir, name)
+            return file_sha256(path), count_pages(path)
+
+        new, changed = [], []
+        now = _now()
+        for name, (sha, pages) in run_ordered(describe, sorted(to_hash), max_workers):
+            size, mtime_ns = stats[name]
+            entry = self.files.get(name)
+            if entry is None:
+                new.append(name)
+                entry = {"first_seen": now, "modified": now}
+            elif entry["sha256"] != sha:
+                changed.append(name)
+                entry["previous_sha256"] = entry["sha256"]
+                entry["modified"] = now
+            else:
+                unchanged.append(name)
+            entry.update(size=size, mtime_ns=mtime_ns, sha256=sha, pages=pages, present=True)
+            self.files[name] = entry
+
+        missing = []
+        for name, entry in self.files.items():
+            if name not in stats and entry.get("present"):
+                entry["present"] = False
+                missing.append(name)
+        self.save()
+        return RefreshReport(new, changed, missing, sorted(unchanged))
+
+    # ------------------------------------------------------
+    # queries
+    # ------------------------------------------------------
+    def present(self):
+        return sorted(name for name, entry in self.files.items() if entry.get("present"))
+
+    def duplicates(self):
+        """
+        {sha256: [file names]} for content present under several names,
+        the copy seen first (the original) first.
+        """
+        by_sha = {}
+        for name in sorted(self.present(), key=lambda n: (self.files[n]["first_seen"], n)):
+            by_sha.setdefault(self.files[name]["sha256"], []).append(name)
+        return {sha: names for sha, names in by_sha.items() if len(names) > 1}
+
+    def subset(self, name):
+        if name in self.subsets:
+            return list(self.subsets[name])
+        if name in BUILTIN_SUBSETS:
+            return list(BUILTIN_SUBSETS[name])
+        raise KeyError(f"unknown subset {name!r}; known: {', '.join(sorted(self.subsets) + list(BUILTIN_SUBSETS))}")
+
+    def _round(self, name):
+        if name not in self.rounds:
+            raise KeyError(f"no round {name!r} recorded in {self.path}; known: {', '.join(self.rounds) or 'none'}")
+        return self.rounds[name]["files"]
+
+    def select(self, query):
+        """
+        File names for a work-set query, in list order:
+
+            all                  every PDF present
+            subset:NAME or NAME  a saved subset (r35 is built in)
+            new:ROUND            present but not part of the round
+            changed:ROUND        in the round, but the content changed since
+            pending:ROUND        new and changed together
+            since:YYYY-MM-DD     first seen on or after the date
+            duplicates           later copies of content already present
+
+        Files no longer in pdf_dir are left out. Runs replace the rows
+        already written for the changed files of a changed: or pending:
+        query (corpus.files_to_replace); other papers in an output CSV
+        are skipped.
+        """
+        kind, _, arg = query.partition(":")
+        present = set(self.present())
+        if kind == "all":
+            names = sorted(present)
+        elif kind in ("new", "changed", "pending"):
+            round_files = self._round(arg)
+            new = [n for n in sorted(present) if n not in round_files]
+            changed = [n for n in round_files
+                       if n in present and self.files[n]["sha256"] != round_files[n]]
+            names = {"new": new, "changed": changed, "pending": changed + new}[kind]
+        elif kind == "since":
+            names = [n for n in sorted(present) if self.files[n]["first_seen"][:len(arg)] >= arg]
+        elif kind == "duplicates":
+            names = sorted(n for group in self.duplicates().values() for n in group[1:])
+        elif kind != "subset" and arg:
+            raise KeyError(f"unknown query {query!r}")
+        else:
+            names = [n for n in self.subset(arg if kind == "subset" else query) if n in present]
+        return names
+
+    def save_subset(self, name, files):
+        self.subsets[name] = list(files)
+        self.save()
+
+    def record_round(self, name, files):
+        """
+        Remember which files (and which content) a round was run on, so
+        later new:/changed: queries can be answered against it. A round
+        run in several steps accumulates its files.
+        """
+        entry = self.rounds.setdefault(name, {"files": {}})
+        entry["recorded"] = _now()
+        entry["files"].update({n: self.files[n]["sha256"] for n in files if n in self.files})
+        self.save()
+
+
+def load_manifest(config, refresh=True):
+    """
+    The config's manifest for its pdf_dir, refreshed unless told not to.
+    """
+    manifest = CorpusManifest(config.manifest_json, config.pdf_dir)
+    if refresh:
+        report = manifest.refresh(max_workers=config.max_workers)
+        print(f"Corpus manifest: {len(manifest.present())} PDFs, {len(report.new)} new, "
+              f"{len(report.changed)} changed, {len(report.missing)} missing")
+    return manifest
+
+
+# ----------------------------------------------------------
+# watch mode
+# ----------------------------------------------------------
+def watch(manifest, on_arrivals, interval_seconds=60, settle_seconds=30, max_workers=4, max_polls=None):
+    """
+    Poll pdf_dir every interval_seconds and hand new or changed PDFs to
+    on_arrivals(file names). A file is handed over once its mtime is at
+    least settle_seconds old, so one still being copied waits for the
+    next poll. Files present when the watch starts count as seen.
+    max_polls stops the loop (None = until interrupted).
+    """
+    manifest.refresh(max_workers)
+    seen = {name: manifest.files[name]["sha256"] for name in manifest.present()}
+    print(f"Watching {manifest.pdf_dir} ({len(seen)} PDFs) every {interval_seconds} sec")
+    polls = 0
+    try:
+        while max_polls is None or polls < max_polls:
+            time.sleep(interval_seconds)
+            polls += 1
+            manifest.refresh(max_workers)
+            cutoff = time.time_ns() - int(settle_seconds * 1e9)
+            arrivals = [name for name in manifest.present()
+                        if seen.get(name) != manifest.files[name]["sha256"]
+                        and manifest.files[name]["mtime_ns"] <= cutoff]
+            if not arrivals:
+                continue
+            print(f"{len(arrivals)} new or changed PDFs: {', '.join(arrivals)}")
+            on_arrivals(arrivals)
+            for name in arrivals:
+                seen[name] = manifest.files[name]["sha256"]
+    except KeyboardInterrupt:
+        print("Stopped watching")
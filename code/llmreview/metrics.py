@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# USD per million tokens (standard tier, prompts up to 200k tokens).
+# Thinking tokens are billed as output. Update when prices change.
+PRICES_PER_MILLION = {
+    "gemini-2.5-pro": {"input": 1.25, "cached": 0.31, "output": 10.00},
+    "gemini-2.5-flash": {"input": 0.30, "cached": 0.075, "output": 2.50},
+    "gemini-2.5-flash-lite": {"input": 0.10, "cached": 0.025, "output": 0.40},
+}
+
+# outcomes of calls that produced no usable answer; "invalid_fields"
+# answers were used, with the failing fields repaired or blanked
+ERROR_OUTCOMES = ("model_error", "parse_error", "file_missing")
+
+
+def price_for(model):
+    """
+    Price row for a model name such as "models/gemini-2.5-pro", or None.
+    """
+    name = str(model).split("/")[-1]
+    # longest key first, so "flash-lite" is not priced as "flash"
+    for key in sorted(PRICES_PER_MILLION, key=len, reverse=True):
+        if name.startswith(key):
+            return PRICES_PER_MILLION[key]
+    return None
+
+
+# ----------------------------------------------------------
+# one call record
+# ----------------------------------------------------------
+class CallRecord:
+    """
+    Timings and token counts of one section call for one paper. Phases
+    are timed with `with record.phase("upload"): ...`; a phase entered
+    twice accumulates. The context_cache phase includes the upload made
+    to create a cache, which is also counted under upload.
+    """
+
+    def __init__(self, section, file_name, **fields):
+        self.started = time.time()
+        self.data = {
+            "section": section,
+            "file_name": file_name,
+            **fields,
+            "phases": {},
+            "tokens": {},
+            "retries": 0,
+        }
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = self.data["phases"]
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+    def set(self, **fields):
+        self.data.update(fields)
+
+
+# ----------------------------------------------------------
+# JSONL metrics log
+# ----------------------------------------------------------
+class MetricsLog:
+    """
+    Append-only JSONL log with one record per section call: section,
+    paper, round, model, input mode, phase timings, token counts, retry
+    count and outcome. path=None keeps the records out of any file.
+    """
+
+    def __init__(self, path, **common):
+        self.path = path
+        self.common = common
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def start(self, section, file_name):
+        return CallRecord(section, file_name, **self.common)
+
+    def finish(self, record, outcome, error=None):
+        """
+        Close a record with its outcome ("ok", "cache_hit", "model_error",
+        "parse_error", "invalid_fields" or "file_missing") and append it
+        to the log.
+        """
+        ended = time.time()
+        record.set(
+            outcome=outcome,
+            error=str(error)[:500] if error is not None else None,
+            started=record.started,
+            ended=ended,
+            total_seconds=ended - record.started,
+        )
+        if not self.path:
+            return
+        line = json.dumps(record.data, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+def read_metrics(paths):
+    """
+    Load one or more JSONL metrics logs into a flat DataFrame (phase
+    timings as phase_<name>, token counts by their usage names).
+    """
+    records = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                flat = {k: v for k, v in rec.items() if k not in ("phases", "tokens")}
+                flat.update({f"phase_{k}": v for k, v in (rec.get("phases") or {}).items()})
+                flat.update(rec.get("tokens") or {})
+                records.append(flat)
+    return pd.DataFrame(records)
+
+
+def call_cost(row):
+    """
+    USD cost of one call from its token counts, or NaN for unknown models.
+    """
+    price = price_for(row.get("model"))
+    if price is None:
+        return float("nan")
+    uncached = row.get("uncached_prompt_token_count", 0) or 0
+    cached = row.get("cached_content_token_count", 0) or 0
+    output = (row.get("candidates_token_count", 0) or 0) + (row.get("thoughts_token_count", 0) or 0)
+    return (uncached * price["input"] + cached * price["cached"] + output * price["output"]) / 1e6
+
+
+def summarize_metrics(df):
+    """
+    Per-section (and per-round, if recorded) summary: calls, outcomes
+    (errors are calls without a usable answer, ERROR_OUTCOMES; answers
+    with repaired or blanked fields are counted as invalid_fields),
+    p50/p95 latency of the whole call and of generation (and of the
+    first streamed field, when streaming was on), throughput in
+    papers per minute over the section's active span, tokens and cost.
+    Returns a DataFrame.
+    """
+    df = df.copy()
+    for col in ["prompt_token_count", "candidates_token_count", "cached_content_token_count",
+                "thoughts_token_count", "uncached_prompt_token_count", "phase_generate"]:
+        if col not in df:
+            df[col] = 0.0
+    df["cost_usd"] = df.apply(call_cost, axis=1)
+
+    keys = ["section"]
+    if "round" in df and (df["round"].fillna("") != "").any():
+        keys = ["round", "section"]
+    rows = []
+    for key, g in df.groupby(keys, sort=False):
+        key = key if isinstance(key, tuple) else (key,)
+        span_minutes = max(g["ended"].max() - g["started"].min(), 1e-9) / 60.0
+        called = g[g["outcome"] != "cache_hit"]
+        rows.append({
+            **dict(zip(keys, key)),
+            "calls": len(g),
+            "ok": int(g["outcome"].isin(["ok", "cache_hit"]).sum()),
+            "cache_hits": int((g["outcome"] == "cache_hit").sum()),
+            "errors": int(g["outcome"].isin(ERROR_OUTCOMES).sum()),
+            "invalid_fields": int((g["outcome"] == "invalid_fields").sum()),
+            "retries": int(g["retries"].sum()),
+            "p50_seconds": g["total_seconds"].quantile(0.5),
+            "p95_seconds": g["total_seconds"].quantile(0.95),
+            "p50_generate": called["phase_generate"].quantile(0.5) if len(called) else float("nan"),
+            "p95_generate": called["phase_generate"].quantile(0.95) if len(called) else float("nan"),
+            **({"p50_first_field": called["first_field_seconds"].quantile(0.5),
+                "p95_first_field": called["first_field_seconds"].quantile(0.95),
+                "stream_aborts": int(called["stream_aborts"].fillna(0).sum())}
+               if "first_field_seconds" in df else {}),
+            "papers_per_minute": g["file_name"].nunique() / span_minutes,
+            "prompt_tokens": int(g["prompt_token_count"].sum()),
+            "cached_tokens": int(g["cached_content_token_count"].sum()),
+            "output_tokens": int(g["candidates_token_count"].sum()),
+            "thinking_tokens": int(g["thoughts_token_count"].sum()),
+            "cost_usd": g["cost_usd"].sum(min_count=1),
+        })
+    return pd.DataFrame(rows)
+
+
+def summarize_cascade(df):
+    """
+    Per-section summary of a cascade run (records carrying a cascade
+    field): papers answered by the fast model alone, with fields
+    escalated and escalated whole, the escalation rate, p50 generate
+    time of the fast and the main model, and the generate time saved
+    against sending every paper to the main model: its p50 on papers
+    escalated whole, else in non-cascade runs of the section found in
+    the same logs (an earlier main-model round), else on any
+    escalation, minus what each paper actually spent. Returns an empty
+    DataFrame if no cascade ran.
+    """
+    if "cascade" not in df:
+        return pd.DataFrame()
+    df = df.copy()
+    for col in ["phase_generate", "phase_escalate"]:
+        if col not in df:
+            df[col] = 0.0
+    keys = ["section"]
+    if "round" in df and (df["round"].fillna("") != "").any():
+        keys = ["round", "section"]
+    plain = df[df["cascade"].isna() & (df["outcome"] == "ok")]
+    rows = []
+    for key, g in df[df["cascade"].notna()].groupby(keys, sort=False):
+        key = key if isinstance(key, tuple) else (key,)
+        baseline = plain.loc[plain["section"] == key[-1], "phase_generate"]
+        papers = g[g["cascade"].isin(["fast", "fields", "paper"]) & (g["outcome"] != "cache_hit")]
+        escalations = g[g["cascade"] == "escalation"]
+        whole_files = set(papers.loc[papers["cascade"] == "paper", "file_name"])
+        whole = escalations[escalations["file_name"].isin(whole_files)]
+        if len(whole):
+            main_p50 = whole["phase_generate"].quantile(0.5)
+        elif len(baseline):
+            main_p50 = baseline.quantile(0.5)
+        else:
+            main_p50 = escalations["phase_generate"].quantile(0.5) if len(escalations) else float("nan")
+        spent = papers["phase_generate"].fillna(0) + papers["phase_escalate"].fillna(0)
+        saved = (main_p50 - spent).sum(min_count=1)
+        n = len(papers)
+        rows.append({
+            **dict(zip(keys, key)),
+            "papers": n,
+            "fast_only": int((papers["cascade"] == "fast").sum()),
+            "fields_escalated": int((papers["cascade"] == "fields").sum()),
+            "papers_escalated": int((papers["cascade"] == "paper").sum()),
+            "escalation_rate": (papers["cascade"] != "fast").sum() / n if n else float("nan"),
+            "p50_fast_generate": papers["phase_generate"].quantile(0.5),
+            "p50_main_generate": main_p50,
+            "seconds_saved": saved,
+            "share_saved": saved / (main_p50 * n) if n and main_p50 else float("nan"),
+        })
+    return pd.DataFrame(rows)
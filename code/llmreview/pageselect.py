@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import threading
+
+# Heading text by role. A line counts as a heading only if, after an
+# optional section number ("2.", "2.1", "II."), the whole short line is
+# one of these phrases, so "results" inside a sentence never matches.
+HEADING_PATTERNS = {
+    "methods": (
+        r"(materials?|data|data sources?|data collection)\s+(and|&)\s+methods?"
+        r"|methods?(\s+(and|&)\s+(materials?|data))?|methodology|research\s+design"
+        r"|study\s+(area|design|site|sites|region)s?(\s+and\s+methods?)?"
+        r"|empirical\s+strategy"
+    ),
+    "results": (
+        r"results?(\s+(and|&)\s+discussion)?|findings|empirical\s+results?"
+        r"|analysis\s+(and|&)\s+results?"
+    ),
+    "end": (
+        r"discussion|general\s+discussion|conclusions?|concluding\s+remarks"
+        r"|discussion\s+(and|&)\s+conclusions?|references|bibliography"
+        r"|literature\s+cited|acknowledge?ments?"
+    ),
+}
+
+_NUMBER = r"(?:(?:\d{1,2}(?:\.\d{1,2})*|[ivx]{1,4})\.?\s+)?"
+HEADING_RES = {
+    kind: re.compile(rf"^\s*{_NUMBER}(?:{pattern})\s*[:.]?\s*$", re.IGNORECASE)
+    for kind, pattern in HEADING_PATTERNS.items()
+}
+
+# longest line still treated as a possible heading
+MAX_HEADING_CHARS = 60
+
+# a Methods-Results span shorter than this share of the paper is taken
+# as a misdetection and the full paper is sent
+MIN_FRACTION = 0.15
+
+
+def find_headings(pages):
+    """
+    Return (page_number, kind) for every line that looks like a
+    methods, results or end-matter heading, in reading order.
+    page_number is 1-based.
+    """
+    headings = []
+    for page_no, text in enumerate(pages, start=1):
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or len(line) > MAX_HEADING_CHARS:
+                continue
+            for kind, regex in HEADING_RES.items():
+                if regex.match(line):
+                    headings.append((page_no, kind))
+                    break
+    return headings
+
+
+def methods_results_pages(pages):
+    """
+    Page numbers (1-based) running from a Methods heading to the
+    end-matter heading (Discussion, Conclusions, References, ...) that
+    follows the first Results heading after it. The end page is kept,
+    since the Results usually end part-way down it. Every Methods
+    heading is tried and the longest span wins, so the Methods/Results
+    labels of a structured abstract do not shadow the real sections.
+    Returns None (send the full paper) when no span is found, or when
+    it is implausibly short or would be the whole paper.
+    """
+    headings = find_headings(pages)
+    best = None
+    for start, (first_page, kind) in enumerate(headings):
+        if kind != "methods":
+            continue
+        results = [i for i, (_, k) in enumerate(headings) if k == "results" and i > start]
+        if not results:
+            continue
+        ends = [i for i, (_, k) in enumerate(headings) if k == "end" and i > results[0]]
+        last_page = headings[ends[0]][0] if ends else len(pages)
+        if best is None or last_page - first_page > best[1] - best[0]:
+            best = (first_page, last_page)
+
+    if best is None:
+        return None
+    selected = list(range(best[0], best[1] + 1))
+    if len(selected) >= len(pages) or len(selected) < MIN_FRACTION * len(pages):
+        return None
+    return selected
+
+
+# page scopes a SectionSpec can ask for
+PAGE_SCOPES = {
+    "methods_results": methods_results_pages,
+}
+
+
+def select_pages(pages, scope):
+    """
+    Apply a named page scope to a paper's page texts. Returns the
+    selected 1-based page numbers, or None for the full paper.
+    """
+    return PAGE_SCOPES[scope](pages)
+
+
+def page_ranges(page_numbers):
+    """
+    Compact text form of page numbers, e.g. [3, 4, 5, 8] -> "3-5,8".
+    """
+    ranges = []
+    for n in page_numbers:
+        if ranges and n == ranges[-1][1] + 1:
+            ranges[-1][1] = n
+        else:
+            ranges.append([n, n])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def write_page_subset(pdf_path, page_numbers, out_dir, sha):
+    """
+    Write a PDF holding only the given pages of pdf_path to
+    out_dir/<sha>_p<ranges>.pdf (once) and return its path.
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    out_path = os.path.join(out_dir, f"{sha[:16]}_p{page_ranges(page_numbers)}.pdf")
+    if os.path.exists(out_path):
+        return out_path
+    os.makedirs(out_dir, exist_ok=True)
+    reader = PdfReader(pdf_path)
+    writer = PdfWriter()
+    for n in page_numbers:
+        writer.add_page(reader.pages[n - 1])
+    tmp_path = f"{out_path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        writer.write(f)
+    os.replace(tmp_path, out_path)
+    return out_path
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import re
+import threading
+
+from llmreview.hashing import file_sha256
+
+# bump when the extraction changes, so cached text is rebuilt
+EXTRACTOR_VERSION = "pypdf-1"
+
+
+def extract_pages(pdf_path):
+    """
+    Extract the text layer of every page with pypdf and return a list
+    of page strings (empty for pages without a text layer, e.g. scans).
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    pages = []
+    for page in reader.pages:
+        try:
+            text = page.extract_text() or ""
+        except Exception as e:
+            print(f"Text extraction failed on a page of {os.path.basename(pdf_path)}: {e}")
+            text = ""
+        # collapse runs of blank lines and trailing spaces
+        text = re.sub(r"[ \t]+\n", "\n", text)
+        text = re.sub(r"\n{3,}", "\n\n", text)
+        pages.append(text.strip())
+    return pages
+
+
+def pages_to_text(pages, page_numbers=None):
+    """
+    Join page texts into one payload with a "[Page N]" marker before each
+    page, so the model can still cite page locations. page_numbers
+    (1-based) limits the payload to those pages.
+    """
+    if page_numbers is None:
+        page_numbers = range(1, len(pages) + 1)
+    return "\n\n".join(f"[Page {n}]\n{pages[n - 1]}" for n in page_numbers)
+
+
+# ----------------------------------------------------------
+# on-disk text cache
+# ----------------------------------------------------------
+class PdfTextCache:
+    """
+    Extracted page texts, one JSON file per PDF under
+    cache_dir/<sha256>.json, so each paper is parsed once no matter how
+    many sections, rounds or scripts read it.
+    """
+
+    # below this many characters per page the PDF is treated as a scan
+    MIN_CHARS_PER_PAGE = 200
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, sha):
+        return os.path.join(self.cache_dir, f"{sha}.json")
+
+    def pages(self, pdf_path, sha=None):
+        """
+        Return the page texts of pdf_path, extracting and caching them on
+        first use.
+        """
+        sha = sha or file_sha256(pdf_path)
+        path = self._path(sha)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("extractor") == EXTRACTOR_VERSION:
+                return entry["pages"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        pages = extract_pages(pdf_path)
+        entry = {
+            "extractor": EXTRACTOR_VERSION,
+            "source": os.path.basename(pdf_path),
+            "pages": pages,
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # unique per process and thread: verify-quotes extracts in worker
+        # processes, whose thread idents can coincide
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return pages
+
+    def text(self, pdf_path, sha=None, page_numbers=None):
+        """
+        Return the paper (or the given 1-based pages) as one text
+        payload, or None if the PDF has (almost) no text layer and must
+        be sent as a file instead.
+        """
+        pages = self.pages(pdf_path, sha)
+        n_chars = sum(len(p) for p in pages)
+        if not pages or n_chars < self.MIN_CHARS_PER_PAGE * len(pages) / 2:
+            return None
+        return pages_to_text(pages, page_numbers)
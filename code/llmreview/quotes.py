@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from llmreview.columnar import csv_section_name, read_section
+from llmreview.pdftext import PdfTextCache
+
+# words per shingle in the paper index; quotes shorter than this are
+# not checked (they are usually category names, not evidence)
+NGRAM_WORDS = 4
+
+# share of a quote's shingles that must occur in the paper
+VERIFY_THRESHOLD = 0.8
+
+_DOUBLE_QUOTED = re.compile(r"[\"“”„]([^\"“”„]+)[\"“”„]")
+_CURLY_SINGLE_QUOTED = re.compile(r"‘([^‘’]+?)’(?!\w)")
+# a straight single quote opens after a non-word character and closes
+# before one, so apostrophes ("study's") are not taken as quote marks
+_SINGLE_QUOTED = re.compile(r"(?<!\w)'([^']+?)'(?!\w)")
+_ELLIPSIS = re.compile(r"\.\s*\.\s*\.|…|\[[^\]]*\]")
+_WORD_BREAK = re.compile(r"(?<=\w)[-\u00ad\u2010\u2011]\s*(?=\w)")
+_WORD = re.compile(r"\w+")
+
+
+# ----------------------------------------------------------
+# normalized text and the per-paper shingle index
+# ----------------------------------------------------------
+def normalize_words(text):
+    """
+    Word tokens of text for matching: ligatures and other compatibility
+    characters expanded (NFKD), accents dropped, case folded, and
+    hyphenated words joined, so "envi-\\nronment", "environ- ment" and
+    "multi-family" match "environment" and "multifamily" on both sides.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return _WORD.findall(_WORD_BREAK.sub("", text))
+
+
+def shingles(words, n=NGRAM_WORDS):
+    return [tuple(words[i:i + n]) for i in range(len(words) - n + 1)]
+
+
+class QuoteIndex:
+    """
+    The set of word n-grams of one paper's extracted text, built once
+    and shared by every quote of every section and round of the paper.
+    score(quote) is the share of the quote's n-grams found in the paper,
+    so a line break, a running header or a dropped word inside a long
+    quote costs a few n-grams instead of failing the match.
+    """
+
+    def __init__(self, pages, n=NGRAM_WORDS):
+        self.n = n
+        self.grams = set(shingles(normalize_words("\n".join(pages)), n))
+
+    def score(self, quote):
+        grams = shingles(normalize_words(quote), self.n)
+        if not grams:
+            return None
+        return sum(g in self.grams for g in grams) / len(grams)
+
+
+def extract_quotes(detail, min_words=NGRAM_WORDS):
+    """
+    Quoted spans of a *_Detail text (double, curly or straight single
+    quotes), split at ellipses and bracketed insertions into fragments
+    of at least min_words words. Returns a list of fragments.
+    """
+    if not isinstance(detail, str):
+        return []
+    spans = _DOUBLE_QUOTED.findall(detail)
+    rest = _DOUBLE_QUOTED.sub(" ", detail)
+    spans += _CURLY_SINGLE_QUOTED.findall(rest)
+    spans += _SINGLE_QUOTED.findall(_CURLY_SINGLE_QUOTED.sub(" ", rest))
+    fragments = []
+    for span in spans:
+        for part in _ELLIPSIS.split(span):
+            if len(normalize_words(part)) >= min_words:
+                fragments.append(part.strip())
+    return fragments
+
+
+# ----------------------------------------------------------
+# per-paper verification (runs in a worker process)
+# ----------------------------------------------------------
+def verify_paper(job):
+    """
+    Verify the quotes of one paper. job is (pdf_path, text_cache_dir,
+    threshold, cells) with cells a list of (round, section, field,
+    detail text). Returns one row per cell with the number of quotes,
+    how many were found, the lowest score, the worst quote and a status:
+    verified, partial, unverified, no_quote, no_text (scan) or
+    missing_pdf.
+    """
+    pdf_path, text_cache_dir, threshold, cells = job
+    file_name = os.path.basename(pdf_path)
+    index, paper_status = None, None
+    if not os.path.exists(pdf_path):
+        paper_status = "missing_pdf"
+    else:
+        try:
+            pages = PdfTextCache(text_cache_dir).pages(pdf_path)
+        except Exception as e:
+            print(f"Text extraction failed for {file_name}: {e}")
+            pages = []
+        index = QuoteIndex(pages)
+        if not index.grams:
+            paper_status = "no_text"
+
+    rows = []
+    for round_name, section, field, detail in cells:
+        quotes = extract_quotes(detail)
+        row = {"round": round_name, "section": section, "File_Name": file_name, "field": field,
+               "quotes": len(quotes), "verified": 0, "min_score": float("nan"), "worst_quote": ""}
+        if not quotes:
+            row["status"] = "no_quote"
+        elif paper_status is not None:
+            row["status"] = paper_status
+        else:
+            scores = [index.score(q) for q in quotes]
+            worst = min(range(len(quotes)), key=lambda i: scores[i])
+            row["verified"] = sum(s >= threshold for s in scores)
+            row["min_score"] = scores[worst]
+            if row["verified"] < len(quotes):
+                row["worst_quote"] = quotes[worst][:200]
+            if row["verified"] == len(quotes):
+                row["status"] = "verified"
+            else:
+                row["status"] = "partial" if row["verified"] else "unverified"
+        rows.append(row)
+    return rows
+
+
+# ----------------------------------------------------------
+# corpus x rounds
+# ----------------------------------------------------------
+def round_label(path):
+    """
+    Round label from a section CSV name (..._r35.csv -> "r35"), else the
+    file name.
+    """
+    match = re.search(r"_(r\d+)", os.path.basename(path))
+    return match.group(1) if match else os.path.splitext(os.path.basename(path))[0]
+
+
+def verify_quotes(section_csvs, pdf_dir, text_cache_dir, processes=None, threshold=VERIFY_THRESHOLD):
+    """
+    Check every quote in the *_Detail fields of the given section CSVs
+    ({(round, section): path}; the Arrow copy is used when current)
+    against the papers' extracted text. Work is grouped by paper, so
+    each paper's text is read and indexed once for all its sections and
+    rounds, and papers are spread over processes (None = one per CPU,
+    1 = in this process). Returns one row per (round, section, paper,
+    field), grouped by paper.
+    """
+    cells = {}
+    for (round_name, section), path in section_csvs.items():
+        df = read_section(path)
+        detail_fields = [c for c in df.columns if c.endswith("_Detail")]
+        for record in df[["File_Name"] + detail_fields].itertuples(index=False):
+            file_name = str(record[0])
+            for field, detail in zip(detail_fields, record[1:]):
+                cells.setdefault(file_name, []).append((round_name, section, field, detail))
+    jobs = [(os.path.join(pdf_dir, name), text_cache_dir, threshold, paper_cells)
+            for name, paper_cells in cells.items()]
+
+    if processes == 1 or len(jobs) <= 1:
+        results = [verify_paper(job) for job in jobs]
+    else:
+        processes = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(verify_paper, jobs, chunksize=max(1, len(jobs) // (processes * 4))))
+    return pd.DataFrame([row for rows in results for row in rows])
+
+
+def summarize_quotes(table):
+    """
+    Per round and section: fields with checkable quotes, and how many of
+    them were verified, partly verified and not found, with the share of
+    all quotes found.
+    """
+    rows = []
+    for (round_name, section), g in table.groupby(["round", "section"], sort=False):
+        checked = g[g["status"].isin(["verified", "partial", "unverified"])]
+        rows.append({
+            "round": round_name,
+            "section": section,
+            "fields_with_quotes": int((g["quotes"] > 0).sum()),
+            "verified": int((checked["status"] == "verified").sum()),
+            "partial": int((checked["status"] == "partial").sum()),
+            "unverified": int((checked["status"] == "unverified").sum()),
+            "no_text": int(g["status"].isin(["no_text", "missing_pdf"]).sum()),
+            "quotes_found": checked["verified"].sum() / max(checked["quotes"].sum(), 1),
+        })
+    return pd.DataFrame(rows)
+
+
+def section_csvs_from_paths(paths):
+    """
+    {(round, section): path} for CSV paths given as path or label=path,
+    the section taken from the file name (sectionC).
+    """
+    out = {}
+    for item in paths:
+        label, _, path = item.rpartition("=")
+        section = csv_section_name(path)
+        if section is None:
+            raise ValueError(f"{path}: cannot tell the section from the file name")
+        out[(label or round_label(path), section)] = path
+    return out
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+import random
+import re
+import threading
+import time
+
+# HTTP codes worth retrying: timeouts, quota (429) and server errors
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+
+# ----------------------------------------------------------
+# token bucket
+# ----------------------------------------------------------
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute, holding at
+    most one minute of budget. acquire() blocks until the requested
+    amount is available. debit() charges a cost that is only known after
+    the call (e.g. tokens used); the balance may go negative, which makes
+    the next acquire() wait until the overdraft is paid back.
+    """
+
+    def __init__(self, rate_per_minute):
+        self.rate_per_minute = float(rate_per_minute)
+        self.capacity = float(rate_per_minute)
+        self._balance = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._balance = min(
+            self.capacity,
+            self._balance + (now - self._updated) * self.rate_per_minute / 60.0,
+        )
+        self._updated = now
+
+    def acquire(self, amount=1.0):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._balance >= amount:
+                    self._balance -= amount
+                    return
+                wait = (amount - self._balance) * 60.0 / self.rate_per_minute
+            time.sleep(min(wait, 5.0))
+
+    def debit(self, amount):
+        with self._lock:
+            self._refill()
+            self._balance -= amount
+
+    def set_rate(self, rate_per_minute):
+        with self._lock:
+            self._refill()
+            self.rate_per_minute = float(rate_per_minute)
+
+
+# ----------------------------------------------------------
+# error classification and backoff
+# ----------------------------------------------------------
+def error_code(error):
+    """
+    HTTP status code of an API error, or None for other exceptions.
+    """
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error):
+    """
+    True for quota, timeout and server errors and for network failures.
+    """
+    code = error_code(error)
+    if code is not None:
+        return code in RETRYABLE_CODES
+    return isinstance(error, (ConnectionError, TimeoutError)) or \
+        type(error).__name__ in {"ConnectError", "ReadTimeout", "RemoteProtocolError", "ReadError"}
+
+
+def retry_after_seconds(error):
+    """
+    Delay requested by the server, from a Retry-After header or from a
+    google.rpc.RetryInfo "retryDelay" (e.g. "17s") in the error body.
+    Returns None if the server did not ask for a specific delay.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    match = re.search(r"retryDelay'?\"?\s*:\s*'?\"?([\d.]+)s", str(getattr(error, "details", "")))
+    if match:
+        return float(match.group(1))
+    return None
+
+
+def backoff_seconds(attempt, base=2.0, cap=60.0):
+    """
+    Exponential backoff with full jitter for the given retry attempt
+    (0 for the first retry).
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+# ----------------------------------------------------------
+# rate limited client wrapper
+# ----------------------------------------------------------
+class RateLimiter:
+    """
+    Pacing for generate_content: a request bucket and a token bucket
+    sized to the account quota. On a 429 the request rate is halved;
+    each success afterwards raises it again step by step, up to the
+    configured ceiling.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute=None):
+        self.max_rpm = float(requests_per_minute)
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        if self.tokens is not None:
+            self.tokens.acquire(0)
+        self.requests.acquire(1)
+
+    def after_call(self, total_tokens):
+        if self.tokens is not None and total_tokens:
+            self.tokens.debit(total_tokens)
+        with self._lock:
+            rpm = self.requests.rate_per_minute
+            if rpm < self.max_rpm:
+                self.requests.set_rate(min(self.max_rpm, rpm + self.max_rpm * 0.05))
+
+    def on_throttled(self):
+        with self._lock:
+            rpm = self.requests.rate_per_minute
+            self.requests.set_rate(max(1.0, rpm / 2))
+            print(f"Rate limited; pacing down to {self.requests.rate_per_minute:.0f} requests/min")
+
+
+class _Models:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def generate_content(self, **kwargs):
+        owner = self._owner
+        limiter = owner.limiter
+
+        def call():
+            limiter.before_call()
+            response = owner.client.models.generate_content(**kwargs)
+            usage = getattr(response, "usage_metadata", None)
+            limiter.after_call(getattr(usage, "total_token_count", None) or 0)
+            return response
+
+        return owner.call_with_retry(call)
+
+    def generate_content_stream(self, **kwargs):
+        """
+        Paced and retried like generate_content up to the first chunk
+        (the request is sent when the stream is first read); errors
+        after that reach the caller. Tokens are charged when the stream
+        ends or is closed.
+        """
+        owner = self._owner
+        limiter = owner.limiter
+
+        def open_stream():
+            limiter.before_call()
+            stream = iter(owner.client.models.generate_content_stream(**kwargs))
+            return stream, next(stream, None)
+
+        stream, first = owner.call_with_retry(open_stream)
+        return self._relay(stream, first)
+
+    def _relay(self, stream, first):
+        usage = None
+        try:
+            if first is None:
+                return
+            usage = getattr(first, "usage_metadata", None)
+            yield first
+            for chunk in stream:
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                yield chunk
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+            self._owner.limiter.after_call(getattr(usage, "total_token_count", None) or 0)
+
+    def __getattr__(self, name):
+        return getattr(self._owner.client.models, name)
+
+
+class _Files:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def upload(self, **kwargs):
+        return self._owner.call_with_retry(lambda: self._owner.client.files.upload(**kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._owner.client.files, name)
+
+
+class _Caches:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, **kwargs):
+        return self._owner.call_with_retry(lambda: self._owner.client.caches.create(**kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self._owner.client.caches, name)
+
+
+class RateLimitedClient:
+    """
+    Drop-in wrapper around genai.Client for the calls the extraction
+    scripts make. models.generate_content (and generate_content_stream)
+    is paced by a RateLimiter, and it, files.upload and caches.create
+    are retried on 429/5xx and network errors with exponential backoff
+    and jitter, honoring the server's retry delay.
+    Everything else is passed through to the wrapped client.
+    last_retries (per thread) holds the retry count of the latest call.
+    """
+
+    def __init__(self, client, requests_per_minute, tokens_per_minute=None, max_retries=5):
+        self.client = client
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_retries = max_retries
+        self.models = _Models(self)
+        self.files = _Files(self)
+        self.caches = _Caches(self)
+        self._local = threading.local()
+
+    @property
+    def last_retries(self):
+        return getattr(self._local, "retries", 0)
+
+    def call_with_retry(self, call):
+        attempt = 0
+        while True:
+            try:
+                self._local.retries = attempt
+                return call()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                if error_code(e) == 429:
+                    self.limiter.on_throttled()
+                delay = retry_after_seconds(e)
+                if delay is None:
+                    delay = backoff_seconds(attempt)
+                print(f"Retrying in {delay:.1f} sec after error: {str(e)[:200]}")
+                time.sleep(delay)
+                attempt += 1
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+import itertools
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from llmreview.agreement import comparable_fields
+from llmreview.coding import multi_select_fields, one_hot_cells
+from llmreview.columnar import read_section
+from llmreview.dedup import canonical_rows
+from llmreview.specs import get_spec
+
+
+# ----------------------------------------------------------
+# agreement statistics on rating tensors
+# ----------------------------------------------------------
+# Every statistic takes ratings as a boolean one-hot tensor Y of shape
+# (items, units, raters, categories): items are fields or categories
+# scored in one batch, units are papers, raters are rounds (or human
+# coders). A rater who did not code a unit has an all-False row there.
+def _nan_divide(a, b):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(b != 0, a / np.where(b != 0, b, 1), np.nan)
+
+
+def percent_agreement(y):
+    """
+    Share of units (coded by at least two raters) on which all raters
+    who coded it chose the same category, per item.
+    """
+    counts = y.sum(axis=2)
+    m = counts.sum(axis=-1)
+    usable = m >= 2
+    agree = (counts.max(axis=-1) == m) & usable
+    return _nan_divide(agree.sum(axis=-1), usable.sum(axis=-1))
+
+
+def cohen_kappa(y):
+    """
+    Cohen's kappa for every pair of raters, on the units both coded.
+    Returns (items, pairs) and the list of rater pairs.
+    """
+    pairs = list(itertools.combinations(range(y.shape[2]), 2))
+    coded = y.any(axis=-1)
+    out = np.full((y.shape[0], len(pairs)), np.nan)
+    for k, (a, b) in enumerate(pairs):
+        both = (coded[:, :, a] & coded[:, :, b])[..., None]
+        n = both.sum(axis=1)[:, 0]
+        ya, yb = y[:, :, a] & both, y[:, :, b] & both
+        observed = _nan_divide((ya & yb).any(axis=-1).sum(axis=1), n)
+        pa = _nan_divide(ya.sum(axis=1), n[:, None])
+        pb = _nan_divide(yb.sum(axis=1), n[:, None])
+        expected = (pa * pb).sum(axis=-1)
+        out[:, k] = _nan_divide(observed - expected, 1 - expected)
+    return out, pairs
+
+
+def fleiss_kappa(y):
+    """
+    Fleiss' kappa per item, over the units coded by every rater.
+    """
+    counts = y.sum(axis=2).astype(float)
+    m = y.shape[2]
+    complete = counts.sum(axis=-1) == m
+    n_units = complete.sum(axis=-1)
+    counts = counts * complete[..., None]
+    p_unit = (np.square(counts).sum(axis=-1) - m) / (m * (m - 1))
+    p_bar = _nan_divide((p_unit * complete).sum(axis=-1), n_units)
+    p_cat = _nan_divide(counts.sum(axis=1), (n_units * m)[:, None])
+    p_e = np.square(p_cat).sum(axis=-1)
+    return _nan_divide(p_bar - p_e, 1 - p_e)
+
+
+def krippendorff_alpha(y):
+    """
+    Krippendorff's alpha for nominal data per item, from the coincidence
+    matrix of the units coded by two or more raters (missing codings
+    allowed).
+    """
+    counts = y.sum(axis=2).astype(float)
+    m = counts.sum(axis=-1)
+    weight = _nan_divide(np.ones_like(m), m - 1)
+    weight = np.where(m >= 2, weight, 0.0)
+    weighted = counts * weight[..., None]
+    coincidence = np.einsum("iuc,iuk->ick", weighted, counts)
+    diagonal = weighted.sum(axis=1)
+    coincidence -= np.einsum("ic,ck->ick", diagonal, np.eye(counts.shape[-1]))
+    n_c = coincidence.sum(axis=-1)
+    n = n_c.sum(axis=-1)
+    disagreement = n - np.trace(coincidence, axis1=1, axis2=2)
+    expected = np.square(n) - np.square(n_c).sum(axis=-1)
+    return 1 - _nan_divide((n - 1) * disagreement, expected)
+
+
+def category_jaccard(x, rated):
+    """
+    Jaccard index between every pair of raters of the sets of units
+    coded with a category, over the units both rated, averaged over
+    pairs. x is a boolean (categories, units, raters) matrix of "unit
+    coded with category", rated a (units, raters) mask.
+    """
+    values = []
+    for a, b in itertools.combinations(range(x.shape[2]), 2):
+        both = (rated[:, a] & rated[:, b])[None]
+        xa, xb = x[:, :, a] & both, x[:, :, b] & both
+        values.append(_nan_divide((xa & xb).sum(axis=1), (xa | xb).sum(axis=1)))
+    return np.nanmean(np.vstack(values), axis=0) if values else np.full(x.shape[0], np.nan)
+
+
+# ----------------------------------------------------------
+# rounds of a section -> rating tensors
+# ----------------------------------------------------------
+def _norm(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # an int column with gaps reads back as float (2020.0)
+        value = int(value)
+    text = " ".join(str(value).split()).lower()
+    return text or None
+
+
+def load_rounds(round_csvs):
+    """
+    Read {round label: section CSV} (Arrow copies are used when
+    current) and align them on File_Name. Returns the paper index and
+    {label: DataFrame reindexed to it}; a paper missing from a round is
+    an all-NaN row there. Rows of duplicate PDFs are left out.
+    """
+    frames = {}
+    for label, path in round_csvs.items():
+        df = canonical_rows(read_section(path)).drop_duplicates("File_Name")
+        df.index = df["File_Name"].astype(str)
+        frames[label] = df
+    papers = pd.Index(pd.unique(np.concatenate([df.index.to_numpy() for df in frames.values()])))
+    return papers, {label: df.reindex(papers) for label, df in frames.items()}
+
+
+def _scalar_ratings(frames, field):
+    """
+    One-hot (1, units, raters, categories) tensor of a single-value
+    field, categories being the normalized values seen in any round.
+    """
+    n_units = len(next(iter(frames.values())))
+    values = np.empty((n_units, len(frames)), dtype=object)
+    for r, df in enumerate(frames.values()):
+        cells = df[field] if field in df else [None] * n_units
+        values[:, r] = [_norm(v) for v in cells]
+    codes, categories = pd.factorize(values.ravel())
+    codes = codes.reshape(values.shape)
+    y = np.zeros(values.shape + (max(len(categories), 1),), dtype=bool)
+    units, raters = np.nonzero(codes >= 0)
+    y[units, raters, codes[units, raters]] = True
+    return y[None]
+
+
+def _multi_select_ratings(frames, field, categories):
+    """
+    Per-category binary tensor (categories, units, raters, 2) of a
+    multi-select field ([not coded, coded]), the (categories, units,
+    raters) matrix of positive codings and the (units, raters) mask of
+    cells that were coded at all.
+    """
+    n_units = len(next(iter(frames.values())))
+    coded = np.zeros((len(categories), n_units, len(frames)), dtype=bool)
+    rated = np.zeros((n_units, len(frames)), dtype=bool)
+    for r, df in enumerate(frames.values()):
+        cells = df[field] if field in df else pd.Series([np.nan] * n_units)
+        block, _ = one_hot_cells(cells.tolist(), categories)
+        coded[:, :, r] = block.T
+        rated[:, r] = [isinstance(v, (list, tuple, str)) for v in cells]
+    positive = coded & rated[None]
+    y = np.stack([~coded & rated[None], positive], axis=-1)
+    return y, positive, rated
+
+
+def section_reliability(section, round_csvs):
+    """
+    Agreement between rounds (or between rounds and human coders) of one
+    section: one row per coded single-value field and one per category
+    of each multi-select field, with the number of papers coded by 2+
+    rounds, percent agreement, mean pairwise Cohen's kappa, Fleiss'
+    kappa, Krippendorff's alpha (nominal) and, for categories, the mean
+    pairwise Jaccard index of the papers coded with it.
+    """
+    schema = get_spec(section).schema
+    papers, frames = load_rounds(round_csvs)
+    multi = multi_select_fields(schema)
+    rows = []
+
+    def add_rows(y, labels, jaccard=None):
+        kappas, _ = cohen_kappa(y)
+        stats = {
+            "papers": (y.any(axis=-1).sum(axis=2) >= 2).sum(axis=1),
+            "percent_agreement": percent_agreement(y),
+            "cohen_kappa": np.nanmean(kappas, axis=1) if kappas.size else np.full(len(labels), np.nan),
+            "fleiss_kappa": fleiss_kappa(y),
+            "krippendorff_alpha": krippendorff_alpha(y),
+            "jaccard": jaccard if jaccard is not None else np.full(len(labels), np.nan),
+        }
+        for i, (field, category) in enumerate(labels):
+            rows.append({"section": section, "field": field, "category": category,
+                         **{k: v[i] for k, v in stats.items()}})
+
+    # all-NaN means (e.g. a category no round ever coded) are expected
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for field, is_multi in comparable_fields(schema).items():
+            if is_multi and field in multi:
+                y, positive, rated = _multi_select_ratings(frames, field, multi[field])
+                add_rows(y, [(field, c) for c in multi[field]], category_jaccard(positive, rated))
+            elif not is_multi:
+                add_rows(_scalar_ratings(frames, field), [(field, "")])
+    out = pd.DataFrame(rows)
+    out.attrs["rounds"] = list(round_csvs)
+    out.attrs["papers"] = len(papers)
+    return out
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import threading
+import time
+
+# set LLMREVIEW_NO_CACHE=1 to bypass the cache without editing a script
+BYPASS_ENV = "LLMREVIEW_NO_CACHE"
+
+
+def schema_fingerprint(schema):
+    """
+    Stable JSON text of a types.Schema (or a plain dict), used in cache keys.
+    """
+    if hasattr(schema, "model_dump"):
+        schema = schema.model_dump(mode="json", exclude_none=True)
+    return json.dumps(schema, sort_keys=True, ensure_ascii=False)
+
+
+def request_key(pdf_sha, prompt_parts, schema, model, temperature):
+    """
+    Hash of everything that determines a generate_content answer: the PDF
+    bytes (by hash), the text parts in order, the response schema, the
+    model name and the temperature.
+    """
+    payload = json.dumps({
+        "pdf": pdf_sha,
+        "prompt": list(prompt_parts),
+        "schema": schema_fingerprint(schema),
+        "model": model,
+        "temperature": temperature,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------
+# on-disk response cache
+# ----------------------------------------------------------
+class ResponseCache:
+    """
+    Content-addressed cache of raw model responses, one JSON blob per
+    request under cache_dir/<key[:2]>/<key>.json. Hits refresh the file's
+    mtime, and once the directory grows past max_bytes the least recently
+    used blobs are evicted. With enabled=False (or LLMREVIEW_NO_CACHE=1)
+    get() always misses and put() stores nothing.
+    """
+
+    def __init__(self, cache_dir, max_bytes=500 * 1024 * 1024, enabled=True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled and os.environ.get(BYPASS_ENV, "") in ("", "0")
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """
+        Return the cached raw response text for key, or None.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry.get("raw_text")
+
+    def put(self, key, raw_text, **meta):
+        """
+        Store a raw response text under key (atomically), then evict old
+        entries if the cache is over its size limit.
+        """
+        if not self.enabled or raw_text is None:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"raw_text": raw_text, "created": time.time(), **meta}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += os.path.getsize(path)
+            self._evict_if_needed()
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _evict_if_needed(self):
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        if self._total_bytes <= self.max_bytes:
+            return
+        entries = sorted(self._entries())
+        self._total_bytes = sum(size for _, size, _ in entries)
+        # evict down to 90% so we do not rescan on every put
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+                self._total_bytes -= size
+            except OSError:
+                pass
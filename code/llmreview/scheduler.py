@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from llmreview.checkpoint import CheckpointJournal
+from llmreview.corpus import drop_replaced, files_to_replace, work_set
+from llmreview.dedup import dedup_work_set, drop_stale_aliases, with_aliases
+from llmreview.engine import Runtime, cascade_summary_lines, consensus_summary_lines, load_context_index, process_paper
+from llmreview.specs import SECTION_NAMES, get_spec
+
+
+def as_csv_row(row):
+    """
+    The row as it reads back from the section CSV (lists as their repr
+    text, "NA" and blanks as NaN), so a context built from a fresh
+    result is identical to one built from the saved CSV.
+    """
+    buffer = io.StringIO(pd.DataFrame([row]).to_csv(index=False))
+    return pd.read_csv(buffer).iloc[0].to_dict()
+
+
+# ----------------------------------------------------------
+# per-paper dependency scheduler
+# ----------------------------------------------------------
+def run_dag(runtime, specs, output_csvs):
+    """
+    Run several sections over the configured PDF list as one graph of
+    (section, paper) tasks sharing a single pool of max_workers slots.
+    Independent sections start at once; a dependent section's task for
+    a paper (E) is submitted the moment that paper's dependency row (C)
+    is committed to its checkpoint, so the stages overlap instead of
+    waiting for the whole dependency round. Dependencies that are not
+    part of this run are read from their CSV as before. Papers already
+    in a section's CSV are skipped, failed tasks are re-queued up to
+    requeue_rounds times, and each section's CSV is written in list
+    order at the end. Return {section: DataFrame}.
+    """
+    config = runtime.config
+    all_files = work_set(config)
+    pdf_files, aliases = dedup_work_set(config, all_files)
+    total_files = len(pdf_files)
+
+    checkpoints = {name: CheckpointJournal(output_csvs[name], specs[name].schema, config.columnar_formats)
+                   for name in specs}
+    replace = files_to_replace(config, all_files)
+    rows = {name: drop_replaced(drop_stale_aliases(checkpoints[name].load(), aliases), replace) for name in specs}
+    committed = {name: {} for name in specs}
+    for name in specs:
+        for row in rows[name]:
+            committed[name].setdefault(str(row.get("File_Name")), row)
+
+    # context for dependencies outside this run comes from their CSV
+    external_context = {}
+    for name, spec in specs.items():
+        if spec.depends_on and spec.depends_on[0] not in specs:
+            external_context[name] = load_context_index(spec, config)
+
+    def context_for(spec, fname):
+        if not spec.depends_on:
+            return None
+        dep = spec.depends_on[0]
+        if dep in specs:
+            return spec.build_context(as_csv_row(committed[dep][fname]))
+        return external_context[spec.name].get(fname)
+
+    def ready(spec, fname):
+        return all(fname in committed[dep] for dep in spec.depends_on if dep in specs)
+
+    print(f"\nSections {', '.join(specs)}: {total_files} PDF files specified for processing")
+    # Sections other sections wait on go first (they are on the critical
+    # path), then dependent sections, then the independent rest; within a
+    # section, papers keep list order.
+    providers = {dep for spec in specs.values() for dep in spec.depends_on}
+
+    def priority(name):
+        if name in providers:
+            return 0
+        return 1 if specs[name].depends_on else 2
+
+    waiting = []
+    for name in sorted(specs, key=priority):
+        for fname in pdf_files:
+            if fname in committed[name]:
+                continue
+            waiting.append((name, fname))
+    n_tasks = len(waiting)
+    print(f"Running {n_tasks} section tasks with up to {config.max_workers} in flight")
+
+    attempts = {}
+    first_start = {}
+    last_finish = {}
+    batch_start = time.time()
+
+    def run_task(name, fname):
+        spec = specs[name]
+        first_start.setdefault(name, time.time() - batch_start)
+        fpath = os.path.join(config.pdf_dir, fname)
+        return process_paper(runtime, spec, fpath, context_for(spec, fname))
+
+    max_workers = max(1, config.max_workers or 1)
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight = {}
+
+    def submit_ready():
+        # only fill free slots, so a task that becomes ready later (E after
+        # its C row) is not stuck behind a long queue of independent tasks
+        for task in list(waiting):
+            if len(in_flight) >= max_workers:
+                break
+            name, fname = task
+            if ready(specs[name], fname):
+                waiting.remove(task)
+                attempts[task] = attempts.get(task, 0) + 1
+                in_flight[pool.submit(run_task, name, fname)] = task
+
+    n_done = 0
+    try:
+        submit_ready()
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, fname = in_flight.pop(future)
+                result_dict, elapsed = future.result()
+                if result_dict is None and attempts[(name, fname)] <= config.requeue_rounds:
+                    print(f"Re-queuing Section {name} for {fname}")
+                    waiting.append((name, fname))
+                    continue
+
+                if result_dict is None:
+                    result_dict = {
+                        "File_Name": fname,
+                        "ERROR": "failed_to_extract"
+                    }
+                rows[name].append(result_dict)
+                committed[name][fname] = result_dict
+                # Append checkpoint after each task
+                checkpoints[name].append(result_dict)
+                last_finish[name] = time.time() - batch_start
+                n_done += 1
+                timing = f"in {elapsed:.2f} seconds" if elapsed is not None else "with no timing captured"
+                status = "Finished" if "ERROR" not in result_dict else "Failed"
+                print(f"[{n_done}/{n_tasks}] {status} Section {name} for {fname} {timing}")
+            submit_ready()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    # tasks whose dependency never got a row (e.g. the paper was skipped)
+    for name, fname in waiting:
+        print(f"Section {name} for {fname} not run: no Section {specs[name].depends_on[0]} row")
+
+    # Final save: compact each journal into its CSV once, in list order
+    order = {f: i for i, f in enumerate(all_files)}
+    dfs = {
+        name: checkpoints[name].compact(
+            sorted(with_aliases(rows[name], aliases), key=lambda r: order.get(str(r.get("File_Name")), -1)))
+        for name in specs
+    }
+
+    print("\nProcessing summary")
+    print(f"Total files in folder  {total_files}")
+    for name, df in dfs.items():
+        span = ""
+        if name in first_start:
+            span = f"  active {first_start[name]:.1f}-{last_finish.get(name, 0):.1f} sec"
+        print(f"Section {name:<3} rows      {len(df)}  saved to {output_csvs[name]}{span}")
+    print(f"Total wall clock time  {time.time() - batch_start:.2f} sec")
+    for line in runtime.summary_lines():
+        print(line)
+    for name, df in dfs.items():
+        for line in cascade_summary_lines(config, df) + consensus_summary_lines(config, df):
+            print(f"Section {name:<3} {line}")
+    return dfs
+
+
+def dependency_order(names):
+    """
+    Section names in run order (dependencies first), duplicates removed.
+    """
+    requested = [get_spec(n).name for n in names]
+    return [n for n in SECTION_NAMES if n in requested]
+
+
+def run_sections(names, config, output_csvs=None, client=None):
+    """
+    Run the named sections together through run_dag with one Runtime.
+    output_csvs maps a section to its output path; missing sections use
+    the spec's default. Return {section: DataFrame}.
+    """
+    specs = {name: get_spec(name) for name in dependency_order(names)}
+    output_csvs = {name: (output_csvs or {}).get(name) or spec.output_csv for name, spec in specs.items()}
+    runtime = Runtime(config, client=client)
+    try:
+        return run_dag(runtime, specs, output_csvs)
+    finally:
+        runtime.close()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from dataclasses import dataclass, field
+
+
+# ----------------------------------------------------------
+# declarative section spec
+# ----------------------------------------------------------
+@dataclass(frozen=True)
+class SectionSpec:
+    """
+    Everything the engine needs to run one coding section.
+
+    name          section id ("AB", "C", "D", "E")
+    title         human-readable section title
+    prompt        instruction text sent before the paper
+    schema        types.Schema for the JSON response
+    output_csv    default output path for the section's round
+    depends_on    sections whose rows this section reads as context
+    context_csv   default CSV holding the dependency's rows
+    build_context        callable(dependency row) -> context text
+    build_context_index  callable(DataFrame) -> {File_Name: context text}
+    missing_context      context text used when a paper has no dependency row
+    page_scope    pages the section may be coded from ("methods_results");
+                  None = full paper
+    """
+    name: str
+    title: str
+    prompt: str
+    schema: object
+    output_csv: str
+    depends_on: tuple = ()
+    context_csv: str = None
+    build_context: object = field(default=None, compare=False)
+    build_context_index: object = field(default=None, compare=False)
+    missing_context: str = None
+    page_scope: str = None
+
+    def text_parts(self, context_text=None):
+        """
+        Text parts of the request, in order: the prompt, then (for
+        dependent sections) the context summary of this paper.
+        """
+        parts = [self.prompt]
+        if self.depends_on:
+            parts.append(context_text if context_text is not None else self.missing_context)
+        return parts
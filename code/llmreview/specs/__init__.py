@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+Registry of section specs, in run order.
+"""
+from llmreview.specs import ab, c, d, e
+
+SPECS = {spec.name: spec for spec in [ab.SPEC, c.SPEC, d.SPEC, e.SPEC]}
+
+SECTION_NAMES = list(SPECS)
+
+
+def get_spec(name):
+    """
+    Return the SectionSpec for a section name (case-insensitive).
+    """
+    key = str(name).upper()
+    if key not in SPECS:
+        raise KeyError(f"Unknown section {name!r}; expected one of {', '.join(SECTION_NAMES)}")
+    return SPECS[key]
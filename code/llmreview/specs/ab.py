@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Section AB (Study characteristics and methods): prompt and response schema.
+"""
+from google.genai import types
+
+from llmreview.spec import SectionSpec
+
+PROMPT_TEXT = """
+You are assisting a systematic literature review.
+Use only the attached PDF to fill the required metadata fields.
+For explanations, use direct quotes from the article whenever possible, rather than rephrasing them in your own words.
+Do not use any external information or guesses.
+"""
+
+# ----------------------------------------------------------
+# Response schema
+# ----------------------------------------------------------
+schema = types.Schema(
+    type="object",
+    properties={
+        "Title": types.Schema(
+            type="string",
+            description="Title of the study."
+        ),
+        "Lead_Author": types.Schema(
+            type="string",
+            description=(
+                "Name of the first (lead) author of the study, formatted as 'Last Name, First Name'. "
+                "If a middle name or initial is present, include it between the first and last name, e.g., 'Smith, John A.'."
+            )
+        ),
+        "Year": types.Schema(
+            type="integer",
+            description="Year that the study was published."
+        ),
+        "Journal": types.Schema(
+            type="string",
+            description="Name of the journal where the study was published."
+        ),
+        "Country": types.Schema(
+            type="string",
+            description=(
+                "Country or countries where parks or greenspaces are located. "
+                "Use standardized full country names in English (e.g., 'United States', 'France'). "
+                "If multiple countries are listed, separate them with semicolons. "
+                "If not explicitly reported, write 'Not reported'."
+            )
+        ),
+        "Country_ISO3": types.Schema(
+            type="string",
+            description=(
+                "Provide the corresponding ISO 3166-1 alpha-3 code(s) for the country names above. "
+                "For example, 'United States' → 'USA', 'South Korea' → 'KOR', 'France' → 'FRA'. "
+                "If multiple countries are listed, separate codes with semicolons in the same order. "
+                "If the country is 'Not reported', write 'Not reported'."
+            )
+        ),
+        "City": types.Schema(
+            type="string",
+            description="City or cities where parks are located. If there are multiple cities, separate them with semicolons."
+        ),
+        "Spatial_Scale_of_Analysis": types.Schema(
+            type="string",
+            enum=[
+                "Single greenspace/park",
+                "Multiple greenspaces/parks",
+                "Entire network or system"
+            ],
+            description=(
+                "Spatial scope at which park or greenspace quality is examined. Choose one of the following categories:"
+                "Single greenspace/park"
+                "Multiple greenspaces/parks: two or more parks within a defined area such as a neighborhood or city"
+                "Entire network or system: all greenspaces/parks across a metropolitan area"
+            )
+        ),
+        "Number_of_Parks": types.Schema(
+            any_of=[
+                types.Schema(type="integer"),
+                types.Schema(type="string", enum=["Not reported"])
+            ],
+            description=(
+                "How many distinct park or greenspace units were included in the study analysis. "
+                "Enter a numeric value. Use 'Not reported' if the number of parks is not specified in the study."
+            )
+        ),
+        "Spatial_Scale_Detail": types.Schema(
+            type="string",
+            description="Provide justification for why the Spatial_Scale_of_Analysis and Number_of_Parks categories were chosen."
+        ),
+        "Article_Type": types.Schema(
+            type="string",
+            enum=[
+                "Empirical",
+                "Methodological",
+                "Literature Review",
+                "Theoretical",
+                "Other"
+            ],
+            description=(
+                "Categorize each study based on its primary objective or research question."
+                "Choose ONLY ONE option that best describes the study:"
+                "Empirical: Studies that apply established tools or methods to evaluate specific parks, greenspaces, or surrounding environments."
+                "Methodological: Studies that develop new instruments, metrics, or indices."
+                "Literature Review: Studies that synthesize existing research."
+                "Theoretical: Studies that develop new theories or conceptual frameworks."
+            ),
+        ),
+        "Article_Type_Detail": types.Schema(
+            type="string",
+            description=(
+                "Provide justification for why the Article_Type category was chosen. "
+                "If Other was selected for Article_Type, clearly define the alternative category and describe it in detail."
+            )
+        ),
+        "Data_Collection_Method": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "On-site audit or observation",
+                    "Questionnaire surveys",
+                    "Interviews and/or focus groups",
+                    "Experiments",
+                    "Geospatial data and/or remote sensing",
+                    "Ecological measurement",
+                    "Citizen science and/or user-generated data",
+                    "Literature and document review",
+                    "Research through design (often implemented in design studios)",
+                    "Other"
+                ]
+            ),
+            description=(
+                "The data collection methods used in the study. Select all options that apply."
+                "Note: 'Citizen science and/or user-generated data' refers to data passively collected from users (e.g., social media posts, online reviews) or data actively collected by the public as part of a formal citizen science project. This category does not include qualitative data actively solicited by researchers, such as written reflections in response to a prompt, which should be categorized as 'Questionnaire surveys' or 'Interviews and/or focus groups'."
+            )
+        ),
+        "Data_Collection_Method_Detail": types.Schema(
+            type="string",
+            description=(
+                "Provide justification for why the Data_Collection_Method categories were chosen. "
+                "If Other was selected for Data_Collection_Method, clearly define the alternative data collection method and describe it in detail."
+            )
+        ),
+        "Data_Analysis_Method": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Quantitative Statistical Modeling",
+                    "Qualitative Content Analysis",
+                    "Spatial Analysis",
+                    "Causal Inference & Experimental Design",
+                    "Computational & AI-based Analysis",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Categorize each study based on its data analysis method(s). Select all options that apply:"
+                "Quantitative Statistical Modeling: Focuses on quantifying statistical relationships between variables (for example correlation, regression) or testing for significant differences between groups. The primary goal is to explore and explain associations within the data."
+                "Qualitative Content Analysis: Interprets textual data such as interviews or focus groups to identify and analyze underlying themes, patterns, and meanings. The goal is to understand context, perceptions, and narratives in the qualitative data."
+                "Spatial Analysis: Uses geographic location data as a core component to statistically analyze spatial patterns. This includes examining geographic distribution, density, accessibility, clustering, and spatial autocorrelation. Simply mapping data does not fall into this category."
+                "Causal Inference & Experimental Design: Aims to infer the causal effect of an intervention or change in conditions on an outcome. The study is structured to evaluate this effect, for example, through experimental or quasi-experimental designs (e.g., pre-post comparisons), often by establishing treatment and control or comparison groups."
+                "Computational & AI-based Analysis: Uses computational algorithms, such as machine learning and natural language processing, to learn from and identify patterns within large scale, often unstructured, data such as text or images. This approach aims to predict outcomes or automatically classify complex information."
+            ),
+        ),
+        "Data_Analysis_Method_Detail": types.Schema(
+            type="string",
+            description=(
+                "Provide justification for why the Data_Analysis_Method categories were chosen. "
+                "If Other was selected for Data_Analysis_Method, clearly define the alternative category and describe it in detail."
+            )
+        ),
+    },
+    required=[
+        "Title",
+        "Lead_Author",
+        "Year",
+        "Journal",
+        "Country",
+        "Country_ISO3",
+        "City",
+        "Spatial_Scale_of_Analysis",
+        "Number_of_Parks",
+        "Spatial_Scale_Detail",
+        "Article_Type",
+        "Article_Type_Detail",
+        "Data_Collection_Method",
+        "Data_Collection_Method_Detail",
+        "Data_Analysis_Method",
+        "Data_Analysis_Method_Detail"
+    ]
+)
+
+# ----------------------------------------------------------
+# section spec
+# ----------------------------------------------------------
+SPEC = SectionSpec(
+    name="AB",
+    title="Study characteristics and methods",
+    prompt=PROMPT_TEXT,
+    schema=schema,
+    output_csv="./fulltext_extraction_AB_r35.csv",
+)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Section C (Park quality dimensions): prompt and response schema.
+"""
+from google.genai import types
+
+from llmreview.spec import SectionSpec
+
+PROMPT_TEXT = """
+You are assisting a systematic literature review.
+Use only the attached PDF to fill the required metadata fields.
+Code only what the article itself explicitly treats as 'park quality' or 'greenspace quality.'
+Only include quality dimensions that were directly measured or analyzed in the Methods or Results sections.
+Do not code anything that was only mentioned conceptually in the Introduction or Discussion.
+Do not code concepts that are not explicitly framed as 'quality' (for example 'usability,' 'accessibility,' or general satisfaction),
+unless they are clearly defined and analyzed by the authors as dimensions of park or greenspace quality.
+Do not use any external information or guesses.
+If no relevant information can be found, clearly state that no qualifying content was identified and briefly explain why.
+"""
+
+# ----------------------------------------------------------
+# Response schema
+# ----------------------------------------------------------
+schema = types.Schema(
+    type="object",
+    properties={
+
+        "Park_Quality_Definition": types.Schema(
+            type="string",
+            description=(
+                "Describe how the study defined 'park quality' or 'greenspace quality' in its own terms. "
+                "Do not infer or generalize beyond what is explicitly stated in the article."
+            )
+        ),
+
+        "Ecological_Environmental_Dimensions": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Biodiversity and/or habitat",
+                    "Vegetation and/or flora",
+                    "Soil quality",
+                    "Water quality and/or hydrology",
+                    "Air quality and/or microclimate",
+                    "Acoustic environment & soundscape",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all ecological or environmental aspects that the study explicitly treats as part of "
+                "'park quality' or 'greenspace quality' and that were directly measured or analyzed in the "
+                "Methods or Results sections. "
+                "Do not include anything mentioned only in the Introduction or Discussion without being measured."
+            )
+        ),
+        "Ecological_Environmental_Dimensions_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Ecological_Environmental_Dimensions category qualifies as park or greenspace 'quality' in this study. "
+                "Describe how it was directly measured or analyzed in the Methods or Results sections. "
+                "When describing how each aspect was defined or measured, use direct quotes from the article whenever possible, "
+                "especially wording that appears in the Methods or Results. "
+                "If 'Other' was selected, name the ecological or environmental aspect and describe how it was measured."
+            )
+        ),
+
+        "Physical_Functional_Dimensions": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Facilities and/or amenities",
+                    "Maintenance and/or cleanliness",
+                    "Safety and/or security",
+                    "Design and/or aesthetics",
+                    "Size and/or acreage",
+                    "Internal accessibility",
+                    "External accessibility",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all physical or functional aspects that the study explicitly treats as part of "
+                "'park quality' or 'greenspace quality' and that were directly measured or analyzed in the "
+                "Methods or Results sections. "
+                "Only include features that were operationalized with data in this article. "
+                "'Internal accessibility' refers to ease of movement within the park such as ADA or disability access, "
+                "pathways, signage, or internal connectivity. "
+                "'External accessibility' refers to how easily users can reach or recognize the park from outside "
+                "such as proximity to transit stops, pedestrian or cycling routes, parking availability, "
+                "or visibility of entrances. "
+                "Do not include anything mentioned only in the Introduction or Discussion without being measured."
+            )
+        ),
+        "Physical_Functional_Dimensions_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Physical_Functional_Dimensions category qualifies as park or greenspace 'quality' in this study. "
+                "Describe how it was directly measured or analyzed in the Methods or Results sections. "
+                "When describing how each aspect was defined or measured, use direct quotes from the article whenever possible, "
+                "especially wording that appears in the Methods or Results. "
+                "If 'Other' was selected, name the physical or functional aspect and describe how it was measured."
+            )
+        ),
+
+        "Social_Experiential_Dimensions": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Perceived quality",
+                    "Recreation and/or leisure opportunities or programming",
+                    "Social interactions and/or community-building",
+                    "Cultural and/or educational features",
+                    "Stewardship behavior",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all social or experiential aspects that the study explicitly treats as part of "
+                "'park quality' or 'greenspace quality' and that were directly measured or analyzed in the "
+                "Methods or Results sections. "
+                "'Stewardship behavior' includes volunteering or personal commitment to park maintenance and care. "
+                "Do not include anything mentioned only in the Introduction or Discussion without being measured."
+            )
+        ),
+        "Social_Experiential_Dimensions_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Social_Experiential_Dimensions category qualifies as park or greenspace 'quality' in this study. "
+                "Describe how it was directly measured or analyzed in the Methods or Results sections. "
+                "When describing how each aspect was defined or measured, use direct quotes from the article whenever possible, "
+                "especially wording that appears in the Methods or Results. "
+                "If 'Other' was selected, name the social or experiential aspect and describe how it was measured."
+            )
+        ),
+
+        "Management_Governance_Dimensions": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Planning and/or policy",
+                    "Citizen participation and/or collaboration",
+                    "Funding and/or resource allocation",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all management or governance aspects that the study explicitly treats as part of "
+                "'park quality' or 'greenspace quality' and that were directly measured or analyzed in the "
+                "Methods or Results sections. "
+                "Management or governance quality refers to institutional capacity or operational performance "
+                "that ensures the park provides its intended benefits. "
+                "Only include items that were operationalized with data in this article. "
+                "Do not include anything mentioned only in the Introduction or Discussion without being measured."
+            )
+        ),
+        "Management_Governance_Dimensions_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Management_Governance_Dimensions category qualifies as park or greenspace 'quality' in this study. "
+                "Describe how it was directly measured or analyzed in the Methods or Results sections. "
+                "When describing how each aspect was defined or measured, use direct quotes from the article whenever possible, "
+                "especially wording that appears in the Methods or Results. "
+                "If 'Other' was selected, name the management or governance aspect and describe how it was measured."
+            )
+        ),
+    }
+)
+
+# ----------------------------------------------------------
+# section spec
+# ----------------------------------------------------------
+SPEC = SectionSpec(
+    name="C",
+    title="Park quality dimensions",
+    prompt=PROMPT_TEXT,
+    schema=schema,
+    output_csv="./fulltext_extraction_sectionC.csv",
+)
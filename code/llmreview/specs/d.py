@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Section D (Outcomes): prompt and response schema.
+"""
+from google.genai import types
+
+from llmreview.spec import SectionSpec
+
+PROMPT_TEXT = """
+You are assisting a systematic literature review.
+Use only the attached PDF to fill the required metadata fields.
+When describing outcomes, use wording that closely reflects how the article itself phrases and discusses them.
+Quote or paraphrase expressions directly from the Methods or Results sections whenever possible,
+rather than rephrasing them in your own words.
+
+Code only outcomes that the article explicitly analyzes or reports in the Methods or Results sections
+as *results or consequences* of park quality or greenspace quality — that is, variables or indicators that are measured
+as dependent outcomes influenced by the level or characteristics of park or greenspace quality.
+Do not code variables that represent components, dimensions, or indicators of park or greenspace quality itself.
+
+Do not code outcomes for other related concepts such as general accessibility, usability, or satisfaction,
+unless the article explicitly frames those concepts as dimensions of park or greenspace quality
+and analyzes their outcomes as such.
+
+Do not code anything mentioned only in the Introduction or Discussion without being empirically measured or analyzed.
+Do not use any external information or assumptions.
+If no qualifying information is found, clearly state that no relevant outcome information was identified and briefly explain why.
+"""
+
+# ----------------------------------------------------------
+# Response schema
+# ----------------------------------------------------------
+schema = types.Schema(
+    type="object",
+    properties={
+
+        # 16. Regulating Ecosystem Services
+        "Regulating_Ecosystem_Services": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Climate regulation",
+                    "Flood regulation/stormwater management",
+                    "Disease regulation",
+                    "Water purification",
+                    "Air purification",
+                    "Habitat provision",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all regulating ecosystem service (RES) outcomes that the study explicitly analyzes or measures "
+                "as outcomes of park or greenspace quality in the Methods or Results sections. "
+                "RES is defined as benefits obtained from the regulation of ecosystem processes, such as climate regulation, "
+                "flood regulation or stormwater management, disease regulation, water purification, air purification, and habitat provision. "
+                "Do not include anything mentioned only conceptually in the Introduction or Discussion."
+            )
+        ),
+        "Regulating_Ecosystem_Services_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Regulating_Ecosystem_Services category qualifies as a measured or analyzed outcome of park or greenspace quality. "
+                "Describe how it was directly analyzed in the Methods or Results sections. "
+                "If 'Other' was selected, specify the regulating ecosystem service outcomes addressed and how they were analyzed."
+            )
+        ),
+
+        # 17. Cultural Ecosystem Services
+        "Cultural_Ecosystem_Services": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Aesthetic",
+                    "Spiritual",
+                    "Educational",
+                    "Recreational",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all cultural ecosystem service (CES) outcomes that the study explicitly analyzes or measures "
+                "as outcomes of park or greenspace quality in the Methods or Results sections. "
+                "CES is defined as nonmaterial benefits people obtain from ecosystems through spiritual enrichment, cognitive development, "
+                "reflection, recreation, and aesthetic experiences. "
+                "Aesthetic: beauty or aesthetic appreciation people find in various aspects of ecosystems, as reflected in support for parks, scenic drives, and housing location choices. "
+                "Spiritual: spiritual and religious values assigned to ecosystems or their natural components, providing profound significance and meaning. "
+                "Educational: components and processes that provide the basis for both formal and informal education, offering learning opportunities. "
+                "Recreational: benefits people derive from ecosystems when choosing natural or cultivated landscapes for leisure activities and ecotourism. "
+                "Do not include anything mentioned only conceptually in the Introduction or Discussion."
+            )
+        ),
+        "Cultural_Ecosystem_Services_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Cultural_Ecosystem_Services category qualifies as a measured or analyzed outcome of park or greenspace quality. "
+                "Describe how it was directly analyzed in the Methods or Results sections. "
+                "If 'Other' was selected, specify the cultural ecosystem service outcomes addressed and how they were analyzed."
+            )
+        ),
+
+        # 18. Provisioning Ecosystem Services
+        "Provisioning_Ecosystem_Services": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Food",
+                    "Fresh water",
+                    "Wood and fiber",
+                    "Fuel",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all provisioning ecosystem service (PES) outcomes that the study explicitly analyzes or measures "
+                "as outcomes of park or greenspace quality in the Methods or Results sections. "
+                "PES is defined as products obtained from ecosystems, such as food, fresh water, wood and fiber, or fuel. "
+                "Do not include anything mentioned only conceptually in the Introduction or Discussion."
+            )
+        ),
+        "Provisioning_Ecosystem_Services_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Provisioning_Ecosystem_Services category qualifies as a measured or analyzed outcome of park or greenspace quality. "
+                "Describe how it was directly analyzed in the Methods or Results sections. "
+                "If 'Other' was selected, specify the provisioning ecosystem service outcomes addressed and how they were analyzed."
+            )
+        ),
+
+        # 19. Health and Well-being
+        "Health_and_Wellbeing": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Physiological health",
+                    "Psychological health"
+                ]
+            ),
+            description=(
+                "Select all health and well-being outcomes that the study explicitly analyzes or measures "
+                "as outcomes of park or greenspace quality in the Methods or Results sections. "
+                "Physiological health includes cardiovascular outcomes, obesity rates, biomarkers, and physical activity–related health effects. "
+                "Psychological health includes affect, stress, cognition, and subjective well-being."
+            )
+        ),
+        "Health_and_Wellbeing_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Health_and_Wellbeing category qualifies as a measured or analyzed outcome of park or greenspace quality. "
+                "Describe how it was directly analyzed in the Methods or Results sections."
+            )
+        ),
+
+        # 20. Social and Community Outcomes
+        "Social_and_Community_Outcomes": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Use, engagement, recreation",
+                    "Social interaction, cohesion",
+                    "Equity, environmental justice",
+                    "Stewardship, education",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all social and community outcomes that the study explicitly analyzes or measures "
+                "as outcomes of park or greenspace quality in the Methods or Results sections. "
+                "Use, engagement, recreation refers to direct outcomes stemming from individuals’ own use of parks. "
+                "Social interaction, cohesion, equity, environmental justice, and stewardship, education represent indirect outcomes "
+                "emerging at the community or societal level and mediated through parks as spaces that facilitate broader social processes."
+            )
+        ),
+        "Social_and_Community_Outcomes_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Social_and_Community_Outcomes category qualifies as a measured or analyzed outcome of park or greenspace quality. "
+                "Describe how it was directly analyzed in the Methods or Results sections. "
+                "If 'Other' was selected, specify the social and community outcomes addressed and how they were analyzed."
+            )
+        ),
+
+        # 21. Economic Outcomes
+        "Economic_Outcomes": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Property value growth/capitalization",
+                    "Economic impacts of recreation & tourism",
+                    "Healthcare & societal cost savings",
+                    "Economic benefits to individuals",
+                    "Return on investment (ROI)",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all economic outcomes that the study explicitly analyzes or measures "
+                "as outcomes of park or greenspace quality in the Methods or Results sections. "
+                "Property value growth/capitalization refers to changes in nearby property values associated with parks. "
+                "Economic impacts of recreation & tourism capture local or regional benefits generated by park visitors. "
+                "Healthcare & societal cost savings include reductions in medical costs or public health expenditures. "
+                "Economic benefits to individuals reflect improvements in financial wellbeing. "
+                "Return on investment (ROI) refers to a comprehensive evaluation of total benefits relative to costs. "
+                "Do not include anything mentioned only conceptually in the Introduction or Discussion."
+            )
+        ),
+        "Economic_Outcomes_Detail": types.Schema(
+            type="string",
+            description=(
+                "Explain why each selected Economic_Outcomes category qualifies as a measured or analyzed outcome of park or greenspace quality. "
+                "Describe how it was directly analyzed in the Methods or Results sections. "
+                "If 'Other' was selected, specify the economic outcomes addressed and how they were analyzed."
+            )
+        ),
+    }
+)
+
+# ----------------------------------------------------------
+# section spec
+# ----------------------------------------------------------
+SPEC = SectionSpec(
+    name="D",
+    title="Outcomes",
+    prompt=PROMPT_TEXT,
+    schema=schema,
+    page_scope="methods_results",
+    output_csv="./fulltext_extraction_sectionD_r35.csv",
+)
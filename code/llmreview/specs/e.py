@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+Section E (Equity): prompt, response schema and the Section C context
+built for each paper.
+"""
+import pandas as pd
+from google.genai import types
+
+from llmreview.spec import SectionSpec
+
+PROMPT_TEXT = """
+You are assisting a systematic literature review on equity in park and greenspace quality.
+
+You will receive three things:
+(1) A summary of how this study was previously coded in Section C (Quality Dimensions). This summary lists which aspects of park or greenspace quality were measured and analyzed in the Methods and Results sections.
+(2) The full text of the article as a PDF.
+(3) The response schema you must fill.
+
+Your job is to code Section E (Equity). Use ONLY empirically analyzed content from the Methods and Results sections of the article. Do NOT infer, assume, or guess beyond what is explicitly analyzed. Do NOT rely on the Introduction or Discussion unless the paper clearly reports a measured and analyzed empirical result there. If there is no qualifying evidence, return an empty array [] or "NA" accordingly, and briefly explain in the detail fields why there is no qualifying evidence.
+
+When filling any field whose name ends with "_Detail", you must briefly justify your coding using evidence from the Methods or Results. Whenever possible, include very short direct quotes (a phrase or short sentence) copied from the Methods or Results to show exactly how the article described it. If you cannot find a suitable quote in Methods or Results, you may closely paraphrase, but you must say that no direct quote was available. Do not invent quotes.
+
+Key definitions and rules:
+
+1. Target_User_Groups
+Identify which specific social groups or populations the study analyzes in relation to park or greenspace quality. Examples include race or ethnicity, income groups, age groups, gender groups, health-related groups (for example disabled populations, people with obesity, neurodivergent people), housing status (for example renters, people in single-family housing, unhoused people), or users engaged in specific activities (for example mountain bikers).
+If the study treats the public as a single undifferentiated whole and does not analyze any subpopulation, select "None (general public / unspecified users)".
+Only include a category if the study actually measures or analyzes differences or outcomes for that group in Methods or Results. Do not include purely conceptual mentions in Introduction or Discussion.
+If the study analyzes a group that does not fit any listed category, include "Other" and describe the group in Target_User_Groups_Detail.
+In Target_User_Groups_Detail, explain which groups were analyzed and how, and include short direct quotes from Methods or Results where possible.
+
+2. Distributive_Justice
+Distributive justice refers to whether the quality of parks or greenspaces is unequally distributed across different population groups or across different geographic areas. For example, if the study finds that one neighborhood type or one demographic group receives systematically lower quality (for example fewer amenities, less shade, more safety issues), that is distributive justice.
+Code which quality dimensions show unequal distribution. The dimensions are four high level categories from Section C:
+- Ecological/Environmental
+- Physical/Functional
+- Social/Experiential
+- Management/Governance
+Only code a dimension if unequal distribution is directly analyzed in the Methods or Results, not just discussed conceptually.
+In Distributive_Justice_Detail, for every dimension you mark, summarize the inequity and support it with short quotes from Methods or Results if available. Be concrete. For example, "lower amenity quality in lower income neighborhoods". If no distributive justice analysis was found, explain that and state that no direct quote exists.
+
+3. Procedural_Justice
+Procedural justice refers to who is involved in decision making, whose voices are included, and how participation in planning, design, management, or governance of parks is structured.
+First, identify which quality dimensions (Ecological/Environmental, Physical/Functional, Social/Experiential, Management/Governance) are examined through a procedural justice lens. Only include a dimension if the study empirically analyzes participation, involvement, consultation, decision making, negotiation or planning practices related to that dimension in Methods or Results.
+In Procedural_Justice_Detail, summarize how participation or decision making was analyzed for each selected dimension, and include short direct quotes from Methods or Results if possible.
+
+Then fill Participation_Level. This should be an array of one or more of the following categories, based on Arnstein's ladder of participation:
+- Informing
+  One way information from officials to the public. No feedback channel. Symbolic notification only.
+- Consultation
+  The public is asked for opinions (for example survey, public hearing) but there is no guarantee those opinions will influence decisions.
+- Placation
+  Some community representatives are invited to advisory boards, but powerholders can easily overrule them.
+- Partnership
+  Citizens share power with officials through negotiation or joint structures. Real co decision.
+- Delegated Power
+  Citizens hold primary decision making authority over a specific program or plan.
+- Citizen Control
+  Citizens or community groups have full managerial control.
+
+Participation_Level must reflect only what the study actually analyzes in Methods or Results.
+
+Next, fill Participation_Outcome with one of:
+- "Yes"   if the study evaluates whether participation produced tangible improvements in any aspect of park or greenspace quality (actual physical or managerial change, not just satisfaction with the process) and reports those improvements as empirical findings
+- "No"    if participation is analyzed, but the study does not analyze any resulting change or improvement in park or greenspace quality
+- "NA"    if no participation process was analyzed in the study at all
+
+Then fill Participation_Detail. Participation_Detail must:
+- justify Participation_Level and Participation_Outcome
+- describe who participated and in what capacity
+- explicitly state whether the article reports any resulting change in park quality
+- include short direct quotes from Methods or Results whenever possible
+If there was no analysis of participation at all, explain that explicitly and state that there is no direct quote.
+
+If the study does not analyze any participation process in Methods or Results, then:
+- Participation_Level should be []
+- Participation_Outcome should be "NA"
+- Participation_Detail should clearly state that no participation process was empirically analyzed and no quotes were available.
+
+4. Recognitional_Justice
+Recognitional justice concerns whether the study analyzes how park or greenspace quality affirms, respects, ignores, excludes, or misrepresents the identities, values, or cultural perspectives of particular groups.
+Code which quality dimensions (Ecological/Environmental, Physical/Functional, Social/Experiential, Management/Governance) are discussed in terms of recognition or misrecognition. Recognition means features of the park reflect the group's cultural identity, needs, or values. Misrecognition means features ignore, exclude, or devalue those identities, needs, or values.
+In Recognitional_Justice_Detail, for each dimension you mark, describe what was recognized or misrecognized and include short direct quotes from the Methods or Results if possible. If no recognitional justice analysis was found, explain that and state that no direct quote exists.
+
+5. Use of Section C summary
+You will be provided with a summary of how this same study was coded in Section C (Quality Dimensions), including which dimensions were measured and how. Use this summary as contextual guidance. Link your Section E coding to these same dimensions where appropriate.
+However, you must still confirm that any claims about justice are empirically analyzed in this study's Methods or Results. If the Section C summary mentions a dimension but the article does not actually analyze justice for that dimension, then do not select that dimension for Distributive_Justice, Procedural_Justice, or Recognitional_Justice.
+
+Return your answer in valid JSON following the provided response schema. Do not include any keys that are not in the schema. Do not include comments.
+"""
+
+# ----------------------------------------------------------
+# Response schema for Section E (Equity)
+# ----------------------------------------------------------
+schema = types.Schema(
+    type="object",
+    properties={
+
+        # 22. Target User Groups
+        "Target_User_Groups": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "None (general public / unspecified users)",
+                    "Age",
+                    "Race/ethnicity",
+                    "Income",
+                    "Gender",
+                    "Health condition",
+                    "Specific activity",
+                    "Housing status",
+                    "Other"
+                ]
+            ),
+            description=(
+                "Select all user or population groups that the study empirically analyzes in relation to park or "
+                "greenspace quality in the Methods or Results sections. If the study does not analyze any specific "
+                "group, use 'None (general public / unspecified users)'."
+            )
+        ),
+        "Target_User_Groups_Detail": types.Schema(
+            type="string",
+            description=(
+                "Briefly describe which groups were analyzed and how. Include short direct quotes from Methods or "
+                "Results whenever possible. If 'Other' was selected, specify the group. If only general public was "
+                "analyzed, explain that no specific groups were separately analyzed and note if no direct quote exists."
+            )
+        ),
+
+        # 23. Distributive Justice
+        "Distributive_Justice": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Ecological/Environmental",
+                    "Physical/Functional",
+                    "Social/Experiential",
+                    "Management/Governance"
+                ]
+            ),
+            description=(
+                "Which quality dimensions does the study empirically show to be unevenly distributed across "
+                "population groups or places, based on Methods or Results. Select all that apply. "
+                "Leave empty if no distributive justice analysis was performed."
+            )
+        ),
+        "Distributive_Justice_Detail": types.Schema(
+            type="string",
+            description=(
+                "For each dimension in Distributive_Justice, summarize the specific inequity that was identified in "
+                "the Methods or Results. Include short direct quotes from Methods or Results whenever possible. "
+                "If none were coded, explain that no distributive justice analysis was found and note if no direct quote exists."
+            )
+        ),
+
+        # 24. Procedural Justice
+        "Procedural_Justice": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Ecological/Environmental",
+                    "Physical/Functional",
+                    "Social/Experiential",
+                    "Management/Governance"
+                ]
+            ),
+            description=(
+                "Which quality dimensions does the study examine through a procedural justice lens, meaning stakeholder "
+                "involvement, participation in decision making, planning input, negotiation, or governance processes. "
+                "Select all that apply. Leave empty if there is no such analysis."
+            )
+        ),
+        "Procedural_Justice_Detail": types.Schema(
+            type="string",
+            description=(
+                "For each dimension in Procedural_Justice, describe how participation or decision making was analyzed "
+                "in the Methods or Results. Include short direct quotes from Methods or Results whenever possible. "
+                "If none were coded, explain that no procedural justice analysis was found and note if no direct quote exists."
+            )
+        ),
+
+        # 24-2. Participation Level
+        "Participation_Level": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Informing",
+                    "Consultation",
+                    "Placation",
+                    "Partnership",
+                    "Delegated Power",
+                    "Citizen Control"
+                ]
+            ),
+            description=(
+                "Select all levels of citizen or community participation analyzed in the Methods or Results. "
+                "If no participatory process was analyzed at all, return an empty array []."
+            )
+        ),
+
+        # 24-3. Participation Outcome
+        "Participation_Outcome": types.Schema(
+            type="string",
+            enum=["Yes", "No", "NA"],
+            description=(
+                "If participation was analyzed, did the study evaluate whether participation produced tangible "
+                "improvements in park or greenspace quality. 'Yes' if the study links participation to concrete "
+                "quality improvements. 'No' if participation was analyzed but resulting quality improvements were "
+                "not assessed. 'NA' if no participation process was analyzed."
+            )
+        ),
+
+        # new: Participation Detail
+        "Participation_Detail": types.Schema(
+            type="string",
+            description=(
+                "Justify Participation_Level and Participation_Outcome using only Methods or Results. "
+                "Describe who participated, how participation occurred, and whether the study reports any resulting "
+                "change in park or greenspace quality. Include short direct quotes from Methods or Results whenever possible. "
+                "If there was no participation process analyzed, clearly state that and note that no direct quote exists."
+            )
+        ),
+
+        # 25. Recognitional Justice
+        "Recognitional_Justice": types.Schema(
+            type="array",
+            items=types.Schema(
+                type="string",
+                enum=[
+                    "Ecological/Environmental",
+                    "Physical/Functional",
+                    "Social/Experiential",
+                    "Management/Governance"
+                ]
+            ),
+            description=(
+                "Which quality dimensions does the study analyze in terms of recognition or misrecognition of the "
+                "cultural identities, needs, or values of specific groups. Select all that apply. "
+                "Leave empty if there is no such analysis."
+            )
+        ),
+        "Recognitional_Justice_Detail": types.Schema(
+            type="string",
+            description=(
+                "For each dimension in Recognitional_Justice, summarize how recognition or misrecognition was described "
+                "in the Methods or Results. Include short direct quotes from Methods or Results whenever possible. "
+                "If none were coded, explain that no recognitional justice analysis was found and note that no direct quote exists."
+            )
+        ),
+    }
+)
+
+# ----------------------------------------------------------
+# Section C context (per row, and an index per round)
+# ----------------------------------------------------------
+def build_section_c_context(row):
+    """
+    Build a readable summary string from one df_c row (Series or dict).
+    This is passed to the model as context.
+    """
+    def fmt_list(val):
+        # val might already look like "['A', 'B']" which is fine as string
+        if isinstance(val, str):
+            return val
+        # native lists (columnar copy) render as the CSV text does, so the
+        # context is the same whichever file it was read from
+        if isinstance(val, (list, tuple)):
+            return str([str(v) for v in val])
+        return str(val)
+
+    parts = []
+    parts.append("SECTION C SUMMARY FOR THIS STUDY")
+
+    pqc = row.get("Park_Quality_Context", "")
+    if isinstance(pqc, float) and pd.isna(pqc):
+        pqc = ""
+    parts.append(f"- Park_Quality_Context: {pqc}")
+
+    eco_dim = row.get("Ecological_Environmental_Dimensions", "")
+    eco_det = row.get("Ecological_Environmental_Dimensions_Detail", "")
+    parts.append(f"- Ecological/Environmental Dimensions: {fmt_list(eco_dim)}")
+    parts.append(f"  Detail: {eco_det}")
+
+    phys_dim = row.get("Physical_Functional_Dimensions", "")
+    phys_det = row.get("Physical_Functional_Dimensions_Detail", "")
+    parts.append(f"- Physical/Functional Dimensions: {fmt_list(phys_dim)}")
+    parts.append(f"  Detail: {phys_det}")
+
+    soc_dim = row.get("Social_Experiential_Dimensions", "")
+    soc_det = row.get("Social_Experiential_Dimensions_Detail", "")
+    parts.append(f"- Social/Experiential Dimensions: {fmt_list(soc_dim)}")
+    parts.append(f"  Detail: {soc_det}")
+
+    mgmt_dim = row.get("Management_Governance_Dimensions", "")
+    mgmt_det = row.get("Management_Governance_Dimensions_Detail", "")
+    parts.append(f"- Management/Governance Dimensions: {fmt_list(mgmt_dim)}")
+    parts.append(f"  Detail: {mgmt_det}")
+
+    return "\n".join(parts)
+
+# context used when a paper has no Section C row
+MISSING_SECTION_C_CONTEXT = (
+    "SECTION C SUMMARY FOR THIS STUDY\n"
+    "- No Section C record was found for this file. "
+    "If you cannot confirm justice related evidence from Methods or Results, "
+    "return empty arrays, 'NA', and in all *_Detail fields explain that no qualifying "
+    "evidence and no direct quotes were found."
+)
+
+def build_section_c_index(df_c):
+    """
+    Render the Section C context of every study once and return a dict
+    keyed by File_Name, so each Section E call is a single dict lookup.
+    If a file appears more than once, its first row is used.
+    """
+    index = {}
+    for row in df_c.to_dict(orient="records"):
+        key = str(row.get("File_Name"))
+        if key not in index:
+            index[key] = build_section_c_context(row)
+    return index
+
+# ----------------------------------------------------------
+# section spec
+# ----------------------------------------------------------
+SPEC = SectionSpec(
+    name="E",
+    title="Equity",
+    prompt=PROMPT_TEXT,
+    schema=schema,
+    page_scope="methods_results",
+    output_csv="./fulltext_extraction_sectionE_r35.csv",
+    depends_on=("C",),
+    context_csv="./fulltext_extraction_sectionC.csv",
+    build_context=build_section_c_context,
+    build_context_index=build_section_c_index,
+    missing_context=MISSING_SECTION_C_CONTEXT,
+)
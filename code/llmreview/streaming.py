@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+from types import SimpleNamespace
+
+from google.genai import types
+
+from llmreview.validation import compile_schema, loads_json_object
+
+
+class OffSchemaError(ValueError):
+    """
+    Streamed output that cannot become a schema-valid answer: not a JSON
+    object, an unknown key, a value of the wrong type or outside its
+    enum, or a stream that ended before the object closed.
+    """
+
+
+# ----------------------------------------------------------
+# incremental JSON parser for the top-level object
+# ----------------------------------------------------------
+class IncrementalJsonParser:
+    """
+    Consumes a JSON object chunk by chunk and reports each top-level
+    field as soon as it is complete, without re-parsing the whole text.
+    feed() returns a list of events: ("key", name) once a key and its
+    colon have arrived, and ("field", name, value) once its value has
+    closed. complete is True after the closing brace.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.complete = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._segment_start = None
+        self._key = None
+
+    def _close_segment(self, end, closing=False):
+        segment = self.text[self._segment_start:end].strip()
+        self._segment_start = end + 1
+        self._key = None
+        if not segment:
+            # "{}" or a trailing comma before the closing brace, which
+            # the final answer's parse repairs too; "{," and ",," are not
+            if closing:
+                return []
+            raise OffSchemaError(f"empty field near {self.text[max(0, end - 40):end + 1]!r}")
+        # same repairs as the final answer (e.g. trailing commas in a list)
+        field = loads_json_object("{" + segment + "}")
+        if field is None or len(field) != 1:
+            raise OffSchemaError(f"malformed field near {segment[:80]!r}")
+        (name, value), = field.items()
+        return [("field", name, value)]
+
+    def feed(self, chunk):
+        self.text += chunk
+        events = []
+        text = self.text
+        while self._pos < len(text):
+            ch = text[self._pos]
+            pos = self._pos
+            self._pos += 1
+            if self.complete:
+                if not ch.isspace():
+                    raise OffSchemaError(f"text after the closing brace: {text[pos:pos + 40]!r}")
+                continue
+            if not self._started:
+                if ch.isspace():
+                    continue
+                if ch != "{":
+                    raise OffSchemaError(f"response does not start with an object: {text[pos:pos + 40]!r}")
+                self._started = True
+                self._depth = 1
+                self._segment_start = pos + 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    events += self._close_segment(pos, closing=True)
+                    self.complete = True
+            elif self._depth == 1 and ch == ":" and self._key is None:
+                try:
+                    self._key = json.loads(text[self._segment_start:pos].strip())
+                except ValueError:
+                    raise OffSchemaError(f"bad key {text[self._segment_start:pos][:80]!r}")
+                events.append(("key", self._key))
+            elif self._depth == 1 and ch == ",":
+                events += self._close_segment(pos)
+        return events
+
+
+# ----------------------------------------------------------
+# field checks against the response schema
+# ----------------------------------------------------------
+class StreamValidator:
+    """
+    Checks top-level fields of a streamed answer against the section's
+    compiled schema as they arrive: unknown keys fail at the key, values
+    fail as soon as they close (after the same repairs the final answer
+    gets, so a fixable defect does not abort the stream), and finish()
+    checks the required fields once the object is complete.
+    """
+
+    def __init__(self, schema):
+        self.compiled = compile_schema(schema)
+        self.fields = {}
+
+    def check(self, event):
+        compiled = self.compiled
+        name = compiled.field_name(event[1])
+        if name is None:
+            raise OffSchemaError(f"unknown field {event[1]!r}")
+        if event[0] == "key":
+            return
+        value = compiled.repair_field(name, event[2])
+        problem = compiled.field_problem(name, value)
+        if problem:
+            raise OffSchemaError(f"{name}: {problem}")
+        self.fields[name] = value
+
+    def finish(self, parser):
+        if not parser.complete:
+            raise OffSchemaError(f"stream ended inside the object after {len(self.fields)} fields")
+        missing = [name for name in self.compiled.required if name not in self.fields]
+        if missing:
+            raise OffSchemaError(f"missing required fields: {', '.join(missing)}")
+
+
+# ----------------------------------------------------------
+# streamed call
+# ----------------------------------------------------------
+def generate_json_stream(client, parts, schema, model, temperature=0, cached_content=None):
+    """
+    Streaming version of gemini.generate_json. Feeds each chunk to an
+    IncrementalJsonParser, validates fields as they close, and stops
+    reading (raising OffSchemaError) the moment the output leaves the
+    schema. Returns a response-like object with text, usage_metadata
+    (from the last chunk that carried it), first_field_seconds (time to
+    the first valid field) and total_seconds.
+    """
+    start = time.perf_counter()
+    parser = IncrementalJsonParser()
+    validator = StreamValidator(schema)
+    usage = None
+    first_field_seconds = None
+    stream = client.models.generate_content_stream(
+        model=model,
+        contents=[types.Content(parts=parts)],
+        config=types.GenerateContentConfig(
+            temperature=temperature,
+            responseSchema=schema,
+            response_mime_type="application/json",
+            cached_content=cached_content,
+        ),
+    )
+    try:
+        for chunk in stream:
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            for event in parser.feed(getattr(chunk, "text", None) or ""):
+                validator.check(event)
+                if event[0] == "field" and first_field_seconds is None:
+                    first_field_seconds = time.perf_counter() - start
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    validator.finish(parser)
+    return SimpleNamespace(
+        text=parser.text,
+        usage_metadata=usage,
+        first_field_seconds=first_field_seconds,
+        total_seconds=time.perf_counter() - start,
+    )
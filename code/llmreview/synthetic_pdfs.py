@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+
+# filler vocabulary for the synthetic article text
+_WORDS = (
+    "park quality equity green space access income neighbourhood residents "
+    "survey index vegetation trees facilities maintenance safety walking "
+    "distance deprivation ethnicity proximity amenities visits health"
+).split()
+
+# section layout of a synthetic article: (heading, pages of body text)
+SECTIONS = [
+    ("Abstract", 1),
+    ("1. Introduction", 2),
+    ("2. Methods", 2),
+    ("3. Results", 2),
+    ("4. Discussion", 1),
+    ("5. Conclusions", 1),
+    ("References", 1),
+]
+
+
+def _pdf_bytes(pages):
+    """
+    Minimal PDF (Helvetica text, one content stream per page) holding
+    the given pages, each a list of text lines.
+    """
+    objects = ["<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    pages_id = 1 + 2 * len(pages) + 1
+    kids = []
+    for lines in pages:
+        text = " ".join("(%s) '" % line.replace("\\", "").replace("(", "").replace(")", "") for line in lines)
+        stream = f"BT /F1 9 Tf 50 780 Td 11 TL {text} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 612 792] "
+                       f"/Contents {len(objects)} 0 R /Resources << /Font << /F1 1 0 R >> >> >>")
+        kids.append(len(objects))
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{k} 0 R' for k in kids)}] /Count {len(kids)} >>")
+    objects.append(f"<< /Type /Catalog /Pages {pages_id} 0 R >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += b"".join(f"{o:010d} 00000 n \n".encode("latin-1") for o in offsets)
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root {len(objects)} 0 R >>\n"
+            f"startxref\n{xref}\n%%EOF\n").encode("latin-1")
+    return out
+
+
+def make_synthetic_pdfs(out_dir, n_papers, seed=0, lines_per_page=60):
+    """
+    Write n_papers synthetic articles (synthetic001.pdf, ...) to out_dir
+    with a journal-like heading layout, so text extraction and page
+    selection behave as on real papers. Return the file names.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    names = []
+    for i in range(1, n_papers + 1):
+        pages = []
+        for heading, n_pages in SECTIONS:
+            for p in range(n_pages):
+                body = [" ".join(rng.choice(_WORDS) for _ in range(14)) for _ in range(lines_per_page)]
+                pages.append(([heading] if p == 0 else []) + body)
+        pages[0].insert(0, f"Synthetic study {i:03d}")
+        name = f"synthetic{i:03d}.pdf"
+        with open(os.path.join(out_dir, name), "wb") as f:
+            f.write(_pdf_bytes(pages))
+        names.append(name)
+    return names
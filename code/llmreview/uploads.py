@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from llmreview.hashing import file_sha256
+
+# Gemini keeps uploaded files for 48 hours
+DEFAULT_FILE_TTL = timedelta(hours=48)
+
+# do not hand out a remote file that expires within this window
+EXPIRY_MARGIN = timedelta(hours=1)
+
+RemoteFile = namedtuple("RemoteFile", ["name", "uri", "mime_type"])
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _to_iso(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
+
+
+# ----------------------------------------------------------
+# shared upload registry
+# ----------------------------------------------------------
+class UploadRegistry:
+    """
+    Registry of PDFs already uploaded through client.files.upload, keyed
+    by the SHA-256 of the file content and stored as JSON on disk.
+    Every section script and every round that points at the same
+    registry file reuses the same remote copy until it expires, so a
+    paper is uploaded once instead of once per section call. Remote
+    files are only removed by delete_all() at the end of a batch.
+    """
+
+    def __init__(self, path, ready_timeout=120):
+        self.path = path
+        self.ready_timeout = ready_timeout
+        self._lock = threading.Lock()
+        self._hash_locks = {}
+        self._entries = self._read()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read upload registry {self.path}: {e}")
+            return {}
+
+    def _save(self, shas):
+        # write only the entries this process changed (None = removed)
+        # over the file as other scripts left it, so an entry another
+        # script added or deleted meanwhile is not undone by an older
+        # in-memory copy
+        merged = self._read()
+        for sha in shas:
+            entry = self._entries.get(sha)
+            if entry is None:
+                merged.pop(sha, None)
+            else:
+                merged[sha] = entry
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(merged, f, indent=2)
+        os.replace(tmp_path, self.path)
+        self._entries = merged
+
+    def _is_live(self, entry):
+        if not entry:
+            return False
+        expires = datetime.fromisoformat(entry["expiration_time"])
+        return expires - EXPIRY_MARGIN > _now()
+
+    def _lock_for(self, sha):
+        with self._lock:
+            return self._hash_locks.setdefault(sha, threading.Lock())
+
+    def get(self, client, pdf_path, sha=None):
+        """
+        Return a RemoteFile for pdf_path, uploading it only if no live
+        upload of the same content is registered.
+        """
+        sha = sha or file_sha256(pdf_path)
+        with self._lock_for(sha):
+            with self._lock:
+                entry = self._entries.get(sha)
+            if self._is_live(entry):
+                print(f"Reusing upload of {os.path.basename(pdf_path)} ({entry['name']})")
+                return RemoteFile(entry["name"], entry["uri"], entry["mime_type"])
+
+            uploaded_file = client.files.upload(file=pdf_path)
+            print(f"Uploaded {os.path.basename(pdf_path)}")
+
+            uploaded_file = self._wait_until_active(client, uploaded_file)
+
+            expires = getattr(uploaded_file, "expiration_time", None) or (_now() + DEFAULT_FILE_TTL)
+            entry = {
+                "name": uploaded_file.name,
+                "uri": uploaded_file.uri,
+                "mime_type": getattr(uploaded_file, "mime_type", None) or "application/pdf",
+                "expiration_time": _to_iso(expires),
+                "source": os.path.basename(pdf_path),
+            }
+            with self._lock:
+                self._entries[sha] = entry
+                self._save([sha])
+            return RemoteFile(entry["name"], entry["uri"], entry["mime_type"])
+
+    def _wait_until_active(self, client, uploaded_file):
+        # PDFs are usually ACTIVE right away; poll only while PROCESSING
+        deadline = time.time() + self.ready_timeout
+        delay = 0.2
+        while "PROCESSING" in str(getattr(uploaded_file, "state", "") or ""):
+            if time.time() > deadline:
+                raise TimeoutError(f"{uploaded_file.name} still processing after {self.ready_timeout} sec")
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+            uploaded_file = client.files.get(name=uploaded_file.name)
+        if "FAILED" in str(getattr(uploaded_file, "state", "") or ""):
+            raise RuntimeError(f"File processing failed for {uploaded_file.name}")
+        return uploaded_file
+
+    def forget(self, sha):
+        """
+        Drop one entry (for example after the API reports the remote
+        file is gone) so the next get() uploads it again.
+        """
+        with self._lock:
+            if sha in self._entries:
+                self._entries[sha] = None
+                self._save([sha])
+
+    def purge_expired(self):
+        """
+        Drop registry entries whose remote file has expired or is about to.
+        """
+        with self._lock:
+            stale = [sha for sha, entry in self._entries.items() if not self._is_live(entry)]
+            for sha in stale:
+                self._entries[sha] = None
+            if stale:
+                self._save(stale)
+        return len(stale)
+
+    def delete_all(self, client):
+        """
+        Delete every registered remote file on the API side and clear the
+        registry. Call this once at the end of a batch.
+        """
+        with self._lock:
+            entries = {sha: e for sha, e in self._entries.items() if e}
+        deleted = 0
+        for sha, entry in entries.items():
+            try:
+                client.files.delete(name=entry["name"])
+                deleted += 1
+            except Exception:
+                pass
+            with self._lock:
+                self._entries[sha] = None
+        with self._lock:
+            self._save(list(entries))
+        print(f"Deleted {deleted} uploaded files")
+        return deleted
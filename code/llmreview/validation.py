@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+import threading
+
+from llmreview.fake_responses import schema_dict
+from llmreview.response_cache import schema_fingerprint
+
+_TYPE_CHECKS = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, list),
+    "object": lambda v: isinstance(v, dict),
+}
+
+
+def _enum_key(value):
+    return " ".join(value.split()).lower()
+
+
+# ----------------------------------------------------------
+# schema nodes compiled to check and repair functions
+# ----------------------------------------------------------
+def _compile_check(node):
+    """
+    Turn one schema node into a function value -> problem text or None,
+    with enum sets and child checks built once.
+    """
+    if node.get("any_of"):
+        options = [_compile_check(option) for option in node["any_of"]]
+
+        def check_any(value):
+            problems = []
+            for check in options:
+                problem = check(value)
+                if problem is None:
+                    return None
+                problems.append(problem)
+            return " / ".join(problems)
+        return check_any
+
+    kind = str(node.get("type") or "").lower()
+    nullable = bool(node.get("nullable"))
+    type_ok = _TYPE_CHECKS.get(kind)
+    enum = frozenset(node["enum"]) if node.get("enum") else None
+    items = _compile_check(node.get("items") or {}) if kind == "array" else None
+    props = {name: _compile_check(prop) for name, prop in (node.get("properties") or {}).items()}
+
+    def check(value):
+        if value is None:
+            return None if nullable else "null value"
+        if type_ok is not None and not type_ok(value):
+            return f"expected {kind}, got {type(value).__name__}"
+        if enum is not None and value not in enum:
+            return f"{value!r} is not one of the allowed values"
+        if items is not None:
+            for item in value:
+                problem = items(item)
+                if problem:
+                    return f"item {problem}"
+        if props and kind == "object":
+            for name, prop_check in props.items():
+                if name in value:
+                    problem = prop_check(value[name])
+                    if problem:
+                        return f"{name}: {problem}"
+        return None
+    return check
+
+
+def _compile_repair(node):
+    """
+    Turn one schema node into a function value -> value that fixes the
+    defects models commonly make: enum values with the wrong case or
+    spacing, numbers sent as strings, a single value where a list is
+    expected, duplicate list items, null lists and unknown object keys.
+    Values it cannot fix are returned unchanged for the check to report.
+    """
+    if node.get("any_of"):
+        options = [(_compile_repair(option), _compile_check(option)) for option in node["any_of"]]
+
+        def repair_any(value):
+            for repair, check in options:
+                fixed = repair(value)
+                if check(fixed) is None:
+                    return fixed
+            return value
+        return repair_any
+
+    kind = str(node.get("type") or "").lower()
+    enum_lookup = {_enum_key(v): v for v in node["enum"]} if node.get("enum") else None
+    items = _compile_repair(node.get("items") or {}) if kind == "array" else None
+    props = {name: _compile_repair(prop) for name, prop in (node.get("properties") or {}).items()}
+    prop_lookup = {name.lower(): name for name in props}
+
+    def repair(value):
+        if enum_lookup is not None and isinstance(value, str):
+            return enum_lookup.get(_enum_key(value), value)
+        if kind == "integer":
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            if isinstance(value, str) and re.fullmatch(r"\s*-?\d+\s*", value):
+                return int(value)
+        if kind == "number" and isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                return value
+        if kind == "string" and isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        if kind == "array":
+            if value is None:
+                return []
+            if not isinstance(value, list):
+                value = [value]
+            fixed = []
+            for item in value:
+                item = items(item)
+                if item not in fixed:
+                    fixed.append(item)
+            return fixed
+        if kind == "object" and isinstance(value, dict) and props:
+            fixed = {}
+            for name, item in value.items():
+                name = name if name in props else prop_lookup.get(str(name).lower())
+                if name is not None:
+                    fixed[name] = props[name](item)
+            return fixed
+        return value
+    return repair
+
+
+class CompiledSchema:
+    """
+    A response schema compiled once into per-field check and repair
+    functions (enum sets, type checks, required keys), so validating an
+    answer costs a dict walk instead of a schema traversal.
+    problems() maps each bad top-level field to its problem; repair()
+    returns a fixed copy and the number of fields it changed.
+    """
+
+    def __init__(self, schema):
+        node = schema_dict(schema)
+        self.schema = schema
+        self.properties = node.get("properties") or {}
+        self.required = list(node.get("required") or [])
+        self.checks = {name: _compile_check(prop) for name, prop in self.properties.items()}
+        self.repairs = {name: _compile_repair(prop) for name, prop in self.properties.items()}
+        self._names = {name.lower(): name for name in self.properties}
+        self._nested = {}
+
+    def field_name(self, name):
+        """
+        The schema's spelling of a top-level key, or None if unknown.
+        """
+        return name if name in self.properties else self._names.get(str(name).lower())
+
+    def field_problem(self, name, value):
+        return self.checks[name](value)
+
+    def repair_field(self, name, value):
+        return self.repairs[name](value)
+
+    def problems(self, answer):
+        problems = {}
+        for name in answer:
+            if name not in self.properties:
+                problems[name] = "field not in the schema"
+        for name in self.required:
+            if name not in answer:
+                problems[name] = "missing required field"
+        for name, check in self.checks.items():
+            if name in answer:
+                problem = check(answer[name])
+                if problem:
+                    problems[name] = problem
+        return problems
+
+    def repair(self, answer):
+        fixed = {}
+        changed = 0
+        for name, value in answer.items():
+            schema_name = self.field_name(name)
+            if schema_name is None:
+                changed += 1
+                continue
+            new_value = self.repairs[schema_name](value)
+            if schema_name != name or new_value != value:
+                changed += 1
+            fixed[schema_name] = new_value
+        return fixed, changed
+
+    def blank_invalid(self, answer):
+        """
+        Set every failing field of answer to None, in place, and return
+        the failing field paths. Inside an object field (a section of
+        the combined schema) only the failing sub-fields are blanked,
+        e.g. "C.Park_Quality_Definition".
+        """
+        paths = []
+        for name in self.problems(answer):
+            if name not in self.properties:
+                answer.pop(name, None)
+                continue
+            node = self.properties[name]
+            value = answer.get(name)
+            if isinstance(value, dict) and node.get("properties"):
+                nested = self._nested.get(name)
+                if nested is None:
+                    nested = self._nested[name] = CompiledSchema(node)
+                paths += [f"{name}.{path}" for path in nested.blank_invalid(value)]
+            else:
+                answer[name] = None
+                paths.append(name)
+        return paths
+
+    def check_text(self, raw_text):
+        """
+        Parse, repair and check a raw answer. Returns (answer, problems,
+        repairs); answer is None if no JSON object could be read.
+        """
+        answer = loads_json_object(raw_text)
+        if answer is None:
+            return None, {}, 0
+        answer, repairs = self.repair(answer)
+        return answer, self.problems(answer), repairs
+
+
+# compiled schemas by content (schema_fingerprint), so equal schemas
+# built afresh (combined schemas per paper, re-ask sub-schemas) share
+# one entry and the cache stays as small as the set of distinct schemas
+_COMPILED = {}
+_COMPILED_LOCK = threading.Lock()
+
+
+def compile_schema(schema):
+    """
+    The CompiledSchema for a schema, built on first use.
+    """
+    key = schema_fingerprint(schema)
+    entry = _COMPILED.get(key)
+    if entry is None:
+        entry = CompiledSchema(schema)
+        with _COMPILED_LOCK:
+            entry = _COMPILED.setdefault(key, entry)
+    return entry
+
+
+def sub_schema(schema, names):
+    """
+    Response schema holding only the given top-level fields of schema,
+    all required, for a re-ask about those fields alone. Same type as
+    schema (types.Schema or dict).
+    """
+    node = schema_dict(schema)
+    sub = {
+        "type": node.get("type") or "OBJECT",
+        "properties": {name: node["properties"][name] for name in names},
+        "required": list(names),
+    }
+    if hasattr(schema, "model_validate"):
+        return type(schema).model_validate(sub)
+    return sub
+
+
+# ----------------------------------------------------------
+# re-ask prompts
+# ----------------------------------------------------------
+REASK_UNREADABLE = (
+    "Your previous answer could not be read as a JSON object. "
+    "Answer again with one JSON object that follows the response schema exactly, and nothing else."
+)
+
+
+def reask_note(problems, previous):
+    """
+    Follow-up instruction for a targeted re-ask: which fields were
+    wrong, why, and what was answered before.
+    """
+    lines = [f"- {name}: {problem}" for name, problem in problems.items()]
+    return (
+        "Your previous answer did not fit the response schema for these fields:\n"
+        + "\n".join(lines)
+        + "\nPrevious values: " + json.dumps(previous, ensure_ascii=False)
+        + "\nAnswer again for these fields only, using only the allowed values and types."
+    )
+
+
+# ----------------------------------------------------------
+# text-level repair
+# ----------------------------------------------------------
+_FENCE = re.compile(r"^\s*(?:```|~~~)\s*(?:json)?\s*|\s*(?:```|~~~)\s*$", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def loads_json_object(raw_text):
+    """
+    Read a JSON object from a model answer. Tries the text as is, then
+    without code fences or a leading "json" label, then the span from
+    the first "{" to the last "}", then that span without trailing
+    commas. Returns a dict, or None if nothing parses to an object.
+    """
+    if raw_text is None:
+        return None
+    candidates = [raw_text]
+    clean = _FENCE.sub("", raw_text.strip())
+    clean = re.sub(r"^json\s*", "", clean, flags=re.IGNORECASE)
+    candidates.append(clean)
+    start_idx, end_idx = clean.find("{"), clean.rfind("}")
+    if start_idx != -1 and end_idx > start_idx:
+        span = clean[start_idx:end_idx + 1]
+        candidates += [span, _TRAILING_COMMA.sub(r"\1", span)]
+    for text in candidates:
+        try:
+            value = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from llmreview.batch import run_batch_section
+from llmreview.config import RunConfig
+
+# ----------------------------------------------------------
+# 1. Configuration
+# ----------------------------------------------------------
+# Same run as:  python -m llmreview batch AB
+API_KEY = ""
+PDF_DIR = "/Users/ywon3/ASU Dropbox/Youngjae Won/RESEARCH/Ongoing/GQEquityReview/paper-pdfs/for-review"
+
+# papers to run, picked from the corpus manifest of PDF_DIR: None = the r35
+# list; e.g. "new:r35" (not coded in r35 yet), "changed:r35", "subset:pilot"
+PDF_QUERY = None
+
+# duplicate PDFs are extracted once and their rows copied: "exact" (same
+# file content), "near" (also near-identical text, e.g. a preprint), "off"
+DEDUP = "exact"
+
+# section to run as one batch job: "AB", "C", "D" or "E"
+SECTION = "AB"
+
+# None = write to the section's default output CSV
+OUTPUT_CSV = None
+
+# batch input file for this round; <file>.job.json remembers the submitted
+# job, so re-running this script resumes polling instead of resubmitting
+JOB_JSONL = f"./batch_section{SECTION}_r35.jsonl"
+
+# seconds between job status checks
+POLL_SECONDS = 60
+
+# run against the local fake batch server instead of the API (for testing;
+# its outputs go to a scratch directory, never to OUTPUT_CSV)
+USE_FAKE_BATCH_SERVER = False
+
+# ----------------------------------------------------------
+# main entry
+# ----------------------------------------------------------
+if __name__ == "__main__":
+    config = RunConfig(api_key=API_KEY, pdf_dir=PDF_DIR, pdf_query=PDF_QUERY, dedup=DEDUP)
+    df_result = run_batch_section(SECTION, config, output_csv=OUTPUT_CSV, job_jsonl=JOB_JSONL,
+                                  poll_seconds=POLL_SECONDS, fake=USE_FAKE_BATCH_SERVER)
+    print(df_result)